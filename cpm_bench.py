@@ -0,0 +1,359 @@
+"""
+Testy wydajności CPMNetwork na syntetycznych sieciach.
+
+Generatory (deterministyczne dla danego ziarna) tworzą sieci o zadanej
+liczbie czynności – od 10 do 10 mln:
+- chain   – jeden łańcuch czynności,
+- fan     – rozgałęzienie: start -> n/2 zdarzeń pośrednich -> koniec,
+- layered – warstwy zdarzeń, łuki tylko między sąsiednimi warstwami,
+- sparse  – losowy rzadki DAG (średnio 2 czynności na zdarzenie, krótkie skoki),
+- dense   – gęsty DAG (prawie wszystkie pary zdarzeń i < j).
+
+Dla każdej sieci mierzone są osobno: add_activity, remove_activity (próbka
+czynności), compute (pełne), critical_path, project_summary (bez pamięci
+podręcznej – unieważniany jest tylko mierzony wpis) oraz rysowanie wykresu
+Gantta (cpm_gantt, backend Agg – pomijane bez Matplotlib). Szczytowe
+zużycie pamięci (tracemalloc) mierzone jest w osobnym przebiegu
+(wczytanie + project_summary), żeby nie spowalniać pomiarów czasu.
+
+Wyniki dopisywane są jako jeden wiersz JSON do pliku historii, a --compare
+porównuje dwa ostatnie przebiegi i pokazuje pogorszenia.
+
+Uruchomienie:
+    python cpm_bench.py --sizes 10,1000,100000
+    python cpm_bench.py --topologies chain,sparse --sizes 1000000 --no-memory
+    python cpm_bench.py --compare
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from cpm_core import CPMNetwork, Activity
+
+HISTORY_FILE = "bench_history.jsonl"
+MAX_ACTIVITIES = 10_000_000
+REMOVE_SAMPLE = 1000           # liczba usuwanych czynności w pomiarze remove_activity
+REGRESSION_RATIO = 1.2         # --compare: pogorszenie o ponad 20%
+OPERATIONS = ("add_activity", "remove_activity", "compute", "critical_path",
+              "project_summary", "gantt")
+
+# łuk: (ID czynności, zdarzenie początkowe, zdarzenie końcowe, czas trwania)
+Arc = Tuple[int, int, int, float]
+
+
+# -------------------------
+#   GENERATORY SIECI
+# -------------------------
+def _duration(rng: random.Random) -> float:
+    return float(rng.randint(1, 20))
+
+
+def chain_arcs(n: int, rng: random.Random) -> Tuple[int, Iterator[Arc]]:
+    return n + 1, ((k, k, k + 1, _duration(rng)) for k in range(n))
+
+
+def fan_arcs(n: int, rng: random.Random) -> Tuple[int, Iterator[Arc]]:
+    middle = max(1, n // 2)
+
+    def arcs():
+        for k in range(middle):
+            yield k, 0, 2 + k, _duration(rng)
+        for k in range(n - middle):
+            # przy nieparzystym n ostatnia czynność łączy start z końcem bezpośrednio
+            yield middle + k, (2 + k if k < middle else 0), 1, _duration(rng)
+    return middle + 2, arcs()
+
+
+def layered_arcs(n: int, rng: random.Random) -> Tuple[int, Iterator[Arc]]:
+    events = max(2, n // 3)
+    width = max(1, math.isqrt(events))
+    layers = -(-events // width)
+    if layers < 2:
+        width, layers = 1, events
+
+    def arcs():
+        for k in range(n):
+            layer = rng.randrange(layers - 1)
+            start = min(events - 1, layer * width + rng.randrange(width))
+            low = (layer + 1) * width
+            end = min(events - 1, low + rng.randrange(width))
+            yield k, start, end, _duration(rng)
+    return events, arcs()
+
+
+def sparse_arcs(n: int, rng: random.Random) -> Tuple[int, Iterator[Arc]]:
+    events = max(2, n // 2)
+
+    def arcs():
+        for k in range(n):
+            start = rng.randrange(events - 1)
+            end = min(events - 1, start + 1 + int(rng.expovariate(0.1)))
+            yield k, start, end, _duration(rng)
+    return events, arcs()
+
+
+def dense_arcs(n: int, rng: random.Random) -> Tuple[int, Iterator[Arc]]:
+    # najmniejsza liczba zdarzeń, dla której par i < j jest co najmniej n
+    events = max(2, math.ceil((1 + math.sqrt(1 + 8 * n)) / 2))
+
+    def arcs():
+        k = 0
+        for end in range(1, events):
+            for start in range(end):
+                if k == n:
+                    return
+                yield k, start, end, _duration(rng)
+                k += 1
+    return events, arcs()
+
+
+TOPOLOGIES: Dict[str, Callable[[int, random.Random], Tuple[int, Iterator[Arc]]]] = {
+    "chain": chain_arcs,
+    "fan": fan_arcs,
+    "layered": layered_arcs,
+    "sparse": sparse_arcs,
+    "dense": dense_arcs,
+}
+
+
+def generate(topology: str, n: int, seed: int = 0) -> Tuple[int, Iterator[Arc]]:
+    """(liczba zdarzeń o ID 0..k-1, iterator łuków) dla sieci o n czynnościach."""
+    if topology not in TOPOLOGIES:
+        raise KeyError(f"Nieznana topologia: {topology}")
+    if not 1 <= n <= MAX_ACTIVITIES:
+        raise ValueError(f"Liczba czynności musi być w zakresie 1..{MAX_ACTIVITIES}.")
+    return TOPOLOGIES[topology](n, random.Random(f"{topology}:{n}:{seed}"))
+
+
+def build_network(topology: str, n: int, seed: int = 0) -> CPMNetwork:
+    """Sieć z generatora (add_event/add_activity)."""
+    n_events, arcs = generate(topology, n, seed)
+    net = CPMNetwork()
+    for eid in range(n_events):
+        net.add_event(eid)
+    for aid, start, end, duration in arcs:
+        net.add_activity(Activity(aid, "", duration, start, end))
+    return net
+
+
+# -------------------------
+#   POMIARY
+# -------------------------
+def _best(fn: Callable[[], None], prepare: Callable[[], None], repeat: int) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        prepare()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _time_gantt(summary: Dict) -> Optional[float]:
+    try:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from cpm_gantt import GanttView
+    except ImportError:
+        return None
+    acts = summary["activities"]
+    start = time.perf_counter()
+    fig = Figure(figsize=(10, 6))
+    FigureCanvasAgg(fig)
+    view = GanttView(fig.add_subplot())
+    view.set_data([a["id"] for a in acts], [a["name"] for a in acts],
+                  [a["ES"] for a in acts], [a["duration"] for a in acts],
+                  [a["EF"] for a in acts], [a["is_critical"] for a in acts])
+    fig.canvas.draw()
+    return time.perf_counter() - start
+
+
+def peak_memory(topology: str, n: int, seed: int = 0) -> float:
+    """Szczytowa pamięć (MB, tracemalloc) dla budowy sieci i project_summary()."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        net = build_network(topology, n, seed)
+        net.project_summary()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del net
+    return round(peak / 2 ** 20, 3)
+
+
+def bench_case(topology: str, n: int, seed: int = 0, repeat: int = 3,
+               gantt: bool = True, memory: bool = True) -> Dict:
+    """Pomiary jednej sieci; czasy w sekundach (najlepszy z repeat)."""
+    n_events, arcs = generate(topology, n, seed)
+    acts = [Activity(aid, "", duration, start, end) for aid, start, end, duration in arcs]
+    net = CPMNetwork()
+    for eid in range(n_events):
+        net.add_event(eid)
+    result = {"topology": topology, "activities": n, "events": n_events, "seed": seed}
+    gc.collect()
+
+    add = net.add_activity
+    start = time.perf_counter()
+    for act in acts:
+        add(act)
+    result["add_activity"] = time.perf_counter() - start
+    del acts
+
+    cache = net._cache
+    result["compute"] = _best(net.compute, net.invalidate, repeat)
+    result["critical_path"] = _best(net.critical_path,
+                                    lambda: cache.pop("critical_path", None), repeat)
+    result["project_summary"] = _best(net.project_summary,
+                                      lambda: cache.pop("project_summary", None), repeat)
+    result["gantt"] = _time_gantt(net.project_summary()) if gantt else None
+
+    rng = random.Random(seed)
+    victims = rng.sample(list(net.activities), min(REMOVE_SAMPLE, n))
+    remove = net.remove_activity
+    start = time.perf_counter()
+    for aid in victims:
+        remove(aid)
+    result["remove_activity"] = time.perf_counter() - start
+    result["removed"] = len(victims)
+    del net
+    gc.collect()
+
+    result["peak_memory_mb"] = peak_memory(topology, n, seed) if memory else None
+    for op in OPERATIONS:
+        if result[op] is not None:
+            result[op] = round(result[op], 6)
+    return result
+
+
+# -------------------------
+#   HISTORIA
+# -------------------------
+def _revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def save_run(results: Sequence[Dict], path: str = HISTORY_FILE) -> Dict:
+    """Dopisuje przebieg (metadane + wyniki) do pliku historii JSON Lines."""
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": list(results),
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, ensure_ascii=False) + "\n")
+    return run
+
+
+def load_history(path: str = HISTORY_FILE) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_runs(old: Dict, new: Dict, ratio: float = REGRESSION_RATIO) -> List[Tuple]:
+    """Pogorszenia między przebiegami: (topologia, czynności, operacja, stary, nowy)."""
+    before = {(r["topology"], r["activities"]): r for r in old["results"]}
+    worse = []
+    for r in new["results"]:
+        prev = before.get((r["topology"], r["activities"]))
+        if prev is None:
+            continue
+        for key in OPERATIONS + ("peak_memory_mb",):
+            a, b = prev.get(key), r.get(key)
+            # bardzo krótkie pomiary są zbyt zaszumione, by je porównywać
+            if a is not None and b is not None and b > 1e-3 and b > a * ratio:
+                worse.append((r["topology"], r["activities"], key, a, b))
+    return worse
+
+
+# -------------------------
+#   URUCHOMIENIE
+# -------------------------
+def _print_result(r: Dict):
+    cells = [f"{r['topology']:>8}", f"{r['activities']:>9}"]
+    for key in OPERATIONS:
+        value = r[key]
+        cells.append(f"{'-' if value is None else f'{value:.4f}':>10}")
+    mem = r["peak_memory_mb"]
+    cells.append(f"{'-' if mem is None else f'{mem:.1f}':>9}")
+    print(" ".join(cells), flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Testy wydajności CPMNetwork.")
+    parser.add_argument("--topologies", default=",".join(TOPOLOGIES),
+                        help="lista topologii oddzielona przecinkami")
+    parser.add_argument("--sizes", default="10,1000,100000",
+                        help=f"liczby czynności oddzielone przecinkami (do {MAX_ACTIVITIES})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="powtórzenia pomiarów obliczeń")
+    parser.add_argument("--no-gantt", action="store_true", help="bez pomiaru wykresu Gantta")
+    parser.add_argument("--no-memory", action="store_true", help="bez pomiaru pamięci")
+    parser.add_argument("--history", default=HISTORY_FILE, help="plik historii (JSON Lines)")
+    parser.add_argument("--compare", action="store_true",
+                        help="tylko porównanie dwóch ostatnich przebiegów z historii")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        runs = load_history(args.history)
+        if len(runs) < 2:
+            print("Historia zawiera mniej niż dwa przebiegi.", file=sys.stderr)
+            return 2
+        old, new = runs[-2], runs[-1]
+        worse = compare_runs(old, new)
+        print(f"{old['revision']} ({old['timestamp']}) -> {new['revision']} ({new['timestamp']})")
+        for topology, n, key, a, b in worse:
+            print(f"  {topology} {n}: {key} {a} -> {b} (x{b / a:.2f})" if a else
+                  f"  {topology} {n}: {key} {a} -> {b}")
+        if not worse:
+            print("  bez pogorszeń")
+        return 1 if worse else 0
+
+    try:
+        topologies = [t.strip() for t in args.topologies.split(",") if t.strip()]
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+        for topology in topologies:
+            if topology not in TOPOLOGIES:
+                raise KeyError(f"Nieznana topologia: {topology}")
+        for n in sizes:
+            if not 1 <= n <= MAX_ACTIVITIES:
+                raise ValueError(f"Liczba czynności musi być w zakresie 1..{MAX_ACTIVITIES}.")
+    except (KeyError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    print(f"{'topologia':>8} {'czynności':>9} " + " ".join(f"{op[:10]:>10}" for op in OPERATIONS)
+          + f" {'pamięć MB':>9}")
+    results = []
+    for n in sizes:
+        for topology in topologies:
+            r = bench_case(topology, n, args.seed, args.repeat,
+                           gantt=not args.no_gantt, memory=not args.no_memory)
+            _print_result(r)
+            results.append(r)
+    save_run(results, args.history)
+    print(f"Zapisano do {args.history}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
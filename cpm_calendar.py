@@ -0,0 +1,313 @@
+"""
+Kalendarze robocze i zamiana wyników CPM na daty.
+
+Jednostką czasu sieci jest dzień roboczy. ProjectCalendar wiąże ją z datami:
+data rozpoczęcia projektu i kalendarz roboczy (WorkCalendar – dni tygodnia,
+święta, dodatkowe dni robocze), opcjonalnie osobne kalendarze zasobów.
+
+Zamiana nie przechodzi kalendarza dzień po dniu: CalendarIndex trzyma
+skumulowany indeks od daty rozpoczęcia,
+- days[k] – numer dnia (date.toordinal()) k-tego dnia roboczego,
+- cum[d]  – liczba dni roboczych przed dniem start + d,
+więc przesunięcie -> data i data -> przesunięcie to jeden odczyt tablicy,
+a cała kolumna wyników zamieniana jest jednym przebiegiem. Indeks
+rozszerza się blokami (INDEX_BLOCK_DAYS), gdy harmonogram sięga dalej.
+
+Reguły (przesunięcie t w dniach roboczych od rozpoczęcia projektu):
+- początek (ES, LS, ES zdarzenia): dzień roboczy o numerze floor(t),
+- koniec (EF, LF, LF zdarzenia): ostatni przepracowany dzień, ceil(t) - 1
+  (nie wcześniej niż dzień 0); czynność o czasie 0 kończy się w dniu startu.
+
+Kalendarz zasobu: czynność, której zasób ma własny kalendarz
+(resource_calendars), zaczyna się w pierwszym dniu roboczym tego kalendarza
+od daty ES/LS i trwa duration jego dni roboczych. Obliczenia CPM nadal
+prowadzone są w dniach roboczych kalendarza projektu – kalendarz zasobu
+zmienia tylko daty tej czynności.
+
+Przykład:
+    net.calendar = ProjectCalendar(date(2026, 1, 5), WorkCalendar(holidays=["2026-01-06"]))
+    net.project_summary()["activities"][0]["EF_date"]       # "2026-01-09"
+    net.calendar.to_offset(date(2026, 2, 2))                 # dni robocze od startu
+"""
+from __future__ import annotations
+import json
+import math
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+INDEX_BLOCK_DAYS = 366            # minimalny przyrost indeksu (dni kalendarzowe)
+WEEKDAY_NAMES = ("pn", "wt", "śr", "cz", "pt", "so", "nd")
+_EPS = 1e-9
+
+DateLike = Union[date, str]
+
+
+def parse_date(value: DateLike) -> date:
+    """date albo tekst RRRR-MM-DD."""
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f"Niepoprawna data (oczekiwano RRRR-MM-DD): {value}") from None
+
+
+# -------------------------
+#   KALENDARZ ROBOCZY
+# -------------------------
+class WorkCalendar:
+    """Dni robocze: dni tygodnia (0 = poniedziałek), święta (dni wolne)
+    i dodatkowe dni robocze (np. odpracowywane soboty)."""
+
+    def __init__(self, workdays: Iterable[int] = (0, 1, 2, 3, 4),
+                 holidays: Iterable[DateLike] = (), extra_workdays: Iterable[DateLike] = (),
+                 name: str = "standard"):
+        self.workdays = frozenset(int(d) for d in workdays)
+        if not self.workdays:
+            raise ValueError("Kalendarz musi mieć co najmniej jeden dzień roboczy w tygodniu.")
+        if not self.workdays <= set(range(7)):
+            raise ValueError("Dni tygodnia kalendarza to liczby 0–6 (0 = poniedziałek).")
+        self.holidays = frozenset(parse_date(d) for d in holidays)
+        self.extra_workdays = frozenset(parse_date(d) for d in extra_workdays)
+        self.name = name
+
+    def is_working(self, day: date) -> bool:
+        if day in self.extra_workdays:
+            return True
+        return day.weekday() in self.workdays and day not in self.holidays
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "workdays": sorted(self.workdays),
+                "holidays": sorted(d.isoformat() for d in self.holidays),
+                "extra_workdays": sorted(d.isoformat() for d in self.extra_workdays)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "WorkCalendar":
+        return cls(data.get("workdays", (0, 1, 2, 3, 4)), data.get("holidays", ()),
+                   data.get("extra_workdays", ()), data.get("name", "standard"))
+
+    def __repr__(self):
+        days = ",".join(WEEKDAY_NAMES[d] for d in sorted(self.workdays))
+        return f"WorkCalendar({self.name!r}, {days}, świąt: {len(self.holidays)})"
+
+
+class CalendarIndex:
+    """Skumulowany indeks dni roboczych kalendarza od dnia start."""
+
+    def __init__(self, calendar: WorkCalendar, start: date):
+        self.calendar = calendar
+        self.start = start
+        self._start_ordinal = start.toordinal()
+        self.days = array("l")            # k -> numer k-tego dnia roboczego
+        self.cum = array("l", [0])        # d -> dni robocze przed start + d
+        self._extend(INDEX_BLOCK_DAYS)
+
+    def _extend(self, n_days: int):
+        # jedyne miejsce, które przechodzi kalendarz dzień po dniu – budowa indeksu
+        is_working = self.calendar.is_working
+        days, cum = self.days, self.cum
+        ordinal = self._start_ordinal + len(cum) - 1
+        count = cum[-1]
+        for day in range(ordinal, ordinal + max(n_days, INDEX_BLOCK_DAYS)):
+            if is_working(date.fromordinal(day)):
+                days.append(day)
+                count += 1
+            cum.append(count)
+
+    def _ensure_workday(self, k: int):
+        while len(self.days) <= k:
+            self._extend(len(self.cum))   # podwajanie zakresu
+
+    def _ensure_day(self, d: int):
+        while len(self.cum) <= d + 1:
+            self._extend(len(self.cum))
+
+    def ordinals(self, offsets: Sequence, finish: bool = False) -> List[Optional[int]]:
+        """Numery dni (toordinal) dla przesunięć; None -> None."""
+        if finish:
+            ks = [None if t is None else max(math.ceil(t - _EPS) - 1, 0) for t in offsets]
+        else:
+            ks = [None if t is None else math.floor(t + _EPS) for t in offsets]
+        top = max((k for k in ks if k is not None), default=-1)
+        if top >= 0:
+            self._ensure_workday(top)
+        if any(k is not None and k < 0 for k in ks):
+            raise ValueError("Przesunięcie przed rozpoczęciem projektu.")
+        days = self.days
+        return [None if k is None else days[k] for k in ks]
+
+    def shifted(self, ordinals: Sequence[Optional[int]], durations: Sequence[float]) -> Tuple[
+            List[Optional[int]], List[Optional[int]]]:
+        """Początek (pierwszy dzień roboczy od podanego dnia) i koniec po
+        duration dniach roboczych tego kalendarza – kalendarz zasobu."""
+        base = self._start_ordinal
+        top = max((o for o in ordinals if o is not None), default=base) - base
+        self._ensure_day(top)
+        cum = self.cum
+        ks = [None if o is None else cum[o - base] for o in ordinals]
+        ends = [None if k is None else k + max(math.ceil(dur - _EPS) - 1, 0)
+                for k, dur in zip(ks, durations)]
+        self._ensure_workday(max((k for k in ends if k is not None), default=0))
+        days = self.days
+        return ([None if k is None else days[k] for k in ks],
+                [None if k is None else days[k] for k in ends])
+
+    def offsets(self, days: Sequence[date], finish: bool = False) -> List[int]:
+        """Przesunięcia dla dat: liczba dni roboczych przed dniem (finish=True –
+        do końca dnia włącznie); dzień wolny daje przesunięcie następnego
+        dnia roboczego."""
+        ds = [day.toordinal() - self._start_ordinal for day in days]
+        if any(d < 0 for d in ds):
+            raise ValueError("Data przed rozpoczęciem projektu.")
+        if ds:
+            self._ensure_day(max(ds))
+        cum, shift = self.cum, 1 if finish else 0
+        return [cum[d + shift] for d in ds]
+
+
+# -------------------------
+#   KALENDARZ PROJEKTU
+# -------------------------
+class ProjectCalendar:
+    """Data rozpoczęcia, kalendarz projektu i kalendarze zasobów
+    (nazwa zasobu -> WorkCalendar). Obiekt nie zmienia się po utworzeniu –
+    przypisany do net.calendar jest częścią wyniku project_summary()."""
+
+    def __init__(self, start: DateLike, calendar: Optional[WorkCalendar] = None,
+                 resource_calendars: Optional[Mapping[str, WorkCalendar]] = None):
+        self.start = parse_date(start)
+        self.calendar = calendar or WorkCalendar()
+        self.resource_calendars: Dict[str, WorkCalendar] = dict(resource_calendars or {})
+        self._indexes: Dict[int, CalendarIndex] = {}
+
+    def index(self, calendar: Optional[WorkCalendar] = None) -> CalendarIndex:
+        calendar = calendar or self.calendar
+        idx = self._indexes.get(id(calendar))
+        if idx is None:
+            idx = self._indexes[id(calendar)] = CalendarIndex(calendar, self.start)
+        return idx
+
+    def __getstate__(self):
+        # indeksy odtwarzane są leniwie po rozpakowaniu (procesy robocze)
+        state = self.__dict__.copy()
+        state["_indexes"] = {}
+        return state
+
+    # -- przesunięcia <-> daty --
+    def to_dates(self, offsets: Sequence, finish: bool = False) -> List[Optional[date]]:
+        return [None if o is None else date.fromordinal(o)
+                for o in self.index().ordinals(offsets, finish)]
+
+    def to_date(self, offset: float, finish: bool = False) -> date:
+        return self.to_dates([offset], finish)[0]
+
+    def to_offsets(self, days: Sequence[DateLike], finish: bool = False) -> List[int]:
+        return self.index().offsets([parse_date(d) for d in days], finish)
+
+    def to_offset(self, day: DateLike, finish: bool = False) -> int:
+        return self.to_offsets([day], finish)[0]
+
+    @property
+    def start_date(self) -> date:
+        """Pierwszy dzień roboczy projektu."""
+        return self.to_date(0.0)
+
+    def calendar_for(self, activity) -> WorkCalendar:
+        """Kalendarz czynności: pierwszy z jej zasobów, który ma własny kalendarz."""
+        if self.resource_calendars:
+            for resource in activity.resources:
+                calendar = self.resource_calendars.get(resource)
+                if calendar is not None:
+                    return calendar
+        return self.calendar
+
+    # -- kolumny dat --
+    def event_dates(self, es: Sequence, lf: Sequence) -> Tuple[List, List]:
+        """Daty ES/LF zdarzeń (tekst RRRR-MM-DD albo None)."""
+        idx = self.index()
+        return _iso(idx.ordinals(es)), _iso(idx.ordinals(lf, finish=True))
+
+    def activity_dates(self, activities: Sequence, es: Sequence, ls: Sequence) -> Dict[str, List]:
+        """Kolumny ES_date/EF_date/LS_date/LF_date dla czynności (obiekty
+        z duration i resources) na podstawie ich ES i LS."""
+        idx = self.index()
+        durations = [a.duration for a in activities]
+        out = {}
+        for key, offsets in (("ES", es), ("LS", ls)):
+            starts = idx.ordinals(offsets)
+            ends = [None if t is None else t + d for t, d in zip(offsets, durations)]
+            finishes = idx.ordinals(ends, finish=True)
+            for i, d in enumerate(durations):
+                if d <= 0 and starts[i] is not None:
+                    finishes[i] = starts[i]
+            out[key] = (starts, finishes)
+
+        if self.resource_calendars:
+            groups: Dict[int, List[int]] = {}
+            calendars = {}
+            for i, a in enumerate(activities):
+                calendar = self.calendar_for(a)
+                if calendar is not self.calendar:
+                    groups.setdefault(id(calendar), []).append(i)
+                    calendars[id(calendar)] = calendar
+            for key_cal, rows in groups.items():
+                res_idx = self.index(calendars[key_cal])
+                row_durations = [durations[i] for i in rows]
+                for key in ("ES", "LS"):
+                    starts, finishes = out[key]
+                    s, f = res_idx.shifted([starts[i] for i in rows], row_durations)
+                    for i, s_i, f_i in zip(rows, s, f):
+                        starts[i], finishes[i] = s_i, f_i
+
+        return {"ES_date": _iso(out["ES"][0]), "EF_date": _iso(out["ES"][1]),
+                "LS_date": _iso(out["LS"][0]), "LF_date": _iso(out["LS"][1])}
+
+    def add_dates(self, summary: Dict, activities: Mapping[int, object]):
+        """Dopisuje daty do słownika project_summary() (w miejscu):
+        start_date/finish_date projektu oraz *_date zdarzeń i czynności."""
+        events = summary["events"]
+        es_dates, lf_dates = self.event_dates([e["ES"] for e in events], [e["LF"] for e in events])
+        for row, es, lf in zip(events, es_dates, lf_dates):
+            row["ES_date"], row["LF_date"] = es, lf
+
+        rows = summary["activities"]
+        columns = self.activity_dates([activities[r["id"]] for r in rows],
+                                      [r["ES"] for r in rows], [r["LS"] for r in rows])
+        for name, values in columns.items():
+            for row, value in zip(rows, values):
+                row[name] = value
+
+        summary["start_date"] = self.start_date.isoformat()
+        finish = self.to_date(summary["duration"], finish=True).isoformat()
+        summary["finish_date"] = max([finish] + [d for d in columns["EF_date"] if d is not None])
+
+    # -- zapis --
+    def to_dict(self) -> Dict:
+        data = {"start": self.start.isoformat(), **self.calendar.to_dict()}
+        if self.resource_calendars:
+            data["resources"] = {r: c.to_dict() for r, c in self.resource_calendars.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "ProjectCalendar":
+        """{"start": "2026-01-05", "workdays": [0..4], "holidays": [...],
+        "extra_workdays": [...], "resources": {"dźwig": {"workdays": [...]}}}"""
+        if "start" not in data:
+            raise ValueError("Brak daty rozpoczęcia projektu (start).")
+        resources = {r: WorkCalendar.from_dict({"name": r, **c})
+                     for r, c in data.get("resources", {}).items()}
+        return cls(data["start"], WorkCalendar.from_dict(data), resources)
+
+    @classmethod
+    def load(cls, path: str) -> "ProjectCalendar":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self):
+        return (f"ProjectCalendar({self.start.isoformat()}, {self.calendar!r}, "
+                f"kalendarze zasobów: {len(self.resource_calendars)})")
+
+
+def _iso(ordinals: Sequence[Optional[int]]) -> List[Optional[str]]:
+    return [None if o is None else date.fromordinal(o).isoformat() for o in ordinals]
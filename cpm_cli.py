@@ -0,0 +1,238 @@
+"""
+Wsadowe obliczenia CPM bez interfejsu graficznego.
+
+Dla każdego pliku projektu (CSV / JSON Lines, także .gz – zob. cpm_io)
+liczy project_summary() i zapisuje wynik do katalogu wyjściowego:
+- <nazwa>.json – pełne podsumowanie (czas, ścieżka krytyczna, zdarzenia, czynności),
+- <nazwa>.csv – tabela czynności z terminami i zapasami (strumieniowo, cpm_export),
+oraz raport zbiorczy report.json / report.csv (status, rozmiar sieci, czas
+projektu, czas obliczeń lub opis błędu dla każdego pliku).
+
+Z kalendarzem (--calendar plik JSON – zob. cpm_calendar.ProjectCalendar.from_dict –
+albo samo --start z kalendarzem pn–pt) wyniki zawierają też daty terminów,
+a raport – datę zakończenia projektu.
+
+Pliki rozdzielane są na pulę procesów, największe najpierw. Wynik zapisuje
+proces roboczy, a do procesu głównego wraca tylko wiersz raportu. Moduł
+importuje wyłącznie bibliotekę standardową i moduły cpm_io/cpm_core/
+cpm_export/cpm_calendar (bez Tkinter, Matplotlib i NumPy), więc start
+i pamięć procesów roboczych są niewielkie.
+Przy samym --format csv podsumowanie project_summary() nie jest budowane.
+
+Uruchomienie:
+    python cpm_cli.py projekty/ -o wyniki/
+    python cpm_cli.py "dane/**/*.csv.gz" -o wyniki/ --format json -j 8
+    python cpm_cli.py projekty/ -o wyniki/ --format both --calendar kalendarz.json
+"""
+from __future__ import annotations
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROJECT_SUFFIXES = (".csv", ".jsonl", ".ndjson", ".csv.gz", ".jsonl.gz", ".ndjson.gz")
+
+REPORT_FIELDS = ["file", "output", "status", "events", "activities", "duration",
+                 "finish_date", "critical_activities", "seconds", "error"]
+
+
+# -------------------------
+#   WYSZUKIWANIE PLIKÓW
+# -------------------------
+def find_projects(inputs: Sequence[str]) -> List[str]:
+    """Pliki projektów: katalogi (rekurencyjnie), wzorce glob i pojedyncze pliki.
+    Kolejność stała, bez powtórzeń."""
+    found: Dict[str, None] = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            for folder, _, names in os.walk(item):
+                for name in sorted(names):
+                    if name.lower().endswith(PROJECT_SUFFIXES):
+                        found[os.path.join(folder, name)] = None
+        elif any(ch in item for ch in "*?["):
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path):
+                    found[path] = None
+        elif os.path.isfile(item):
+            found[item] = None
+        else:
+            raise FileNotFoundError(f"Brak pliku lub katalogu: {item}")
+    return list(found)
+
+
+def _output_stem(path: str) -> str:
+    name = os.path.basename(path)
+    lower = name.lower()
+    for suffix in sorted(PROJECT_SUFFIXES, key=len, reverse=True):
+        if lower.endswith(suffix):
+            return name[:-len(suffix)]
+    return os.path.splitext(name)[0]
+
+
+def output_names(paths: Sequence[str]) -> List[str]:
+    """Unikalne nazwy plików wyników (bez rozszerzenia); przy powtórzeniach
+    dopisywany jest numer."""
+    used: Dict[str, int] = {}
+    names = []
+    for path in paths:
+        stem = _output_stem(path)
+        count = used.get(stem.lower(), 0)
+        used[stem.lower()] = count + 1
+        names.append(stem if count == 0 else f"{stem}-{count + 1}")
+    return names
+
+
+# -------------------------
+#   JEDEN PROJEKT (proces roboczy)
+# -------------------------
+def _write_json(summary: Dict, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False)
+
+
+def process_project(path: str, out_base: str, formats: Tuple[str, ...],
+                    calendar=None) -> Dict:
+    """Wczytuje projekt, liczy podsumowanie i zapisuje wyniki; zwraca wiersz
+    raportu. Błędy pliku nie przerywają przetwarzania – trafiają do raportu.
+    calendar: opcjonalny cpm_calendar.ProjectCalendar (daty w wynikach)."""
+    from cpm_io import load_file     # import w procesie roboczym, nie przy starcie
+    from cpm_export import export_csv
+
+    row = {"file": path, "output": out_base, "status": "ok", "events": None,
+           "activities": None, "duration": None, "finish_date": None,
+           "critical_activities": None, "seconds": None, "error": ""}
+    start = time.perf_counter()
+    try:
+        net = load_file(path)
+        net.calendar = calendar
+        if "json" in formats:
+            _write_json(net.project_summary(), out_base + ".json")
+        if "csv" in formats:
+            export_csv(net, out_base + ".csv")
+        critical_path, duration = net.critical_path()
+        if calendar is not None:
+            row["finish_date"] = (net.project_summary()["finish_date"] if "json" in formats
+                                  else calendar.to_date(duration, finish=True).isoformat())
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    else:
+        row.update(events=len(net.events), activities=len(net.activities),
+                   duration=duration, critical_activities=len(critical_path))
+    row["seconds"] = round(time.perf_counter() - start, 4)
+    return row
+
+
+# -------------------------
+#   CAŁA PARTIA
+# -------------------------
+def run_batch(paths: Sequence[str], out_dir: str, formats: Tuple[str, ...] = ("json",),
+              workers: Optional[int] = None, verbose: bool = False,
+              calendar=None) -> List[Dict]:
+    """Przetwarza pliki (workers=1 – w bieżącym procesie) i zwraca wiersze
+    raportu w kolejności paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    bases = [os.path.join(out_dir, name) for name in output_names(paths)]
+    rows: List[Optional[Dict]] = [None] * len(paths)
+
+    def done(i: int, row: Dict):
+        rows[i] = row
+        if verbose:
+            finished = sum(r is not None for r in rows)
+            info = f"{row['seconds']} s" if row["status"] == "ok" else row["error"]
+            print(f"[{finished}/{len(paths)}] {row['file']}: {info}", file=sys.stderr)
+
+    if workers == 1 or len(paths) <= 1:
+        for i, path in enumerate(paths):
+            done(i, process_project(path, bases[i], formats, calendar))
+        return rows
+
+    # największe pliki najpierw – krótszy "ogon" na końcu partii
+    order = sorted(range(len(paths)), key=lambda i: -os.path.getsize(paths[i]))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_project, paths[i], bases[i], formats, calendar): i for i in order}
+        for future in as_completed(futures):
+            done(futures[future], future.result())
+    return rows
+
+
+def write_report(rows: Sequence[Dict], out_dir: str, elapsed: float) -> Dict:
+    """Zapisuje report.json (podsumowanie + wiersze) i report.csv; zwraca podsumowanie."""
+    ok = [r for r in rows if r["status"] == "ok"]
+    totals = {
+        "projects": len(rows),
+        "ok": len(ok),
+        "errors": len(rows) - len(ok),
+        "events": sum(r["events"] for r in ok),
+        "activities": sum(r["activities"] for r in ok),
+        "max_duration": max((r["duration"] for r in ok), default=None),
+        "compute_seconds": round(sum(r["seconds"] for r in rows), 4),
+        "wall_seconds": round(elapsed, 4),
+    }
+    with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump({"totals": totals, "projects": list(rows)}, f, ensure_ascii=False, indent=1)
+    with open(os.path.join(out_dir, "report.csv"), "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Wsadowe obliczenia CPM dla wielu plików projektów.")
+    parser.add_argument("inputs", nargs="+", help="katalogi, wzorce glob lub pliki projektów")
+    parser.add_argument("-o", "--output", required=True, help="katalog wyników")
+    parser.add_argument("--format", choices=("json", "csv", "both"), default="json",
+                        help="format wyników dla projektu (domyślnie json)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="liczba procesów (domyślnie liczba rdzeni; 1 – bez puli)")
+    parser.add_argument("--calendar", metavar="PLIK",
+                        help="kalendarz projektu (JSON: start, workdays, holidays, resources)")
+    parser.add_argument("--start", metavar="RRRR-MM-DD",
+                        help="data rozpoczęcia (bez --calendar: dni robocze pn–pt)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="postęp dla każdego pliku")
+    args = parser.parse_args(argv)
+
+    try:
+        paths = find_projects(args.inputs)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if not paths:
+        print("Nie znaleziono plików projektów.", file=sys.stderr)
+        return 2
+
+    calendar = None
+    if args.calendar or args.start:
+        from cpm_calendar import ProjectCalendar
+        try:
+            if args.calendar:
+                with open(args.calendar, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if args.start:
+                    data["start"] = args.start
+                calendar = ProjectCalendar.from_dict(data)
+            else:
+                calendar = ProjectCalendar(args.start)
+        except (OSError, ValueError) as e:
+            print(f"Błąd kalendarza: {e}", file=sys.stderr)
+            return 2
+
+    formats = ("json", "csv") if args.format == "both" else (args.format,)
+    start = time.perf_counter()
+    rows = run_batch(paths, args.output, formats, workers=args.jobs, verbose=args.verbose,
+                     calendar=calendar)
+    totals = write_report(rows, args.output, time.perf_counter() - start)
+
+    print(f"Projekty: {totals['projects']}, poprawne: {totals['ok']}, błędy: {totals['errors']}, "
+          f"czas: {totals['wall_seconds']} s (raport: {os.path.join(args.output, 'report.json')})")
+    return 0 if totals["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+Skompilowany silnik CPM – sieć zamrożona do tablic NumPy.
+
+CompiledNetwork przepisuje CPMNetwork na indeksy całkowite:
+- zdarzenia i czynności numerowane 0..n-1 / 0..m-1 w kolejności tabel sieci,
+- wektory: durations, start, end (indeksy zdarzeń),
+- listy sąsiedztwa w formacie CSR (out_ptr/out_acts, in_ptr/in_acts).
+
+Sortowanie topologiczne, przebieg w przód i w tył oraz zapasy liczone są
+poziomami (wszystkie zdarzenia jednego poziomu naraz), a wyniki są identyczne
+z CPMNetwork.compute().
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from cpm_core import CPMNetwork
+from cpm_validate import NetworkValidationError, validate_graph
+
+
+def _csr(keys: np.ndarray, n: int, rank: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Buduje CSR: ptr (n+1) oraz indeksy czynności pogrupowane wg klucza.
+
+    W obrębie klucza czynności ułożone są wg rank – pozycji na liście
+    zdarzenia (np. zapisanej w migawce); bez rank – w kolejności indeksów,
+    czyli tak jak listy outgoing/incoming CPMNetwork.
+    """
+    if rank is None:
+        order = np.argsort(keys, kind="stable")
+    else:
+        order = np.lexsort((rank, keys))
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=ptr[1:])
+    return ptr, order.astype(np.int64, copy=False)
+
+
+def _alive(table) -> np.ndarray:
+    """Maska żywych wierszy tabeli CPMNetwork (events/activities)."""
+    return np.fromiter(table.alive(), dtype=bool, count=len(table.names))
+
+
+def _live(table, column, dtype) -> np.ndarray:
+    """Kolumna tabeli sieci bez usuniętych wierszy – jako nowa tablica (widok
+    bufora blokowałby zmianę rozmiaru kolumny)."""
+    values = np.array(column, dtype=dtype)
+    if table.holes:
+        values = values[_alive(table)]
+    return values
+
+
+def _scatter(table, column, values: np.ndarray):
+    """Wpisuje values (w kolejności żywych wierszy) do kolumny tabeli sieci."""
+    view = np.frombuffer(column, dtype=values.dtype)
+    if table.holes:
+        view[_alive(table)] = values
+    else:
+        view[:] = values
+
+
+def _segments(ptr: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Zwraca (sloty CSR, początki segmentów) dla podanych węzłów.
+
+    Zakłada, że każdy węzeł ma niepusty segment (wymaga tego reduceat).
+    """
+    begin = ptr[nodes]
+    lengths = ptr[nodes + 1] - begin
+    offsets = np.zeros(len(nodes), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    total = int(offsets[-1] + lengths[-1]) if len(nodes) else 0
+    slots = np.arange(total, dtype=np.int64) + np.repeat(begin - offsets, lengths)
+    return slots, offsets
+
+
+def _lookup(ids: np.ndarray, sorter: np.ndarray, wanted, what: str = "zdarzenia") -> np.ndarray:
+    """Indeksy elementów wanted w tablicy ids (sorter = argsort(ids))."""
+    wanted = np.asarray(wanted, dtype=np.int64)
+    if not len(wanted):
+        return np.empty(0, dtype=np.int64)
+    if not len(ids):
+        raise KeyError(f"Brak {what}: {int(wanted[0])}")
+    sorted_ids = ids[sorter]
+    pos = np.minimum(np.searchsorted(sorted_ids, wanted), len(ids) - 1)
+    bad = sorted_ids[pos] != wanted
+    if bad.any():
+        raise KeyError(f"Brak {what}: {int(wanted[bad][0])}")
+    return sorter[pos]
+
+
+def round6(values: np.ndarray) -> np.ndarray:
+    """Odpowiednik round(x, 6) z Pythona dla całej tablicy.
+
+    np.round różni się od round() tylko dla wartości bliskich połowy ostatniej
+    cyfry lub bardzo dużych liczb – te nieliczne przypadki liczymy po staremu.
+    """
+    out = np.round(values, 6)
+    scaled = values * 1e6
+    frac = np.abs(scaled - np.floor(scaled) - 0.5)
+    suspect = np.flatnonzero((frac < 1e-3) | ~(np.abs(scaled) < 2.0 ** 52))
+    flat_out = out.reshape(-1)
+    flat_values = values.reshape(-1)
+    for i in suspect.tolist():
+        flat_out[i] = round(float(flat_values[i]), 6)
+    return out
+
+
+# -------------------------
+#   WYNIKI (TABLICE)
+# -------------------------
+@dataclass
+class CompiledSchedule:
+    """Wyniki obliczeń CPM w postaci tablic (indeksy jak w CompiledNetwork).
+
+    - event_ES, event_LF: terminy zdarzeń
+    - ES, EF, LS, LF, total_float, free_float, is_critical: wyniki czynności
+    - project_duration: czas trwania projektu
+    """
+    event_ES: np.ndarray
+    event_LF: np.ndarray
+    ES: np.ndarray
+    EF: np.ndarray
+    LS: np.ndarray
+    LF: np.ndarray
+    total_float: np.ndarray
+    free_float: np.ndarray
+    is_critical: np.ndarray
+    project_duration: float
+
+
+# -------------------------
+#   SIEĆ SKOMPILOWANA
+# -------------------------
+class CompiledNetwork:
+    """Niezmienna, tablicowa kopia struktury CPMNetwork.
+
+    - event_ids[i], activity_ids[j]: oryginalne ID
+    - durations[j], start[j], end[j]: dane czynności j (start/end to indeksy zdarzeń)
+    - out_ptr/out_acts, in_ptr/in_acts: CSR czynności wychodzących / wchodzących
+      (out_rank/in_rank – opcjonalne pozycje czynności na listach zdarzeń)
+    """
+
+    def __init__(self, event_ids, activity_ids, durations, start, end,
+                 out_rank=None, in_rank=None):
+        self.event_ids = np.asarray(event_ids, dtype=np.int64)
+        self.activity_ids = np.asarray(activity_ids, dtype=np.int64)
+        self.durations = np.asarray(durations, dtype=np.float64)
+        self.start = np.asarray(start, dtype=np.int64)
+        self.end = np.asarray(end, dtype=np.int64)
+        self.n_events = len(self.event_ids)
+        self.n_activities = len(self.activity_ids)
+
+        self.out_ptr, self.out_acts = _csr(
+            self.start, self.n_events, None if out_rank is None else np.asarray(out_rank))
+        self.in_ptr, self.in_acts = _csr(
+            self.end, self.n_events, None if in_rank is None else np.asarray(in_rank))
+
+        # wyznaczane leniwie
+        self._event_sorter: Optional[np.ndarray] = None
+        self._activity_sorter: Optional[np.ndarray] = None
+        self._order: Optional[np.ndarray] = None
+        self._level_ptr: Optional[np.ndarray] = None
+        self._forward_steps: Optional[list] = None
+        self._backward_steps: Optional[list] = None
+
+    @classmethod
+    def from_network(cls, net: CPMNetwork) -> "CompiledNetwork":
+        """Zamraża bieżącą strukturę sieci: indeksy w kolejności wierszy tabel
+        sieci, kopiowanych wprost z kolumn. Listy czynności zdarzeń CPMNetwork
+        są w kolejności wierszy, więc CSR w kolejności indeksów je odtwarza."""
+        events, acts = net.events, net.activities
+        event_pos = np.arange(len(events.names), dtype=np.int64)
+        if events.holes:
+            event_pos = np.cumsum(_alive(events)) - 1
+        return cls(_live(events, events.ids, np.int64), _live(acts, acts.ids, np.int64),
+                   _live(acts, acts.duration, np.float64),
+                   event_pos[_live(acts, acts.start, np.int64)],
+                   event_pos[_live(acts, acts.end, np.int64)])
+
+    @classmethod
+    def from_arrays(cls, event_ids, activity_ids, durations, start_ids, end_ids,
+                    out_rank=None, in_rank=None) -> "CompiledNetwork":
+        """Jak konstruktor, ale zdarzenia czynności podane jako ID, nie indeksy."""
+        event_ids = np.asarray(event_ids, dtype=np.int64)
+        sorter = np.argsort(event_ids, kind="stable")
+        return cls(event_ids, activity_ids, durations,
+                   _lookup(event_ids, sorter, start_ids),
+                   _lookup(event_ids, sorter, end_ids), out_rank, in_rank)
+
+    # -------------------------
+    # Mapowanie ID -> indeks
+    # -------------------------
+    def event_index(self, ids) -> np.ndarray:
+        """Zamienia ID zdarzeń na indeksy (wektorowo)."""
+        if self._event_sorter is None:
+            self._event_sorter = np.argsort(self.event_ids, kind="stable")
+        return _lookup(self.event_ids, self._event_sorter, ids)
+
+    def activity_index(self, ids) -> np.ndarray:
+        """Zamienia ID czynności na indeksy (wektorowo)."""
+        if self._activity_sorter is None:
+            self._activity_sorter = np.argsort(self.activity_ids, kind="stable")
+        return _lookup(self.activity_ids, self._activity_sorter, ids, "czynności")
+
+    # -------------------------
+    # Sortowanie topologiczne (poziomami)
+    # -------------------------
+    def topological_order(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Zwraca (order, level_ptr): indeksy zdarzeń w porządku topologicznym
+        oraz granice kolejnych poziomów w tej tablicy.
+
+        Kolejność jest dokładnie taka, jak w CPMNetwork._topological_order_events()
+        (Kahn z kolejką FIFO), o ile sieć powstała przez from_network() – wtedy
+        łuki w CSR mają kolejność list net.outgoing: kolejka FIFO zdejmuje
+        zdarzenia poziomami, a w obrębie poziomu – wg ostatniego łuku, który
+        wyzerował stopień wejściowy.
+        """
+        if self._order is not None:
+            return self._order, self._level_ptr
+
+        n, m = self.n_events, self.n_activities
+        in_deg = np.bincount(self.end, minlength=n).astype(np.int64)
+        pos = np.empty(n, dtype=np.int64)
+
+        # pozycja łuku na liście outgoing swojego zdarzenia początkowego
+        slot = np.empty(m, dtype=np.int64)
+        slot[self.out_acts] = np.arange(m, dtype=np.int64)
+        rank = slot - self.out_ptr[self.start]
+        stride = int(rank.max()) + 1 if m else 1
+        key_buf = np.zeros(n, dtype=np.int64)
+
+        parts: List[np.ndarray] = []
+        level_ptr = [0]
+        frontier = np.flatnonzero(in_deg == 0)
+        count = 0
+        while len(frontier):
+            pos[frontier] = np.arange(count, count + len(frontier))
+            count += len(frontier)
+            parts.append(frontier)
+            level_ptr.append(count)
+
+            has_out = frontier[self.out_ptr[frontier + 1] > self.out_ptr[frontier]]
+            if not len(has_out):
+                break
+            slots, _ = _segments(self.out_ptr, has_out)
+            edges = self.out_acts[slots]
+            targets = self.end[edges]
+            np.subtract.at(in_deg, targets, 1)
+
+            ready = np.unique(targets)
+            ready = ready[in_deg[ready] == 0]
+            if not len(ready):
+                break
+            # ostatni przetworzony łuk do zdarzenia ma największy klucz (pos, rank)
+            keys = pos[self.start[edges]] * stride + rank[edges]
+            key_buf[ready] = -1
+            np.maximum.at(key_buf, targets, keys)
+            frontier = ready[np.argsort(key_buf[ready], kind="stable")]
+
+        if count != n:
+            arcs = zip(self.activity_ids.tolist(), self.event_ids[self.start].tolist(),
+                       self.event_ids[self.end].tolist())
+            raise NetworkValidationError(validate_graph(self.event_ids.tolist(), arcs),
+                                         "Graf zdarzeń zawiera cykle lub jest niespójny.")
+
+        self._order = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        self._level_ptr = np.asarray(level_ptr, dtype=np.int64)
+        return self._order, self._level_ptr
+
+    def levels(self):
+        """Iteruje po poziomach: tablice indeksów zdarzeń kolejnych poziomów."""
+        order, level_ptr = self.topological_order()
+        for i in range(len(level_ptr) - 1):
+            yield order[level_ptr[i]:level_ptr[i + 1]]
+
+    def _steps(self) -> Tuple[list, list]:
+        """Plan przebiegów: dla każdego poziomu (zdarzenia, czynności, zdarzenia
+        po drugiej stronie czynności, początki segmentów dla reduceat)."""
+        if self._forward_steps is None:
+            levels = list(self.levels())
+            forward = []
+            for nodes in levels[1:]:
+                slots, offsets = _segments(self.in_ptr, nodes)
+                edges = self.in_acts[slots]
+                forward.append((nodes, edges, self.start[edges], offsets))
+            backward = []
+            for nodes in reversed(levels):
+                nodes = nodes[self.out_ptr[nodes + 1] > self.out_ptr[nodes]]
+                if not len(nodes):
+                    continue
+                slots, offsets = _segments(self.out_ptr, nodes)
+                edges = self.out_acts[slots]
+                backward.append((nodes, edges, self.end[edges], offsets))
+            self._forward_steps, self._backward_steps = forward, backward
+        return self._forward_steps, self._backward_steps
+
+    # -------------------------
+    # Przebiegi dla wielu wektorów czasów naraz
+    # -------------------------
+    # Macierze mają układ "kolumna = wariant": czasy (m, S), terminy zdarzeń
+    # (n, S). Dzięki temu pobranie terminów zdarzeń poziomu kopiuje całe,
+    # ciągłe wiersze pamięci.
+    def forward_many(self, durations: np.ndarray) -> np.ndarray:
+        """FORWARD PASS dla macierzy czasów (m, S) – zwraca ES zdarzeń (n, S).
+
+        ES zdarzenia = max(0, max EF czynności wchodzących); każdy poziom
+        liczony jest naraz dla wszystkich S wariantów.
+        """
+        forward, _ = self._steps()
+        ev_es = np.zeros((self.n_events, durations.shape[1]))
+        for nodes, edges, src, offsets in forward:
+            ef = ev_es[src] + durations[edges]
+            ev_es[nodes] = np.maximum(np.maximum.reduceat(ef, offsets, axis=0), 0.0)
+        return ev_es
+
+    def backward_many(self, durations: np.ndarray, ev_es: np.ndarray) -> np.ndarray:
+        """BACKWARD PASS dla macierzy czasów (m, S) – zwraca LF zdarzeń (n, S).
+
+        LF zdarzenia = min LS czynności wychodzących, a dla zdarzeń bez
+        czynności wychodzących – czas projektu danego wariantu.
+        """
+        _, backward = self._steps()
+        project_duration = ev_es.max(axis=0)
+        ev_lf = np.repeat(project_duration[None, :], self.n_events, axis=0)
+        for nodes, edges, dst, offsets in backward:
+            ls = ev_lf[dst] - durations[edges]
+            ev_lf[nodes] = np.minimum.reduceat(ls, offsets, axis=0)
+        return ev_lf
+
+    # -------------------------
+    # Obliczenia CPM
+    # -------------------------
+    def compute(self, durations: Optional[np.ndarray] = None) -> Optional[CompiledSchedule]:
+        """Liczy ES/EF/LS/LF, zapasy i czynności krytyczne.
+
+        Zwraca None dla pustej sieci (tak jak CPMNetwork.compute() nic wtedy nie liczy).
+        Opcjonalny wektor durations zastępuje czasy trwania bez zmiany struktury.
+        """
+        if self.n_events == 0 or self.n_activities == 0:
+            return None
+        dur = self.durations if durations is None else np.asarray(durations, dtype=np.float64)
+
+        ev_es = self.forward_many(dur[:, None])
+        ev_lf = self.backward_many(dur[:, None], ev_es)[:, 0]
+        ev_es = ev_es[:, 0]
+
+        es = ev_es[self.start]
+        ef = es + dur
+        project_duration = float(ev_es.max())
+        lf = ev_lf[self.end]
+        ls = lf - dur
+
+        # ZAPASY I ŚCIEŻKA KRYTYCZNA
+        total_float = round6(ls - es)
+        free_float = round6(ev_es[self.end] - ef)
+        is_critical = np.abs(total_float) < 1e-9
+
+        return CompiledSchedule(
+            event_ES=ev_es, event_LF=ev_lf,
+            ES=es, EF=ef, LS=ls, LF=lf,
+            total_float=total_float, free_float=free_float,
+            is_critical=is_critical,
+            project_duration=project_duration,
+        )
+
+    def critical_path(self, schedule: CompiledSchedule) -> Tuple[List[int], float]:
+        """Jak CPMNetwork.critical_path(): ID czynności krytycznych wg pozycji
+        topologicznej zdarzenia początkowego oraz czas projektu."""
+        order, _ = self.topological_order()
+        pos = np.empty(self.n_events, dtype=np.int64)
+        pos[order] = np.arange(self.n_events)
+        crit = np.flatnonzero(schedule.is_critical)
+        crit = crit[np.argsort(pos[self.start[crit]], kind="stable")]
+        return self.activity_ids[crit].tolist(), schedule.project_duration
+
+    # -------------------------
+    # Zapis wyników do obiektów
+    # -------------------------
+    def write_back(self, net: CPMNetwork, schedule: CompiledSchedule):
+        """Przepisuje wyniki do kolumn tabel sieci, z której powstała ta kopia
+        (struktura sieci nie może się od tego czasu zmienić)."""
+        if len(net.events) != self.n_events or len(net.activities) != self.n_activities:
+            raise ValueError("Sieć zmieniła się od czasu kompilacji.")
+
+        events, acts = net.events, net.activities
+        _scatter(events, events.ES, schedule.event_ES)
+        _scatter(events, events.LF, schedule.event_LF)
+        store = acts.results
+        for name in ("ES", "EF", "LS", "LF", "total_float", "free_float"):
+            _scatter(acts, getattr(store, name), getattr(schedule, name))
+        _scatter(acts, store.is_critical, schedule.is_critical.astype(np.uint8))
+        net._last_project_duration = schedule.project_duration
+
+
+def compute_compiled(net: CPMNetwork) -> Optional[CompiledSchedule]:
+    """Zamiennik net.compute(): kompiluje sieć, liczy tablicowo i zapisuje wyniki
+    w tabelach sieci. Zwraca też tablice wyników (None dla pustej sieci)."""
+    compiled = CompiledNetwork.from_network(net)
+    schedule = compiled.compute()
+    if schedule is not None:
+        compiled.write_back(net, schedule)
+    return schedule
@@ -1,28 +1,325 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from array import array
+from itertools import compress, repeat
+from operator import attrgetter, is_not
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 import collections
+import collections.abc
+import itertools
+import heapq
+import operator
+
+from cpm_validate import NetworkValidationError, ValidationReport, validate_graph
+
+
+# etapy zgłaszane przez compute(progress=...) / project_summary(progress=...)
+PHASES = ("topological_order", "forward", "backward", "floats", "summary")
+_PROGRESS_EVERY = 4096       # co ile elementów wywoływany jest progress
+
+# progress(etap, ułamek 0..1); wyjątek zgłoszony w progress przerywa obliczenia
+Progress = Callable[[str, float], None]
+
+_NORMALIZE_TABLE = str.maketrans({"’": "'", "‘": "'", "`": "'", "“": '"', "”": '"'})
 
 
 def normalize(text: str) -> str:
     if text is None:
         return ""
-    return (
-        str(text)
-        .replace("’", "'")
-        .replace("‘", "'")
-        .replace("`", "'")
-        .replace("“", '"')
-        .replace("”", '"')
-        .strip()
-    )
+    return str(text).translate(_NORMALIZE_TABLE).strip()
+
+
+def normalize_many(texts: List[Optional[str]]) -> List[str]:
+    """normalize() dla całej listy napisów – jedno translate() na paczkę."""
+    texts = ["" if t is None else str(t) for t in texts]
+    joined = "\x00".join(texts)
+    if joined.count("\x00") != len(texts) - 1:
+        return [normalize(t) for t in texts]
+    return [t.strip() for t in joined.translate(_NORMALIZE_TABLE).split("\x00")] if texts else []
+
+
+_NAN = float("nan")
+_NO_RESOURCES: Mapping[str, float] = MappingProxyType({})   # wspólne, niemodyfikowalne
+
+
+class _Hole:
+    """Znacznik usuniętego wiersza w kolumnie names tabeli (pickle zachowuje
+    tożsamość – odtwarza go jako _HOLE tego modułu)."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return "_HOLE"
+
+    def __repr__(self):
+        return "<usunięty>"
+
+
+_HOLE = _Hole()
+_COMPACT_MIN = 64            # kompaktowanie tabeli dopiero przy tylu dziurach
+
+
+# -------------------------
+#   INDEKS ID -> WIERSZ
+# -------------------------
+_GOLDEN = 0x9E3779B97F4A7C15     # mnożnik haszowania Fibonacciego (2^64 / złota liczba)
+_MASK64 = (1 << 64) - 1
+
+
+class _IdIndex:
+    """Tablica mieszająca ID -> numer wiersza tabeli: adresowanie otwarte
+    z próbkowaniem liniowym w array('i') (−1 = wolne miejsce), zapełnienie
+    najwyżej 1/2. Klucze nie są tu przechowywane – porównuje się je
+    z kolumną ids tabeli, więc wpis kosztuje 8 bajtów zamiast ~100 w dict."""
+    __slots__ = ("keys", "slots", "shift", "used")
+
+    def __init__(self, keys: array, rows: int = 0):
+        """Indeks wierszy 0..rows-1 kolumny keys (wszystkie żywe)."""
+        self.keys = keys
+        self.used = rows
+        capacity = 8
+        while capacity < 2 * rows:
+            capacity *= 2
+        self._allocate(capacity)
+        for row in range(rows):
+            self._place(keys[row], row)
+
+    def _allocate(self, capacity: int):
+        self.slots = array("i", [-1]) * capacity
+        self.shift = 65 - capacity.bit_length()
+
+    def _place(self, key: int, row: int):
+        slots = self.slots
+        mask = len(slots) - 1
+        i = ((key * _GOLDEN) & _MASK64) >> self.shift
+        while slots[i] >= 0:
+            i = (i + 1) & mask
+        slots[i] = row
+
+    def copy(self, keys: array) -> "_IdIndex":
+        """Kopia indeksu dla kopii kolumny kluczy."""
+        dup = _IdIndex.__new__(_IdIndex)
+        dup.keys = keys
+        dup.slots = self.slots[:]
+        dup.shift = self.shift
+        dup.used = self.used
+        return dup
+
+    def find(self, key: int) -> int:
+        """Wiersz klucza albo −1."""
+        slots, keys = self.slots, self.keys
+        mask = len(slots) - 1
+        i = ((key * _GOLDEN) & _MASK64) >> self.shift
+        while True:
+            row = slots[i]
+            if row < 0 or keys[row] == key:
+                return row
+            i = (i + 1) & mask
+
+    def insert(self, key: int, row: int):
+        """Dopisuje klucz, którego jeszcze nie ma w indeksie."""
+        if 2 * (self.used + 1) > len(self.slots):
+            old, keys = self.slots, self.keys
+            self._allocate(2 * len(old))
+            for r in old:
+                if r >= 0:
+                    self._place(keys[r], r)
+        self._place(key, row)
+        self.used += 1
+
+    def remove(self, key: int):
+        """Usuwa klucz obecny w indeksie. Dalsze wpisy łańcucha cofają się na
+        zwolnione miejsce, więc nie są potrzebne znaczniki usunięcia."""
+        slots, keys = self.slots, self.keys
+        mask = len(slots) - 1
+        shift = self.shift
+        i = ((key * _GOLDEN) & _MASK64) >> shift
+        while keys[slots[i]] != key:
+            i = (i + 1) & mask
+        j = i
+        while True:
+            j = (j + 1) & mask
+            row = slots[j]
+            if row < 0:
+                break
+            home = ((keys[row] * _GOLDEN) & _MASK64) >> shift
+            # wpis z j może zająć dziurę i, gdy i leży (cyklicznie) między jego
+            # miejscem docelowym a j
+            if (j - home) & mask >= (j - i) & mask:
+                slots[i] = row
+                i = j
+        slots[i] = -1
+        self.used -= 1
+
+
+# -------------------------
+#   WYNIKI CZYNNOŚCI
+# -------------------------
+class ActivityResults:
+    """Wyniki obliczeń czynności sieci w tablicach równoległych do wierszy
+    ActivityTable: ES, EF, LS, LF i zapasy w array('d') (brak wartości = NaN),
+    is_critical w bytearray.
+    """
+    __slots__ = ("ES", "EF", "LS", "LF", "total_float", "free_float", "is_critical")
+
+    def __init__(self):
+        self.ES = array("d")
+        self.EF = array("d")
+        self.LS = array("d")
+        self.LF = array("d")
+        self.total_float = array("d")
+        self.free_float = array("d")
+        self.is_critical = bytearray()
+
+    def _float_columns(self) -> Tuple[array, ...]:
+        return self.ES, self.EF, self.LS, self.LF, self.total_float, self.free_float
+
+    def append(self):
+        """Dopisuje pusty wiersz (bez wyników)."""
+        for column in self._float_columns():
+            column.append(_NAN)
+        self.is_critical.append(0)
+
+    def extend(self, rows: int):
+        """Dopisuje rows pustych wierszy (bez wyników)."""
+        empty = array("d", [_NAN]) * rows
+        for column in self._float_columns():
+            column.extend(empty)
+        self.is_critical.extend(bytes(rows))
+
+    def compact(self, alive: bytearray):
+        """Zostawia tylko wiersze z alive (kolumny zachowują tożsamość)."""
+        for column in self._float_columns():
+            column[:] = array("d", compress(column, alive))
+        self.is_critical[:] = bytes(compress(self.is_critical, alive))
+
+    def copy(self) -> "ActivityResults":
+        dup = ActivityResults()
+        for name in self.__slots__:
+            setattr(dup, name, getattr(self, name)[:])
+        return dup
+
+    def set_row(self, row: int, es, ef, ls, lf, total_float, free_float, is_critical: bool):
+        self.ES[row] = _NAN if es is None else es
+        self.EF[row] = _NAN if ef is None else ef
+        self.LS[row] = _NAN if ls is None else ls
+        self.LF[row] = _NAN if lf is None else lf
+        self.total_float[row] = _NAN if total_float is None else total_float
+        self.free_float[row] = _NAN if free_float is None else free_float
+        self.is_critical[row] = 1 if is_critical else 0
+
+    def row_values(self, row: int) -> Tuple:
+        """(ES, EF, LS, LF, total_float, free_float, is_critical); NaN -> None."""
+        values = [x if x == x else None for x in (self.ES[row], self.EF[row], self.LS[row],
+                                                  self.LF[row], self.total_float[row],
+                                                  self.free_float[row])]
+        values.append(bool(self.is_critical[row]))
+        return tuple(values)
+
+
+# -------------------------
+#   POLA OBIEKTÓW: SLOT ALBO KOLUMNA TABELI
+# -------------------------
+def _column(name: str):
+    """(odczyt, zapis) kolumny tabeli o nazwie name."""
+    column = attrgetter(name)
+
+    def read(table, row):
+        return column(table)[row]
+
+    def write(table, row, value):
+        column(table)[row] = value
+
+    return read, write
+
+
+def _optional_column(name: str):
+    """(odczyt, zapis) kolumny array('d'), w której NaN oznacza None."""
+    column = attrgetter(name)
+
+    def read(table, row):
+        value = column(table)[row]
+        return None if value != value else value
+
+    def write(table, row, value):
+        column(table)[row] = _NAN if value is None else value
+
+    return read, write
+
+
+def _field(name: str, read: Callable, write: Optional[Callable] = None) -> property:
+    """Pole name: slot _name obiektu samodzielnego albo read(tabela, wiersz) /
+    write(tabela, wiersz, wartość) widoku wiersza. Bez write pole jest w sieci
+    tylko do odczytu."""
+    slot = "_" + name
+    own = attrgetter(slot)
+
+    def get(self):
+        table = self._table
+        if table is None:
+            return own(self)
+        return read(table, self._at())
+
+    def set(self, value):
+        table = self._table
+        if table is None:
+            setattr(self, slot, value)
+        elif write is None:
+            raise AttributeError(f"Pola {name} nie można zmienić w obiekcie należącym do sieci "
+                                 "(należy usunąć obiekt i dodać go ponownie).")
+        else:
+            write(table, self._at(), value)
+
+    return property(get, set)
+
+
+class _RowView:
+    """Wspólna część Event i Activity. Obiekt jest samodzielny (_table None,
+    dane w slotach) albo – po dodaniu do sieci i przy odczycie z niej – jest
+    widokiem wiersza tabeli sieci, który czyta i zapisuje jej kolumny."""
+    __slots__ = ("_table", "_row", "_id")
+
+    def _at(self) -> int:
+        """Bieżący wiersz widoku; po kompaktowaniu tabeli szukany ponownie po ID
+        (KeyError, gdy obiekt usunięto z sieci)."""
+        table, row = self._table, self._row
+        names = table.names
+        if row >= len(names) or names[row] is _HOLE or table.ids[row] != self._id:
+            row = self._row = table.row(self._id)
+        return row
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @id.setter
+    def id(self, value: int):
+        if self._table is not None:
+            raise AttributeError("Nie można zmienić ID obiektu należącego do sieci.")
+        self._id = value
+
+    __hash__ = None
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._input() == other._input()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self._input()))
+        return f"{self.__class__.__name__}({fields})"
+
+
+def _bind(obj: _RowView, table: "_Table", row: int):
+    """Zamienia obiekt w widok wiersza row tabeli."""
+    obj._table = table
+    obj._row = row
+    obj._id = table.ids[row]
 
 
 # -------------------------
 #   ZDARZENIE (EVENT)
 # -------------------------
-@dataclass
-class Event:
+class Event(_RowView):
     """Zdarzenie CPM (węzeł sieci).
 
     Pola:
@@ -30,18 +327,101 @@ class Event:
     - name: opis tekstowy (np. 'Start', 'Koniec fundamentów')
     - ES: najwcześniejszy czas zajścia zdarzenia
     - LF: najpóźniejszy czas zajścia zdarzenia
+
+    Zdarzenia sieci leżą w kolumnach EventTable; net.events[id] zwraca lekki
+    widok wiersza, a obiekt przekazany do add_batch() staje się takim widokiem.
+    Kopia i pickle dają obiekt samodzielny.
     """
-    id: int
-    name: str = ""
-    ES: float = 0.0
-    LF: Optional[float] = None
+    __slots__ = ("_name", "_ES", "_LF")
+    _fields = ("id", "name", "ES", "LF")
+
+    def __init__(self, id: int, name: str = "", ES: float = 0.0, LF: Optional[float] = None):
+        self._table = None
+        self._id = id
+        self._name = name
+        self._ES = ES
+        self._LF = LF
+
+    name = _field("name", *_column("names"))
+    ES = _field("ES", *_column("ES"))
+    LF = _field("LF", *_optional_column("LF"))
+
+    def _input(self) -> Tuple:
+        return self.id, self.name, self.ES, self.LF
+
+    def __reduce__(self):
+        return Event, self._input()
 
 
 # -------------------------
 #   CZYNNOŚĆ (ACTIVITY)
 # -------------------------
-@dataclass
-class Activity:
+_RESULTS = ("ES", "EF", "LS", "LF", "total_float", "free_float")
+
+
+def _result_field(name: str) -> property:
+    """Wynik czynności: kolumna ActivityResults tabeli albo własna lista
+    _result obiektu samodzielnego (None przed obliczeniem)."""
+    column = attrgetter(name)
+    i = _RESULTS.index(name)
+
+    def get(self):
+        table = self._table
+        if table is None:
+            result = self._result
+            return None if result is None else result[i]
+        value = column(table.results)[self._at()]
+        return None if value != value else value
+
+    def set(self, value):
+        table = self._table
+        if table is None:
+            if self._result is None:
+                self._result = [None] * len(_RESULTS)
+            self._result[i] = value
+        else:
+            column(table.results)[self._at()] = _NAN if value is None else value
+
+    return property(get, set)
+
+
+def _event_id(column: str):
+    """Odczyt ID zdarzenia wskazanego kolumną wierszy zdarzeń (start/end)."""
+    rows = attrgetter(column)
+
+    def read(table, row):
+        return table.events.ids[rows(table)[row]]
+
+    return read
+
+
+def _read_resources(table, row):
+    return table.resources.get(row, _NO_RESOURCES)
+
+
+def _write_resources(table, row, value):
+    if value is _NO_RESOURCES:
+        table.resources.pop(row, None)
+    else:
+        table.resources[row] = value
+
+
+def _get_critical(self) -> bool:
+    table = self._table
+    if table is None:
+        return self._critical
+    return bool(table.results.is_critical[self._at()])
+
+
+def _set_critical(self, value: bool):
+    table = self._table
+    if table is None:
+        self._critical = bool(value)
+    else:
+        table.results.is_critical[self._at()] = 1 if value else 0
+
+
+class Activity(_RowView):
     """Czynność CPM (łuk między zdarzeniami).
 
     Pola:
@@ -50,27 +430,540 @@ class Activity:
     - duration: czas trwania
     - start_event: ID zdarzenia początkowego (int)
     - end_event: ID zdarzenia końcowego (int)
+    - optimistic, pessimistic: opcjonalne czasy optymistyczny i pesymistyczny
+      (PERT); duration pełni wtedy rolę czasu najbardziej prawdopodobnego
+    - resources: zapotrzebowanie na zasoby w czasie trwania (nazwa -> ilość);
+      domyślnie wspólne puste, niemodyfikowalne mapowanie – aby ustawić
+      zapotrzebowanie, należy przypisać nowy słownik
+    - crash_duration: najkrótszy możliwy czas trwania (None = bez skracania)
+    - crash_cost: koszt skrócenia czynności o jednostkę czasu
 
-    Wyniki obliczeń:
+    Wyniki obliczeń (właściwości, None przed obliczeniem):
     - ES, EF, LS, LF, total_float, free_float, is_critical
+
+    Dane czynności sieci leżą w kolumnach ActivityTable, a wyniki
+    w ActivityResults. Obiekt utworzony konstruktorem trzyma dane w slotach;
+    add_activity()/add_batch() kopiują je do tabeli i zamieniają obiekt
+    w widok wiersza, tak jak obiekty zwracane przez net.activities. W sieci
+    start_event i end_event są tylko do odczytu (zmiana łuku = usunięcie
+    i ponowne dodanie). Kopia (copy.copy) i pickle dają obiekt samodzielny
+    z samymi danymi wejściowymi.
     """
-    id: int
-    name: str
-    duration: float
-    start_event: int
-    end_event: int
-
-    ES: Optional[float] = None
-    EF: Optional[float] = None
-    LS: Optional[float] = None
-    LF: Optional[float] = None
-    total_float: Optional[float] = None
-    free_float: Optional[float] = None
-    is_critical: bool = False
-
-    def __post_init__(self):
-        if self.duration < 0:
+    __slots__ = ("_name", "_duration", "_start_event", "_end_event", "_optimistic",
+                 "_pessimistic", "_resources", "_crash_duration", "_crash_cost",
+                 "_result", "_critical")
+    _fields = ("id", "name", "duration", "start_event", "end_event", "optimistic",
+               "pessimistic", "resources", "crash_duration", "crash_cost")
+
+    def __init__(self, id: int, name: str, duration: float, start_event: int, end_event: int,
+                 optimistic: Optional[float] = None, pessimistic: Optional[float] = None,
+                 resources: Optional[Mapping[str, float]] = None,
+                 crash_duration: Optional[float] = None, crash_cost: float = 0.0):
+        self._table = None
+        self._id = id
+        self._name = name
+        self._duration = duration
+        self._start_event = start_event
+        self._end_event = end_event
+        self._optimistic = optimistic
+        self._pessimistic = pessimistic
+        self._resources = _NO_RESOURCES if resources is None else resources
+        self._crash_duration = crash_duration
+        self._crash_cost = crash_cost
+        self._result = None
+        self._critical = False
+        self.check(duration)
+
+    name = _field("name", *_column("names"))
+    duration = _field("duration", *_column("duration"))
+    start_event = _field("start_event", _event_id("start"))
+    end_event = _field("end_event", _event_id("end"))
+    optimistic = _field("optimistic", *_optional_column("optimistic"))
+    pessimistic = _field("pessimistic", *_optional_column("pessimistic"))
+    resources = _field("resources", _read_resources, _write_resources)
+    crash_duration = _field("crash_duration", *_optional_column("crash_duration"))
+    crash_cost = _field("crash_cost", *_column("crash_cost"))
+
+    ES = _result_field("ES")
+    EF = _result_field("EF")
+    LS = _result_field("LS")
+    LF = _result_field("LF")
+    total_float = _result_field("total_float")
+    free_float = _result_field("free_float")
+    is_critical = property(_get_critical, _set_critical)
+
+    def check(self, duration: float):
+        """Sprawdza dane wejściowe czynności przy czasie trwania duration
+        (bieżącym albo planowanym – zob. CPMNetwork.set_duration)."""
+        if duration < 0:
             raise ValueError("Czas trwania czynności nie może być ujemny.")
+        low = duration if self.optimistic is None else self.optimistic
+        high = duration if self.pessimistic is None else self.pessimistic
+        if not 0 <= low <= duration <= high:
+            raise ValueError("Wymagane: 0 <= optymistyczny <= czas trwania <= pesymistyczny.")
+        if any(amount < 0 for amount in self.resources.values()):
+            raise ValueError("Zapotrzebowanie na zasób nie może być ujemne.")
+        if self.crash_duration is not None and not 0 <= self.crash_duration <= duration:
+            raise ValueError("Wymagane: 0 <= czas po skróceniu <= czas trwania.")
+        if self.crash_cost < 0:
+            raise ValueError("Koszt skrócenia nie może być ujemny.")
+
+    def _input(self) -> Tuple:
+        """Dane wejściowe w kolejności argumentów konstruktora."""
+        if self._table is None:
+            return (self._id, self._name, self._duration, self._start_event, self._end_event,
+                    self._optimistic, self._pessimistic, self._resources,
+                    self._crash_duration, self._crash_cost)
+        return self._table.input_values(self._at())
+
+    def __reduce__(self):
+        values = list(self._input())
+        # mappingproxy nie daje się serializować – puste zasoby jako None
+        values[7] = dict(values[7]) if values[7] else None
+        return Activity, tuple(values)
+
+
+# -------------------------
+#   TABELE ZDARZEŃ I CZYNNOŚCI
+# -------------------------
+class _Table(collections.abc.Mapping):
+    """Wspólna część EventTable i ActivityTable – mapowanie ID -> obiekt
+    (widok wiersza), używane jak dawny dict sieci.
+
+    Dane leżą w kolumnach (array, list) o wspólnej numeracji wierszy. Nowe
+    wiersze dopisywane są na końcu, więc kolejność wierszy to kolejność
+    dodania. Usunięty wiersz zostaje dziurą (nazwa _HOLE) do kompaktowania,
+    które zachowuje kolejność pozostałych wierszy.
+    """
+    _columns: Tuple[str, ...] = ()       # kolumny array (z ids) przesuwane przy kompaktowaniu
+    _view: type = _RowView               # klasa widoku wiersza
+
+    def __init__(self):
+        self.ids = array("q")
+        self.names: List = []
+        self.holes = 0
+        self.index = _IdIndex(self.ids)
+
+    # -- Mapping --
+    def __len__(self) -> int:
+        return len(self.names) - self.holes
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.live(self.ids))
+
+    def __contains__(self, key) -> bool:
+        return self.find(key) >= 0
+
+    def __getitem__(self, key):
+        return self._object(self.row(key))
+
+    def values(self) -> "_TableValues":
+        return _TableValues(self)
+
+    def items(self) -> "_TableItems":
+        return _TableItems(self)
+
+    # -- wiersze --
+    def find(self, key) -> int:
+        """Wiersz obiektu o ID key albo −1."""
+        if key.__class__ is not int:
+            try:
+                key = operator.index(key)
+            except TypeError:
+                return -1
+        return self.index.find(key)
+
+    def row(self, key) -> int:
+        """Wiersz obiektu o ID key (KeyError, gdy go nie ma)."""
+        row = self.find(key)
+        if row < 0:
+            raise KeyError(key)
+        return row
+
+    def alive(self) -> Iterator[bool]:
+        """Maska żywych wierszy (dla itertools.compress)."""
+        return map(is_not, self.names, repeat(_HOLE))
+
+    def live_rows(self) -> Iterable[int]:
+        """Numery żywych wierszy w kolejności dodania."""
+        rows = range(len(self.names))
+        return rows if not self.holes else compress(rows, self.alive())
+
+    def live(self, column) -> Iterable:
+        """Wartości kolumny dla żywych wierszy."""
+        return column if not self.holes else compress(column, self.alive())
+
+    def rows(self) -> "TableRows":
+        return TableRows(self)
+
+    def _object(self, row: int):
+        obj = self._view.__new__(self._view)
+        obj._table = self
+        obj._row = row
+        obj._id = self.ids[row]
+        return obj
+
+    def _kill(self, row: int):
+        self.index.remove(self.ids[row])
+        self.names[row] = _HOLE
+        self.holes += 1
+
+    def needs_compaction(self) -> bool:
+        return self.holes > _COMPACT_MIN and 2 * self.holes > len(self.names)
+
+    def _compact(self) -> Tuple[bytearray, array]:
+        """Usuwa dziury z kolumn (w miejscu – kolumny zachowują tożsamość).
+        Zwraca maskę żywych wierszy i mapę stary wiersz -> nowy (−1 dla
+        usuniętych) z dodatkowym −1 na końcu, dzięki któremu także −1 (koniec
+        listy) przechodzi na −1."""
+        alive = bytearray(self.alive())
+        new_of = array("i", [-1]) * (len(alive) + 1)
+        for new, old in enumerate(compress(range(len(alive)), alive)):
+            new_of[old] = new
+        for name in self._columns:
+            column = getattr(self, name)
+            column[:] = array(column.typecode, compress(column, alive))
+        self.names[:] = compress(self.names, alive)
+        self.holes = 0
+        self.index = _IdIndex(self.ids, len(self.names))
+        return alive, new_of
+
+    def _copy_into(self, dup: "_Table"):
+        for name in self._columns:
+            setattr(dup, name, getattr(self, name)[:])
+        dup.names = list(self.names)
+        dup.holes = self.holes
+        dup.index = self.index.copy(dup.ids)
+
+
+class _TableValues(collections.abc.ValuesView):
+    __slots__ = ()
+
+    def __iter__(self):
+        table = self._mapping
+        return map(table._object, table.live_rows())
+
+
+class _TableItems(collections.abc.ItemsView):
+    __slots__ = ()
+
+    def __iter__(self):
+        table = self._mapping
+        ids, obj = table.ids, table._object
+        return ((ids[row], obj(row)) for row in table.live_rows())
+
+
+class TableRows(collections.abc.Sequence):
+    """Obiekty tabeli po pozycji (w kolejności dodania), tworzone dopiero przy
+    odczycie – np. wiersze cpm_table.TableView bez budowania listy obiektów
+    dla całej sieci."""
+
+    def __init__(self, table: _Table):
+        self._table = table
+        self._rows = table.live_rows() if not table.holes else array("i", table.live_rows())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._table._object(row) for row in self._rows[i]]
+        return self._table._object(self._rows[i])
+
+
+class EventTable(_Table):
+    """Zdarzenia sieci w kolumnach: ids, names, ES, LF (array('d'), brak
+    wartości = NaN) oraz początki i końce list czynności wychodzących
+    (out_head/out_tail) i wchodzących (in_head/in_tail) – wiersze
+    ActivityTable, −1 = lista pusta."""
+    _columns = ("ids", "ES", "LF", "out_head", "out_tail", "in_head", "in_tail")
+
+    def __init__(self):
+        super().__init__()
+        self.ES = array("d")
+        self.LF = array("d")
+        self.out_head = array("i")
+        self.out_tail = array("i")
+        self.in_head = array("i")
+        self.in_tail = array("i")
+
+    def append(self, event_id: int, name: str = "", es: float = 0.0,
+               lf: Optional[float] = None) -> int:
+        """Dopisuje zdarzenie (bez sprawdzania ID) i zwraca numer wiersza."""
+        row = len(self.names)
+        self.ids.append(event_id)
+        self.names.append(name)
+        self.ES.append(es)
+        self.LF.append(_NAN if lf is None else lf)
+        for column in (self.out_head, self.out_tail, self.in_head, self.in_tail):
+            column.append(-1)
+        self.index.insert(self.ids[row], row)
+        return row
+
+    def kill(self, row: int):
+        """Usuwa zdarzenie bez czynności (wiersz zostaje dziurą)."""
+        self._kill(row)
+
+    def load(self, ids: Iterable[int], names: Iterable[str]):
+        """Wczytuje kolumny do pustej tabeli."""
+        self.ids.extend(ids)
+        self.names.extend(names)
+        n = len(self.names)
+        self.ES.extend(array("d", [0.0]) * n)
+        self.LF.extend(array("d", [_NAN]) * n)
+        for column in (self.out_head, self.out_tail, self.in_head, self.in_tail):
+            column.extend(array("i", [-1]) * n)
+        self.index = _IdIndex(self.ids, n)
+
+    def input_columns(self) -> Tuple[array, List[str]]:
+        """(ids, names) żywych wierszy – dane wejściowe dla load()."""
+        return array("q", self.live(self.ids)), list(self.live(self.names))
+
+    def copy(self) -> "EventTable":
+        dup = EventTable.__new__(EventTable)
+        self._copy_into(dup)
+        return dup
+
+
+class ActivityTable(_Table):
+    """Czynności sieci w kolumnach (wiersz = czynność):
+
+    - ids, names, duration, crash_cost oraz optimistic, pessimistic,
+      crash_duration (array('d'), NaN = None)
+    - resources: wiersz -> zapotrzebowanie, tylko dla czynności z zasobami
+    - start, end: wiersze zdarzenia początkowego i końcowego w EventTable
+    - out_next/out_prev, in_next/in_prev: dwukierunkowe listy czynności
+      wychodzących i wchodzących każdego zdarzenia (−1 = koniec) – dopisanie
+      i usunięcie w O(1); kolejność na listach to kolejność wierszy
+    - results: ActivityResults
+    """
+    _columns = ("ids", "duration", "start", "end", "optimistic", "pessimistic",
+                "crash_duration", "crash_cost", "out_next", "out_prev", "in_next", "in_prev")
+
+    def __init__(self, events: EventTable):
+        super().__init__()
+        self.events = events
+        self.duration = array("d")
+        self.start = array("i")
+        self.end = array("i")
+        self.optimistic = array("d")
+        self.pessimistic = array("d")
+        self.crash_duration = array("d")
+        self.crash_cost = array("d")
+        self.resources: Dict[int, Mapping[str, float]] = {}
+        self.out_next = array("i")
+        self.out_prev = array("i")
+        self.in_next = array("i")
+        self.in_prev = array("i")
+        self.results = ActivityResults()
+
+    def append(self, values: Tuple, u: int, v: int) -> int:
+        """Dopisuje czynność (values jak Activity._input(), u/v – wiersze jej
+        zdarzeń) na koniec tabeli i list jej zdarzeń; zwraca numer wiersza."""
+        (aid, name, duration, _, _, optimistic, pessimistic,
+         resources, crash_duration, crash_cost) = values
+        row = len(self.names)
+        self.ids.append(aid)
+        self.names.append(name)
+        self.duration.append(duration)
+        self.start.append(u)
+        self.end.append(v)
+        self.optimistic.append(_NAN if optimistic is None else optimistic)
+        self.pessimistic.append(_NAN if pessimistic is None else pessimistic)
+        self.crash_duration.append(_NAN if crash_duration is None else crash_duration)
+        self.crash_cost.append(crash_cost)
+        if resources is not _NO_RESOURCES:
+            self.resources[row] = resources
+        for column in (self.out_next, self.out_prev, self.in_next, self.in_prev):
+            column.append(-1)
+        self.results.append()
+        self._link(row)
+        self.index.insert(aid, row)
+        return row
+
+    def kill(self, row: int):
+        """Usuwa czynność z list zdarzeń (wiersz zostaje dziurą)."""
+        self._unlink(row)
+        self.resources.pop(row, None)
+        self._kill(row)
+
+    def input_values(self, row: int) -> Tuple:
+        """Dane wejściowe wiersza w kolejności argumentów konstruktora Activity."""
+        ids = self.events.ids
+        optimistic, pessimistic = self.optimistic[row], self.pessimistic[row]
+        crash_duration = self.crash_duration[row]
+        return (self.ids[row], self.names[row], self.duration[row],
+                ids[self.start[row]], ids[self.end[row]],
+                None if optimistic != optimistic else optimistic,
+                None if pessimistic != pessimistic else pessimistic,
+                self.resources.get(row, _NO_RESOURCES),
+                None if crash_duration != crash_duration else crash_duration,
+                self.crash_cost[row])
+
+    # -- listy zdarzeń --
+    def _link(self, row: int):
+        """Dopisuje wiersz na koniec list jego zdarzeń."""
+        events = self.events
+        u = self.start[row]
+        tail = events.out_tail[u]
+        self.out_prev[row] = tail
+        if tail < 0:
+            events.out_head[u] = row
+        else:
+            self.out_next[tail] = row
+        events.out_tail[u] = row
+        v = self.end[row]
+        tail = events.in_tail[v]
+        self.in_prev[row] = tail
+        if tail < 0:
+            events.in_head[v] = row
+        else:
+            self.in_next[tail] = row
+        events.in_tail[v] = row
+
+    def _unlink(self, row: int):
+        events = self.events
+        prev, nxt = self.out_prev[row], self.out_next[row]
+        if prev < 0:
+            events.out_head[self.start[row]] = nxt
+        else:
+            self.out_next[prev] = nxt
+        if nxt < 0:
+            events.out_tail[self.start[row]] = prev
+        else:
+            self.out_prev[nxt] = prev
+        prev, nxt = self.in_prev[row], self.in_next[row]
+        if prev < 0:
+            events.in_head[self.end[row]] = nxt
+        else:
+            self.in_next[prev] = nxt
+        if nxt < 0:
+            events.in_tail[self.end[row]] = prev
+        else:
+            self.in_prev[nxt] = prev
+
+    def compact(self):
+        """Usuwa dziury: kolumny i wyniki przesuwa compress(), a wskaźniki list
+        (także początki i końce w EventTable) przechodzą przez mapę wierszy."""
+        alive, new_of = self._compact()
+        self.results.compact(alive)
+        remap = new_of.__getitem__
+        events = self.events
+        for column in (self.out_next, self.out_prev, self.in_next, self.in_prev,
+                       events.out_head, events.out_tail, events.in_head, events.in_tail):
+            column[:] = array("i", map(remap, column))
+        self.resources = {new_of[row]: demand for row, demand in self.resources.items()}
+
+    def load(self, ids: Iterable[int], names: Iterable[str], duration: Iterable[float],
+             start_events: Iterable[int], end_events: Iterable[int],
+             optimistic: Iterable[float], pessimistic: Iterable[float],
+             crash_duration: Iterable[float], crash_cost: Iterable[float],
+             resources: Mapping[int, Mapping[str, float]]):
+        """Wczytuje kolumny do pustej tabeli (zdarzenia już wczytane, bez dziur):
+        zdarzenia jako ID, brak wartości jako NaN, resources: pozycja ->
+        zapotrzebowanie. Listy zdarzeń w kolejności wierszy."""
+        event_row = dict(zip(self.events.ids, range(len(self.events.ids)))).__getitem__
+        self.ids.extend(ids)
+        self.names.extend(names)
+        self.duration.extend(duration)
+        self.start.extend(map(event_row, start_events))
+        self.end.extend(map(event_row, end_events))
+        self.optimistic.extend(optimistic)
+        self.pessimistic.extend(pessimistic)
+        self.crash_duration.extend(crash_duration)
+        self.crash_cost.extend(crash_cost)
+        self.resources = dict(resources)
+        n = len(self.names)
+        for column in (self.out_next, self.out_prev, self.in_next, self.in_prev):
+            column.extend(array("i", [-1]) * n)
+        self.results.extend(n)
+        self.index = _IdIndex(self.ids, n)
+        for row in range(n):
+            self._link(row)
+
+    def input_columns(self) -> Tuple:
+        """Kolumny danych wejściowych żywych wierszy – argumenty dla load()."""
+        live = self.live
+        event_id = self.events.ids.__getitem__
+        if self.holes and self.resources:
+            position = {row: i for i, row in enumerate(self.live_rows())}
+        else:
+            position = None
+        resources = {row if position is None else position[row]: dict(demand)
+                     for row, demand in self.resources.items()}
+        return (array("q", live(self.ids)), list(live(self.names)),
+                array("d", live(self.duration)),
+                array("q", map(event_id, live(self.start))),
+                array("q", map(event_id, live(self.end))),
+                array("d", live(self.optimistic)), array("d", live(self.pessimistic)),
+                array("d", live(self.crash_duration)), array("d", live(self.crash_cost)),
+                resources)
+
+    def copy(self, events: EventTable) -> "ActivityTable":
+        dup = ActivityTable.__new__(ActivityTable)
+        self._copy_into(dup)
+        dup.events = events
+        dup.resources = {row: dict(demand) for row, demand in self.resources.items()}
+        dup.results = self.results.copy()
+        return dup
+
+
+EventTable._view = Event
+ActivityTable._view = Activity
+
+
+def _chain(head: int, nxt: array) -> Iterator[int]:
+    """Wiersze listy wiązanej od head (−1 = koniec)."""
+    while head >= 0:
+        yield head
+        head = nxt[head]
+
+
+class AdjacencyView(collections.abc.Mapping):
+    """outgoing/incoming sieci: ID zdarzenia -> lista ID czynności (w kolejności
+    dodania), budowana przy odczycie z list wiązanych w kolumnach tabel. Jak
+    dawny dict – zdarzenia bez czynności nie mają wpisu (odczyt przez .get())."""
+
+    def __init__(self, events: EventTable, activities: ActivityTable, outgoing: bool):
+        self._events = events
+        self._activities = activities
+        self._head = events.out_head if outgoing else events.in_head
+        self._next = activities.out_next if outgoing else activities.in_next
+
+    def _head_of(self, event_id) -> int:
+        row = self._events.find(event_id)
+        return -1 if row < 0 else self._head[row]
+
+    def __getitem__(self, event_id) -> List[int]:
+        head = self._head_of(event_id)
+        if head < 0:
+            raise KeyError(event_id)
+        return list(map(self._activities.ids.__getitem__, _chain(head, self._next)))
+
+    def __contains__(self, event_id) -> bool:
+        return self._head_of(event_id) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        head, ids = self._head, self._events.ids
+        return (ids[row] for row in self._events.live_rows() if head[row] >= 0)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+# migawka CPMNetwork.payload(): kolumny zdarzeń (ids, names), kolumny czynności
+# (jak w ActivityTable.load()), dostępności zasobów, kalendarz
+NetworkPayload = Tuple[Tuple, Tuple, Tuple[Tuple[str, float], ...], object]
+
+
+def _copy_summary(summary: Dict) -> Dict:
+    """Kopia podsumowania z pamięci podręcznej: nowe listy i wiersze (wartości
+    w wierszach są niezmienne)."""
+    out = dict(summary)
+    out["critical_path"] = list(summary["critical_path"])
+    out["events"] = [dict(row) for row in summary["events"]]
+    out["activities"] = [dict(row) for row in summary["activities"]]
+    return out
 
 
 # -------------------------
@@ -79,17 +972,191 @@ class Activity:
 class CPMNetwork:
     """Sieć CPM oparta o zdarzenia (AOA – Activity On Arrow).
 
-    - events: dict[event_id] = Event
-    - activities: dict[activity_id] = Activity
+    - events: EventTable – mapowanie event_id -> Event
+    - activities: ActivityTable – mapowanie activity_id -> Activity
     - outgoing[event_id] = list[activity_id] - czynności wychodzące ze zdarzenia
     - incoming[event_id] = list[activity_id] - czynności wchodzące do zdarzenia
+      (AdjacencyView – zdarzenia bez czynności nie mają wpisu, odczyt przez .get())
+    - resource_capacities[nazwa] = dostępna ilość zasobu (harmonogram zasobowy)
+    - calendar: opcjonalny cpm_calendar.ProjectCalendar – project_summary()
+      dopisuje wtedy daty (start_date/finish_date, *_date zdarzeń i czynności)
+
+    Reprezentacja kolumnowa: dane i wyniki zdarzeń i czynności leżą
+    w tablicach tabel (kilkadziesiąt bajtów na czynność zamiast obiektu
+    z polami), a obiekty Event/Activity zwracane przez events/activities są
+    lekkimi widokami wierszy. Listy czynności zdarzeń są dwukierunkowymi
+    listami wiązanymi w kolumnach, więc usuwanie czynności jest O(1) i nie
+    zmienia kolejności pozostałych. Usunięte wiersze są dziurami do
+    kompaktowania, wykonywanego, gdy zajmą ponad połowę tabeli.
+
+    Tryb przyrostowy (set_incremental(True)): po pełnym compute() kolejne
+    wywołania przeliczają tylko zdarzenia oznaczone jako "brudne" przez
+    add_/remove_*/set_duration i propagują zmiany ES w przód, a LF w tył,
+    dopóki wartości się zmieniają.
+
+    Pamięć podręczna wyników: każda zmiana sieci przez metody add_/remove_*/
+    set_duration zwiększa licznik wersji. Kolejność topologiczna, wyniki
+    compute(), ścieżka krytyczna i podsumowanie są pamiętane dla wersji,
+    w której powstały, więc ponowne odczyty niezmienionej sieci są O(1).
+    Kolejność topologiczna zależy tylko od struktury, więc set_duration()
+    jej nie unieważnia. Po ręcznej zmianie pól obiektów należy wywołać
+    invalidate().
+
+    compute() i project_summary() przyjmują opcjonalną funkcję
+    progress(etap, ułamek) wywoływaną co _PROGRESS_EVERY elementów każdego
+    etapu (PHASES). Wyjątek zgłoszony w progress przerywa obliczenia –
+    używa tego anulowanie w cpm_worker.
+
+    metrics: opcjonalny cpm_metrics.ComputeMetrics – rekord czasu i liczby
+    odwiedzonych zdarzeń/czynności dla każdego etapu oraz liczniki pamięci
+    podręcznej (None = bez pomiarów).
     """
 
     def __init__(self):
-        self.events: Dict[int, Event] = {}
-        self.activities: Dict[int, Activity] = {}
-        self.outgoing: Dict[int, List[int]] = collections.defaultdict(list)
-        self.incoming: Dict[int, List[int]] = collections.defaultdict(list)
+        self._set_tables(EventTable(), None)
+        self.resource_capacities: Dict[str, float] = {}
+        self.calendar = None             # cpm_calendar.ProjectCalendar albo None
+        self.metrics = None              # cpm_metrics.ComputeMetrics albo None
+
+        # stan trybu przyrostowego (zdarzenia i czynności jako numery wierszy)
+        self.incremental = False
+        self._inc_valid = False          # czy wyniki w tabelach są aktualną bazą
+        self._topo_pos = array("i")      # wiersz zdarzenia -> pozycja topologiczna
+        self._next_pos = 0
+        self._dirty_es: set = set()      # zdarzenia do przeliczenia ES
+        self._dirty_lf: set = set()      # zdarzenia do przeliczenia LF
+        self._dirty_acts: set = set()    # czynności do przeliczenia zapasów
+        self._pd_stale = False           # czas projektu wymaga pełnego max()
+
+        # pamięć podręczna: nazwa -> (wersja sieci, wartość)
+        self._version = 0
+        self._structure_version = 0      # zmiany zdarzeń/łuków (bez czasów trwania)
+        self._cache: Dict[str, Tuple[int, object, object]] = {}
+        self.cache_hits: Dict[str, int] = collections.Counter()
+        self.cache_misses: Dict[str, int] = collections.Counter()
+
+    def _set_tables(self, events: EventTable, activities: Optional[ActivityTable]):
+        self.events = events
+        self.activities = ActivityTable(events) if activities is None else activities
+        self.outgoing = AdjacencyView(events, self.activities, outgoing=True)
+        self.incoming = AdjacencyView(events, self.activities, outgoing=False)
+
+    def copy(self) -> "CPMNetwork":
+        """Niezależna kopia sieci (zdarzenia, czynności z wynikami, zasoby), np. do
+        obliczeń w wątku w tle – późniejsze zmiany oryginału jej nie dotyczą.
+        Kopiowane są całe kolumny, więc kolejność list sąsiedztwa (a z nią
+        kolejność topologiczna) jest taka jak w oryginale."""
+        net = CPMNetwork()
+        events = self.events.copy()
+        net._set_tables(events, self.activities.copy(events))
+        net.resource_capacities = dict(self.resource_capacities)
+        net.calendar = self.calendar     # niezmienny – wspólny dla kopii
+        return net
+
+    def payload(self) -> NetworkPayload:
+        """Zwarta migawka danych wejściowych: kopie kolumn tabel bez dziur
+        i wyników – tania do zrobienia w wątku GUI i do przesłania do procesu
+        roboczego."""
+        return (self.events.input_columns(), self.activities.input_columns(),
+                tuple(self.resource_capacities.items()), self.calendar)
+
+    @classmethod
+    def from_payload(cls, payload: NetworkPayload) -> "CPMNetwork":
+        """Sieć z payload(): zdarzenia, czynności z zasobami i danymi skracania,
+        dostępności zasobów i kalendarz. Kolejność czynności (a więc list
+        outgoing/incoming, od której zależą kolejność topologiczna i ścieżka
+        krytyczna) jest taka jak w oryginale."""
+        events, activities, capacities, calendar = payload
+        net = cls._from_columns(events, activities)
+        net.resource_capacities = dict(capacities)
+        net.calendar = calendar
+        return net
+
+    @classmethod
+    def _from_columns(cls, events: Tuple, activities: Tuple) -> "CPMNetwork":
+        """Sieć wprost z kolumn danych wejściowych (argumenty EventTable.load()
+        i ActivityTable.load()) – bez obiektów pośrednich i bez walidacji, dla
+        danych z zaufanego źródła (payload(), cpm_snapshot)."""
+        net = cls()
+        net.events.load(*events)
+        net.activities.load(*activities)
+        net.invalidate()
+        return net
+
+    def set_incremental(self, enabled: bool = True):
+        """Włącza/wyłącza tryb przyrostowy. Pierwsze compute() jest zawsze pełne."""
+        self.incremental = enabled
+        self._inc_valid = False
+
+    # -------------------------
+    # Pamięć podręczna wyników
+    # -------------------------
+    def invalidate(self):
+        """Unieważnia zapamiętane wyniki (np. po ręcznej zmianie act.duration)."""
+        self._version += 1
+        self._structure_version += 1
+        self._inc_valid = False
+
+    def cache_info(self) -> Dict:
+        """Liczniki trafień/chybień pamięci podręcznej oraz bieżąca wersja sieci."""
+        return {
+            "version": self._version,
+            "hits": dict(self.cache_hits),
+            "misses": dict(self.cache_misses),
+        }
+
+    def _cache_get(self, name: str, structural: bool = False, key: object = None):
+        """Wartość z pamięci podręcznej albo None; key to dodatkowy warunek
+        ważności wpisu (porównywany przez is, np. kalendarz projektu)."""
+        version = self._structure_version if structural else self._version
+        entry = self._cache.get(name)
+        hit = entry is not None and entry[0] == version and entry[2] is key
+        if self.metrics is not None:
+            self.metrics.cache_event(name, hit)
+        if hit:
+            self.cache_hits[name] += 1
+            return entry[1]
+        self.cache_misses[name] += 1
+        return None
+
+    def _cache_put(self, name: str, value, structural: bool = False, key: object = None):
+        version = self._structure_version if structural else self._version
+        self._cache[name] = (version, value, key)
+
+    def _mark_dirty(self, es_event: Optional[int] = None, lf_event: Optional[int] = None,
+                    act_row: Optional[int] = None):
+        if not self._inc_valid:
+            return
+        if es_event is not None:
+            self._dirty_es.add(es_event)
+        if lf_event is not None:
+            self._dirty_lf.add(lf_event)
+        if act_row is not None:
+            self._dirty_acts.add(act_row)
+
+    def _compact(self):
+        """Kompaktuje tabele, w których dziury zajmują ponad połowę wierszy
+        (koszt liniowy rozłożony na usunięcia). Numery wierszy się zmieniają,
+        więc stan trybu przyrostowego jest odrzucany."""
+        events, acts = self.events, self.activities
+        if acts.needs_compaction():
+            acts.compact()
+            self._inc_valid = False
+        if events.needs_compaction():
+            _, new_of = events._compact()
+            remap = new_of.__getitem__
+            acts.start[:] = array("i", map(remap, acts.start))
+            acts.end[:] = array("i", map(remap, acts.end))
+            self._inc_valid = False
+
+    # -------------------------
+    # ZASOBY
+    # -------------------------
+    def set_capacity(self, resource: str, capacity: float):
+        """Ustala dostępną ilość zasobu (nie wpływa na wyniki compute())."""
+        if capacity < 0:
+            raise ValueError("Dostępność zasobu nie może być ujemna.")
+        self.resource_capacities[resource] = capacity
 
     # -------------------------
     # ZDARZENIA
@@ -98,191 +1165,571 @@ class CPMNetwork:
         """Dodaje zdarzenie o numerycznym ID i nazwie tekstowej."""
         if event_id in self.events:
             raise KeyError(f"Zdarzenie o ID {event_id} już istnieje.")
-        self.events[event_id] = Event(id=event_id, name=name)
+        row = self.events.append(event_id, name)
+        self._version += 1
+        self._structure_version += 1
+        if self._inc_valid:
+            self._topo_pos.append(self._next_pos)
+            self._next_pos += 1
+            self._mark_dirty(es_event=row, lf_event=row)
 
     def remove_event(self, event_id: int):
-        if event_id not in self.events:
+        events = self.events
+        row = events.find(event_id)
+        if row < 0:
             raise KeyError("Brak zdarzenia o podanym ID.")
         # nie pozwalamy usunąć zdarzenia, jeśli są powiązane czynności
-        if self.outgoing.get(event_id) or self.incoming.get(event_id):
+        if events.out_head[row] >= 0 or events.in_head[row] >= 0:
             raise ValueError("Nie można usunąć zdarzenia powiązanego z czynnościami.")
-        del self.events[event_id]
+        events.kill(row)
+        self._version += 1
+        self._structure_version += 1
+        if self._inc_valid:
+            self._pd_stale = True
+        self._compact()
 
     # -------------------------
     # CZYNNOŚCI
     # -------------------------
     def add_activity(self, activity: Activity):
-        """Dodaje czynność między istniejącymi zdarzeniami."""
-        if activity.id in self.activities:
-            raise KeyError(f"Czynność o ID {activity.id} już istnieje.")
-
-        if activity.start_event not in self.events:
-            raise KeyError(f"Brak zdarzenia początkowego: {activity.start_event}")
-        if activity.end_event not in self.events:
-            raise KeyError(f"Brak zdarzenia końcowego: {activity.end_event}")
-        if activity.start_event == activity.end_event:
+        """Dodaje czynność między istniejącymi zdarzeniami; obiekt activity
+        staje się widokiem jej wiersza w sieci."""
+        values = activity._input()
+        aid, start_event, end_event = values[0], values[3], values[4]
+        acts, events = self.activities, self.events
+        if acts.find(aid) >= 0:
+            raise KeyError(f"Czynność o ID {aid} już istnieje.")
+
+        u = events.find(start_event)
+        if u < 0:
+            raise KeyError(f"Brak zdarzenia początkowego: {start_event}")
+        v = events.find(end_event)
+        if v < 0:
+            raise KeyError(f"Brak zdarzenia końcowego: {end_event}")
+        if u == v:
             raise ValueError("Zdarzenie początkowe i końcowe czynności nie mogą być takie same.")
 
-        self.activities[activity.id] = activity
-        self.outgoing[activity.start_event].append(activity.id)
-        self.incoming[activity.end_event].append(activity.id)
+        row = acts.append(values, u, v)
+        _bind(activity, acts, row)
+        self._version += 1
+        self._structure_version += 1
+
+        if self._inc_valid:
+            # łuk wbrew zapamiętanej kolejności – potrzebne pełne sortowanie
+            if self._topo_pos[u] >= self._topo_pos[v]:
+                self._inc_valid = False
+            else:
+                self._mark_dirty(v, u, row)
 
     def remove_activity(self, activity_id: int):
-        if activity_id not in self.activities:
+        acts = self.activities
+        row = acts.find(activity_id)
+        if row < 0:
+            raise KeyError("Brak czynności o podanym ID.")
+        u, v = acts.start[row], acts.end[row]
+        acts.kill(row)
+        self._version += 1
+        self._structure_version += 1
+        self._dirty_acts.discard(row)
+        self._mark_dirty(v, u)
+        self._compact()
+
+    def set_duration(self, activity_id: int, duration: float):
+        """Zmienia czas trwania czynności w miejscu (bez usuwania i dodawania);
+        nowy czas musi spełniać te same warunki co w konstruktorze Activity."""
+        acts = self.activities
+        row = acts.find(activity_id)
+        if row < 0:
             raise KeyError("Brak czynności o podanym ID.")
-        act = self.activities[activity_id]
-        if activity_id in self.outgoing.get(act.start_event, []):
-            self.outgoing[act.start_event].remove(activity_id)
-        if activity_id in self.incoming.get(act.end_event, []):
-            self.incoming[act.end_event].remove(activity_id)
-        del self.activities[activity_id]
+        acts._object(row).check(duration)
+        acts.duration[row] = duration
+        self._version += 1
+        self._mark_dirty(acts.end[row], acts.start[row], row)
+
+    # -------------------------
+    # WSTAWIANIE MASOWE I WALIDACJA
+    # -------------------------
+    def _arcs(self) -> Iterator[Tuple[int, int, int]]:
+        """(ID czynności, ID zdarzenia początkowego, ID zdarzenia końcowego)."""
+        acts = self.activities
+        event_id = self.events.ids.__getitem__
+        return zip(acts.live(acts.ids), map(event_id, acts.live(acts.start)),
+                   map(event_id, acts.live(acts.end)))
+
+    def validate(self) -> ValidationReport:
+        """Pełny raport o strukturze sieci (cykle, brakujące, wiszące
+        i nieosiągalne zdarzenia) – zob. cpm_validate."""
+        return validate_graph(self.events, self._arcs())
+
+    def add_batch(self, events: Iterable[Event] = (),
+                  activities: Iterable[Activity] = ()) -> ValidationReport:
+        """Dodaje wiele zdarzeń i czynności naraz.
+
+        Poprawność sprawdzana jest raz, dla całej sieci po wstawieniu (także
+        cykle). Przy błędach zgłaszany jest NetworkValidationError ze wszystkimi
+        problemami, a sieć pozostaje bez zmian. Zwraca raport (z ostrzeżeniami).
+        Przekazane obiekty stają się widokami wierszy sieci.
+        """
+        events = list(events)
+        activities = list(activities)
+        event_ids = itertools.chain(self.events, (ev.id for ev in events))
+        arcs = itertools.chain(self._arcs(),
+                               ((a.id, a.start_event, a.end_event) for a in activities))
+        report = validate_graph(event_ids, arcs)
+        if report.has_errors:
+            raise NetworkValidationError(report)
+
+        table = self.events
+        for ev in events:
+            _bind(ev, table, table.append(ev.id, ev.name, ev.ES, ev.LF))
+        table, find = self.activities, self.events.find
+        for act in activities:
+            values = act._input()
+            _bind(act, table, table.append(values, find(values[3]), find(values[4])))
+        self.invalidate()
+        return report
+
+    def remove_batch(self, activity_ids: Iterable[int] = (), event_ids: Iterable[int] = ()):
+        """Usuwa wiele czynności, a potem zdarzeń – w czasie liniowym względem
+        liczby usuwanych elementów. Przy błędzie (brak ID, zdarzenie z pozostałymi
+        czynnościami) sieć pozostaje bez zmian."""
+        events, acts = self.events, self.activities
+        act_rows = []
+        for aid in dict.fromkeys(activity_ids):
+            row = acts.find(aid)
+            if row < 0:
+                raise KeyError(f"Brak czynności o ID {aid}.")
+            act_rows.append(row)
+        removed = set(act_rows)
+        event_rows = []
+        for eid in dict.fromkeys(event_ids):
+            row = events.find(eid)
+            if row < 0:
+                raise KeyError(f"Brak zdarzenia o ID {eid}.")
+            linked = itertools.chain(_chain(events.out_head[row], acts.out_next),
+                                     _chain(events.in_head[row], acts.in_next))
+            if any(r not in removed for r in linked):
+                raise ValueError(f"Nie można usunąć zdarzenia {eid} powiązanego z czynnościami.")
+            event_rows.append(row)
+
+        for row in act_rows:
+            acts.kill(row)
+        for row in event_rows:
+            events.kill(row)
+        self.invalidate()
+        self._compact()
 
     # -------------------------
     # Sortowanie topologiczne po ZDARZENIACH
     # -------------------------
-    def _topological_order_events(self) -> List[int]:
-        """Zwraca listę ID zdarzeń w porządku topologicznym."""
+    def _topological_order(self, progress: Optional[Progress] = None) -> List[int]:
+        """Zwraca listę wierszy zdarzeń w porządku topologicznym (nie modyfikować)."""
+        cached = self._cache_get("topological_order", structural=True)
+        if cached is not None:
+            return cached
+        events, acts = self.events, self.activities
+        total = len(events)
+        metrics = self.metrics
+        if metrics is not None:
+            mark = metrics.start()
+
         # stopnie wejściowe zdarzeń
-        in_deg = {eid: 0 for eid in self.events}
-        for act in self.activities.values():
-            in_deg[act.end_event] += 1
+        in_deg = array("i", [0]) * len(events.names)
+        for v in acts.live(acts.end):
+            in_deg[v] += 1
 
-        queue = collections.deque([eid for eid, d in in_deg.items() if d == 0])
+        queue = collections.deque([u for u in events.live_rows() if not in_deg[u]])
         order = []
+        head, nxt, end = events.out_head, acts.out_next, acts.end
 
         while queue:
             u = queue.popleft()
             order.append(u)
-            for act_id in self.outgoing.get(u, []):
-                v = self.activities[act_id].end_event
+            if progress is not None and not len(order) % _PROGRESS_EVERY:
+                progress("topological_order", len(order) / total)
+            row = head[u]
+            while row >= 0:
+                v = end[row]
                 in_deg[v] -= 1
-                if in_deg[v] == 0:
+                if not in_deg[v]:
                     queue.append(v)
+                row = nxt[row]
 
-        if len(order) != len(self.events):
-            raise ValueError("Graf zdarzeń zawiera cykle lub jest niespójny.")
+        if len(order) != total:
+            raise NetworkValidationError(self.validate(), "Graf zdarzeń zawiera cykle lub jest niespójny.")
+        if metrics is not None:
+            metrics.stop(mark, "topological_order", len(order), len(acts))
+        self._cache_put("topological_order", order, structural=True)
         return order
 
+    def _topological_order_events(self, progress: Optional[Progress] = None) -> List[int]:
+        """Zwraca listę ID zdarzeń w porządku topologicznym."""
+        return list(map(self.events.ids.__getitem__, self._topological_order(progress)))
+
     # -------------------------
     # Obliczenia CPM
     # -------------------------
-    def compute(self):
+    def compute(self, progress: Optional[Progress] = None):
+        """Liczy terminy, zapasy i czynności krytyczne (o ile sieć się zmieniła).
+        progress – zob. opis klasy."""
+        if self._cache_get("compute") is not None:
+            return
+        try:
+            self._compute(progress)
+        except BaseException:
+            # przerwane obliczenia – następne compute() liczy całość od nowa
+            self._inc_valid = False
+            raise
+        self._cache_put("compute", True)
+
+    def _compute(self, progress: Optional[Progress] = None):
         if not self.events or not self.activities:
+            self._inc_valid = False
             return
 
-        topo_events = self._topological_order_events()
+        if self.incremental and self._inc_valid:
+            if progress is not None:
+                progress("forward", 0.0)
+            self._compute_incremental()
+            if progress is not None:
+                progress("floats", 1.0)
+            return
+
+        order = self._topological_order(progress)
+        events, acts = self.events, self.activities
+        total = len(order)
+        n_acts = len(acts)
+        metrics = self.metrics
+        if metrics is not None:
+            mark = metrics.start()
+
+        # kolumny zdarzeń, czynności i wyników, adresowane numerami wierszy
+        ev_es, ev_lf = events.ES, events.LF
+        head, nxt, end, dur = events.out_head, acts.out_next, acts.end, acts.duration
+        store = acts.results
+        ES, EF, LS, LF = store.ES, store.EF, store.LS, store.LF
 
         # Inicjalizacja ES zdarzeń
-        for ev in self.events.values():
-            ev.ES = 0.0
+        ev_es[:] = array("d", [0.0]) * len(ev_es)
 
         # FORWARD PASS – wg zdarzeń
-        for eid in topo_events:
-            ev = self.events[eid]
-            for act_id in self.outgoing.get(eid, []):
-                act = self.activities[act_id]
+        for i, u in enumerate(order):
+            if progress is not None and not i % _PROGRESS_EVERY:
+                progress("forward", i / total)
+            es = ev_es[u]
+            row = head[u]
+            while row >= 0:
                 # ES czynności = ES zdarzenia początkowego
-                act.ES = ev.ES
-                act.EF = act.ES + act.duration
+                ES[row] = es
+                ef = es + dur[row]
+                EF[row] = ef
                 # aktualizujemy ES zdarzenia końcowego
-                end_ev = self.events[act.end_event]
-                end_ev.ES = max(end_ev.ES, act.EF)
+                v = end[row]
+                if ef > ev_es[v]:
+                    ev_es[v] = ef
+                row = nxt[row]
 
         # czas projektu = max ES zdarzeń końcowych
-        project_duration = max(ev.ES for ev in self.events.values())
+        project_duration = max(events.live(ev_es))
+        if metrics is not None:
+            metrics.stop(mark, "forward", total, n_acts)
+            mark = metrics.start()
 
         # BACKWARD PASS
         # Inicjalizacja LF zdarzeń na czas projektu
-        for ev in self.events.values():
-            ev.LF = project_duration
+        ev_lf[:] = array("d", [project_duration]) * len(ev_lf)
 
         # Przechodzimy zdarzenia w odwrotnej kolejności topologicznej
-        for eid in reversed(topo_events):
-            ev = self.events[eid]
+        for i, u in enumerate(reversed(order)):
+            if progress is not None and not i % _PROGRESS_EVERY:
+                progress("backward", i / total)
 
             # dla każdej czynności wychodzącej ze zdarzenia
-            for act_id in self.outgoing.get(eid, []):
-                act = self.activities[act_id]
-                end_ev = self.events[act.end_event]
-
+            row = head[u]
+            if row < 0:
+                continue
+            best = None
+            while row >= 0:
                 # LF czynności = LF zdarzenia końcowego
-                act.LF = end_ev.LF
-                act.LS = act.LF - act.duration
+                lf = ev_lf[end[row]]
+                LF[row] = lf
+                ls = lf - dur[row]
+                LS[row] = ls
+                if best is None or ls < best:
+                    best = ls
+                row = nxt[row]
 
             # teraz aktualizujemy LF zdarzenia na podstawie czynności wychodzących
-            if self.outgoing.get(eid):
-                ev.LF = min(self.activities[a].LS for a in self.outgoing[eid])
+            ev_lf[u] = best
+        if metrics is not None:
+            metrics.stop(mark, "backward", total, n_acts)
+            mark = metrics.start()
 
         # ZAPASY I ŚCIEŻKA KRYTYCZNA
-        for act in self.activities.values():
-            if act.LS is None or act.ES is None:
-                act.total_float = None
-                act.free_float = None
-                act.is_critical = False
-                continue
-
-            act.total_float = round(act.LS - act.ES, 6)
+        total = n_acts
+        TF, FF, critical = store.total_float, store.free_float, store.is_critical
+        for i, row in enumerate(acts.live_rows()):
+            if progress is not None and not i % _PROGRESS_EVERY:
+                progress("floats", i / total)
+            total_float = round(LS[row] - ES[row], 6)
+            TF[row] = total_float
             # free float = ES zdarzenia końcowego - EF czynności
-            end_ev = self.events[act.end_event]
-            act.free_float = round(end_ev.ES - act.EF, 6)
-            act.is_critical = abs(act.total_float) < 1e-9
+            FF[row] = round(ev_es[end[row]] - EF[row], 6)
+            critical[row] = abs(total_float) < 1e-9
+        if metrics is not None:
+            metrics.stop(mark, "floats", 0, n_acts)
+
+        self._last_project_duration = project_duration
+
+        if self.incremental:
+            pos = self._topo_pos = array("i", [0]) * len(events.names)
+            for i, u in enumerate(order):
+                pos[u] = i
+            self._next_pos = len(order)
+            self._dirty_es.clear()
+            self._dirty_lf.clear()
+            self._dirty_acts.clear()
+            self._pd_stale = False
+            self._inc_valid = True
+
+    def _set_floats(self, row: int):
+        acts = self.activities
+        store = acts.results
+        es, ls = store.ES[row], store.LS[row]
+        if es != es or ls != ls:        # NaN – brak terminów
+            store.total_float[row] = _NAN
+            store.free_float[row] = _NAN
+            store.is_critical[row] = 0
+            return
+
+        total_float = round(ls - es, 6)
+        store.total_float[row] = total_float
+        # free float = ES zdarzenia końcowego - EF czynności
+        store.free_float[row] = round(self.events.ES[acts.end[row]] - store.EF[row], 6)
+        store.is_critical[row] = abs(total_float) < 1e-9
+
+    # -------------------------
+    # Obliczenia przyrostowe
+    # -------------------------
+    def _compute_incremental(self):
+        """Przelicza tylko część sieci dotkniętą zmianami od ostatniego compute().
+
+        Zdarzenia przetwarzane są kopcem wg zapamiętanej pozycji topologicznej:
+        w przód dla ES, w tył dla LF. Propagacja zatrzymuje się na zdarzeniach,
+        których wartość się nie zmieniła.
+        """
+        pos = self._topo_pos
+        old_duration = self._last_project_duration
+        metrics = self.metrics
+        if metrics is not None:
+            mark = metrics.start()
+        visited = 0
+        events, acts = self.events, self.activities
+        names, ev_es, ev_lf = events.names, events.ES, events.LF
+        out_head, in_head = events.out_head, events.in_head
+        out_next, in_next = acts.out_next, acts.in_next
+        start, end, dur = acts.start, acts.end, acts.duration
+        store = acts.results
+        ES, EF, LS, LF = store.ES, store.EF, store.LS, store.LF
+
+        # FORWARD PASS – tylko brudne zdarzenia i ich następniki
+        changed_es = set()
+        old_es = {}
+        heap = [(pos[u], u) for u in self._dirty_es if names[u] is not _HOLE]
+        heapq.heapify(heap)
+        queued = {u for _, u in heap}
+        while heap:
+            _, u = heapq.heappop(heap)
+            queued.discard(u)
+            visited += 1
+            new_es = 0.0
+            row = in_head[u]
+            while row >= 0:
+                es = ev_es[start[row]]
+                ES[row] = es
+                ef = es + dur[row]
+                EF[row] = ef
+                if ef > new_es:
+                    new_es = ef
+                row = in_next[row]
+            if new_es != ev_es[u]:
+                old_es[u] = ev_es[u]
+                ev_es[u] = new_es
+                changed_es.add(u)
+                row = out_head[u]
+                while row >= 0:
+                    v = end[row]
+                    if v not in queued:
+                        queued.add(v)
+                        heapq.heappush(heap, (pos[v], v))
+                    row = out_next[row]
+
+        # czas projektu: pełne max() tylko gdy mogło zmaleć
+        if self._pd_stale or any(es == old_duration for es in old_es.values()):
+            project_duration = max(events.live(ev_es))
+        else:
+            project_duration = max([old_duration] + [ev_es[u] for u in changed_es])
+        if metrics is not None:
+            metrics.stop(mark, "incremental_forward", visited,
+                         sum(1 for u in changed_es for _ in _chain(in_head[u], in_next)))
+            mark = metrics.start()
+        visited = 0
+
+        # BACKWARD PASS – brudne zdarzenia i ich poprzedniki
+        dirty_lf = {u for u in self._dirty_lf if names[u] is not _HOLE}
+        if project_duration != old_duration:
+            dirty_lf.update(u for u in events.live_rows() if out_head[u] < 0)
+        changed_lf = set()
+        heap = [(-pos[u], u) for u in dirty_lf]
+        heapq.heapify(heap)
+        queued = set(dirty_lf)
+        while heap:
+            _, u = heapq.heappop(heap)
+            queued.discard(u)
+            visited += 1
+            row = out_head[u]
+            if row >= 0:
+                new_lf = None
+                while row >= 0:
+                    lf = ev_lf[end[row]]
+                    LF[row] = lf
+                    ls = lf - dur[row]
+                    LS[row] = ls
+                    if new_lf is None or ls < new_lf:
+                        new_lf = ls
+                    row = out_next[row]
+            else:
+                new_lf = project_duration
+            if new_lf != ev_lf[u]:
+                ev_lf[u] = new_lf
+                changed_lf.add(u)
+                row = in_head[u]
+                while row >= 0:
+                    prev = start[row]
+                    if prev not in queued:
+                        queued.add(prev)
+                        heapq.heappush(heap, (-pos[prev], prev))
+                    row = in_next[row]
+
+        if metrics is not None:
+            metrics.stop(mark, "incremental_backward", visited,
+                         sum(1 for u in changed_lf for _ in _chain(out_head[u], out_next)))
+            mark = metrics.start()
+
+        # ZAPASY – tylko czynności, których dane wejściowe się zmieniły
+        touched = set(self._dirty_acts)
+        for u in changed_es:
+            touched.update(_chain(out_head[u], out_next))
+            touched.update(_chain(in_head[u], in_next))
+        for u in changed_lf:
+            touched.update(_chain(in_head[u], in_next))
+        for row in touched:
+            self._set_floats(row)
+        if metrics is not None:
+            metrics.stop(mark, "incremental_floats", 0, len(touched))
 
         self._last_project_duration = project_duration
+        self._dirty_es.clear()
+        self._dirty_lf.clear()
+        self._dirty_acts.clear()
+        self._pd_stale = False
 
     # -------------------------
     # Ścieżka krytyczna
     # -------------------------
     def critical_path(self) -> Tuple[List[int], float]:
         """Zwraca listę ID czynności na ścieżce krytycznej oraz czas projektu."""
+        cached = self._cache_get("critical_path")
+        if cached is not None:
+            return list(cached[0]), cached[1]
+
         self.compute()
         # sortujemy czynności wg zdarzenia początkowego (dla czytelności)
-        topo_events = self._topological_order_events()
-        pos = {eid: i for i, eid in enumerate(topo_events)}
+        order = self._topological_order()
+        metrics = self.metrics
+        if metrics is not None:
+            mark = metrics.start()
+        acts = self.activities
+        pos = array("i", [0]) * len(self.events.names)
+        for i, u in enumerate(order):
+            pos[u] = i
 
-        critical_acts = [a for a in self.activities.values() if a.is_critical]
-        critical_acts_sorted = sorted(critical_acts, key=lambda ac: pos[ac.start_event])
+        critical, start = acts.results.is_critical, acts.start
+        rows = [row for row in acts.live_rows() if critical[row]]
+        rows.sort(key=lambda row: pos[start[row]])
 
-        cp_ids = [ac.id for ac in critical_acts_sorted]
+        cp_ids = list(map(acts.ids.__getitem__, rows))
         duration = getattr(self, "_last_project_duration", 0.0)
+        if metrics is not None:
+            metrics.stop(mark, "critical_path", len(order), len(acts))
+        self._cache_put("critical_path", (tuple(cp_ids), duration))
         return cp_ids, duration
 
     # -------------------------
     # Podsumowanie projektu
     # -------------------------
-    def project_summary(self) -> Dict:
-        self.compute()
+    def project_summary(self, progress: Optional[Progress] = None) -> Dict:
+        """Słownik z czasem projektu, ścieżką krytyczną oraz wynikami zdarzeń
+        i czynności, a przy ustawionym calendar także z datami. Dla
+        niezmienionej sieci (i tego samego kalendarza) wynik pochodzi z pamięci
+        podręcznej; każde wywołanie dostaje własną kopię słownika, list
+        i wierszy, więc zmiany u wywołującego nie psują kolejnych wyników."""
+        cached = self._cache_get("project_summary", key=self.calendar)
+        if cached is not None:
+            return _copy_summary(cached)
+
+        self.compute(progress)
+        metrics = self.metrics
+        if metrics is not None:
+            mark = metrics.start()
+        events, acts = self.events, self.activities
+        ev_ids, ev_names, ev_es, ev_lf = events.ids, events.names, events.ES, events.LF
         events_out = []
-        for eid in sorted(self.events):
-            ev = self.events[eid]
+        for row in sorted(events.live_rows(), key=ev_ids.__getitem__):
+            lf = ev_lf[row]
             events_out.append({
-                "id": ev.id,
-                "name": ev.name,
-                "ES": ev.ES,
-                "LF": ev.LF,
+                "id": ev_ids[row],
+                "name": ev_names[row],
+                "ES": ev_es[row],
+                "LF": None if lf != lf else lf,
             })
 
         activities_out = []
-        for aid in sorted(self.activities):
-            a = self.activities[aid]
+        total = len(acts)
+        ids, names, durations, start, end = acts.ids, acts.names, acts.duration, acts.start, acts.end
+        store = acts.results
+        columns = (store.ES, store.EF, store.LS, store.LF, store.total_float, store.free_float)
+        critical = store.is_critical
+        for i, row in enumerate(sorted(acts.live_rows(), key=ids.__getitem__)):
+            if progress is not None and not i % _PROGRESS_EVERY:
+                progress("summary", i / total)
+            # NaN (x != x) -> None
+            es, ef, ls, lf, tf, ff = [c[row] if c[row] == c[row] else None for c in columns]
             activities_out.append({
-                "id": a.id,
-                "name": a.name,
-                "duration": a.duration,
-                "start_event": a.start_event,
-                "end_event": a.end_event,
-                "ES": a.ES,
-                "EF": a.EF,
-                "LS": a.LS,
-                "LF": a.LF,
-                "total_float": a.total_float,
-                "free_float": a.free_float,
-                "is_critical": a.is_critical,
+                "id": ids[row],
+                "name": names[row],
+                "duration": durations[row],
+                "start_event": ev_ids[start[row]],
+                "end_event": ev_ids[end[row]],
+                "ES": es,
+                "EF": ef,
+                "LS": ls,
+                "LF": lf,
+                "total_float": tf,
+                "free_float": ff,
+                "is_critical": bool(critical[row]),
             })
+        if metrics is not None:
+            metrics.stop(mark, "summary", len(events_out), len(activities_out))
 
         cp, duration = self.critical_path()
-        return {
+        summary = {
             "duration": duration,
             "critical_path": cp,
             "events": events_out,
             "activities": activities_out,
         }
+        if self.calendar is not None:
+            self.calendar.add_dates(summary, self.activities)
+        self._cache_put("project_summary", summary, key=self.calendar)
+        return _copy_summary(summary)
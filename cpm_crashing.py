@@ -0,0 +1,384 @@
+"""
+Skracanie projektu kosztem (time–cost trade-off, "crashing").
+
+Czynność z crash_duration można skrócić od duration do crash_duration,
+płacąc crash_cost za każdą jednostkę czasu. Optymalizator skraca projekt
+krokami (metoda Phillipsa–Dessouky'ego): w każdym kroku wybiera najtańsze
+cięcie podsieci czynności krytycznych – czynności cięcia w przód są skracane,
+a skrócone wcześniej czynności cięcia wstecz wydłużane z powrotem (zwracając
+ich koszt). Cięcie to minimalne cięcie (max-flow z dolnymi granicami, Dinic),
+gdzie łuk czynności ma górną granicę crash_cost (nieskończoną, gdy czynności
+nie da się już skrócić) i dolną crash_cost, gdy czynność jest skrócona.
+Dzięki wydłużeniom krzywa czas–koszt jest optymalna (dla każdego czasu
+projektu najtańsza), a nie tylko zachłanna. Długość kroku ograniczają:
+- zapas do crash_duration czynności cięcia w przód i do czasu normalnego
+  czynności cięcia wstecz,
+- najmniejszy zapas całkowity czynności niekrytycznych (nowe ścieżki krytyczne),
+- docelowy czas projektu.
+
+Terminy liczone są raz, a potem aktualizowane przyrostowo: optymalizator
+trzyma najdłuższą drogę od początku do zdarzenia (ES) i od zdarzenia do
+końca projektu ("ogon", niezależny od czasu projektu). Po skróceniu czynności
+z cięcia przeliczane są tylko zdarzenia, których te wartości się zmieniły
+(kopce wg pozycji topologicznej), a czynności niekrytyczne trzymane są
+w kopcu wg długości najdłuższej ścieżki przez czynność – nowe czynności
+krytyczne i najmniejszy zapas odczytywane są z jego wierzchołka.
+
+Przykład – najtańsze skrócenie projektu o 5 dni:
+    _, duration = net.critical_path()
+    res = crash_project(net, target_duration=duration - 5)
+    res.total_cost, res.shortened()
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from cpm_core import CPMNetwork
+
+_EPS = 1e-9
+_INF = float("inf")
+
+
+# -------------------------
+#   WYNIK
+# -------------------------
+@dataclass
+class CrashStep:
+    """Jeden krok skracania.
+
+    - project_duration: czas projektu po kroku
+    - total_cost: łączny koszt skrócenia od początku
+    - cost_slope: koszt skrócenia projektu o jednostkę czasu w tym kroku
+    - shortened: ID czynności -> o ile skrócono ją w tym kroku (wartość ujemna:
+      wydłużenie czynności skróconej w jednym z wcześniejszych kroków)
+    """
+    project_duration: float
+    total_cost: float
+    cost_slope: float
+    shortened: Dict[int, float] = field(default_factory=dict)
+
+
+@dataclass
+class CrashResult:
+    """Krzywa czas–koszt; steps[0] to projekt przed skracaniem."""
+    steps: List[CrashStep]
+    normal_durations: Dict[int, float]
+    durations: Dict[int, float]
+
+    @property
+    def project_duration(self) -> float:
+        return self.steps[-1].project_duration
+
+    @property
+    def total_cost(self) -> float:
+        return self.steps[-1].total_cost
+
+    def curve(self) -> List[Tuple[float, float]]:
+        """Punkty (czas projektu, łączny koszt)."""
+        return [(s.project_duration, s.total_cost) for s in self.steps]
+
+    def cost_for(self, duration: float) -> Optional[float]:
+        """Koszt skrócenia projektu do podanego czasu (interpolacja liniowa
+        między krokami); None, gdy czasu nie da się osiągnąć."""
+        prev = self.steps[0]
+        if duration >= prev.project_duration - _EPS:
+            return 0.0
+        for step in self.steps[1:]:
+            if duration >= step.project_duration - _EPS:
+                return prev.total_cost + (prev.project_duration - duration) * step.cost_slope
+            prev = step
+        return None
+
+    def shortened(self) -> Dict[int, float]:
+        """ID czynności -> łączne skrócenie (tylko skrócone czynności)."""
+        return {aid: round(self.normal_durations[aid] - d, 6)
+                for aid, d in self.durations.items() if d < self.normal_durations[aid] - _EPS}
+
+
+@dataclass
+class _Arc:
+    """Dane czynności potrzebne optymalizatorowi, odczytane z sieci raz
+    (widok czynności sieci czyta jej kolumny przy każdym dostępie)."""
+    start_event: int
+    end_event: int
+    crash_duration: Optional[float]
+    crash_cost: float
+
+
+# -------------------------
+#   MINIMALNE CIĘCIE
+# -------------------------
+def _add_edge(graph: Dict[object, List[list]], u, v, cap: float) -> list:
+    # graf rezydualny: krawędź = [cel, przepustowość, indeks krawędzi odwrotnej]
+    edge = [v, cap, len(graph.setdefault(v, []))]
+    graph.setdefault(u, []).append(edge)
+    graph[v].append([u, 0.0, len(graph[u]) - 1])
+    return edge
+
+
+def _reachable(graph: Dict[object, List[list]], source, min_cap: float) -> Set:
+    seen = {source}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v, cap, _ in graph[u]:
+            if cap >= min_cap and v not in seen:
+                seen.add(v)
+                queue.append(v)
+    return seen
+
+
+def _max_flow(graph: Dict[object, List[list]], source, sink) -> float:
+    """Dinic: poziomy BFS + ścieżki powiększające DFS (iteracyjnie); zmienia
+    przepustowości w graph i zwraca wartość przepływu."""
+    total = 0.0
+    while True:
+        level = {source: 0}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            for v, cap, _ in graph[u]:
+                if cap > _EPS and v not in level:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if sink not in level:
+            return total
+        it = {u: 0 for u in level}
+        while True:
+            path = []          # krawędzie (u, indeks) od źródła
+            u = source
+            while u != sink:
+                edges = graph[u]
+                i = it[u]
+                while i < len(edges):
+                    v, cap, _ = edges[i]
+                    if cap > _EPS and level.get(v) == level[u] + 1 and it.get(v, 0) < len(graph[v]):
+                        break
+                    i += 1
+                it[u] = i
+                if i == len(edges):
+                    if u == source:
+                        break
+                    # ślepy zaułek – cofamy się
+                    u, j = path.pop()
+                    it[u] = j + 1
+                    continue
+                path.append((u, i))
+                u = edges[i][0]
+            if u != sink:
+                break
+            flow = min(graph[u][i][1] for u, i in path)
+            for u, i in path:
+                edge = graph[u][i]
+                edge[1] -= flow
+                graph[edge[0]][edge[2]][1] += flow
+            total += flow
+
+
+def _min_cut(acts: Dict[int, _Arc], critical: Iterable[int], durations: Dict[int, float],
+             normal: Dict[int, float]) -> Optional[Set[int]]:
+    """Zbiór zdarzeń po stronie źródła minimalnego cięcia podsieci krytycznej
+    albo None, gdy każde cięcie zawiera czynność, której nie da się skrócić.
+
+    Łuk czynności ma przepływ w granicach [dolna, górna]: górna = crash_cost
+    (nieskończona, gdy czynności nie da się już skrócić), dolna = crash_cost,
+    gdy czynność była skrócona (można ją wydłużyć z powrotem), inaczej 0.
+    Pojemność cięcia to więc koszt skrócenia łuków w przód minus oszczędność
+    z wydłużenia skróconych łuków wstecz (Phillips–Dessouky)."""
+    graph: Dict[object, List[list]] = {}
+    excess: Dict[int, float] = {}        # nadmiar dolnych granic w zdarzeniu
+    has_in: Set[int] = set()
+    has_out: Set[int] = set()
+
+    for aid in critical:
+        act = acts[aid]
+        crashable = act.crash_duration is not None and durations[aid] - act.crash_duration > _EPS
+        upper = act.crash_cost if crashable else _INF
+        lower = act.crash_cost if normal[aid] - durations[aid] > _EPS else 0.0
+        _add_edge(graph, act.start_event, act.end_event, upper - lower)
+        if lower:
+            excess[act.end_event] = excess.get(act.end_event, 0.0) + lower
+            excess[act.start_event] = excess.get(act.start_event, 0.0) - lower
+        has_out.add(act.start_event)
+        has_in.add(act.end_event)
+    source, sink = ("źródło",), ("ujście",)
+    for eid in has_out - has_in:
+        _add_edge(graph, source, eid, _INF)
+    for eid in has_in - has_out:
+        _add_edge(graph, eid, sink, _INF)
+
+    # ścieżka z samych łuków nieskończonych – brak skończonego cięcia
+    if sink in _reachable(graph, source, _INF):
+        return None
+
+    if excess:
+        # przepływ spełniający dolne granice: obieg ujście -> źródło i
+        # pomocnicze źródło/ujście dla nadmiarów (przy optymalnych czasach istnieje)
+        back = _add_edge(graph, sink, source, _INF)
+        extra_source, extra_sink = ("nadmiar",), ("niedobór",)
+        helpers = [_add_edge(graph, extra_source, eid, value) if value > 0
+                   else _add_edge(graph, eid, extra_sink, -value)
+                   for eid, value in excess.items() if abs(value) > _EPS]
+        if helpers:
+            _max_flow(graph, extra_source, extra_sink)
+        for edge in [back] + helpers:
+            edge[1] = 0.0
+            graph[edge[0]][edge[2]][1] = 0.0
+
+    _max_flow(graph, source, sink)
+    side = _reachable(graph, source, _EPS)
+    return {u for u in side if u is not source}
+
+
+# -------------------------
+#   OPTYMALIZATOR
+# -------------------------
+def crash_project(net: CPMNetwork, target_duration: Optional[float] = None,
+                  apply: bool = False) -> CrashResult:
+    """Skraca projekt najtańszymi krokami aż do target_duration (domyślnie
+    do granicy możliwości) i zwraca krzywą czas–koszt.
+
+    apply=False: sieć pozostaje bez zmian;
+    apply=True: czasy trwania czynności zostają skrócone (set_duration).
+    """
+    _, duration = net.critical_path()
+    normal = {aid: a.duration for aid, a in net.activities.items()}
+    steps = [CrashStep(project_duration=duration, total_cost=0.0, cost_slope=0.0)]
+    if not net.activities:
+        return CrashResult(steps=steps, normal_durations=normal, durations={})
+
+    acts = {aid: _Arc(a.start_event, a.end_event, a.crash_duration, a.crash_cost)
+            for aid, a in net.activities.items()}
+    outgoing, incoming = dict(net.outgoing.items()), dict(net.incoming.items())
+    dur = dict(normal)
+    pos = {eid: i for i, eid in enumerate(net._topological_order_events())}
+    head = {eid: ev.ES for eid, ev in net.events.items()}
+    tail = {eid: duration - ev.LF for eid, ev in net.events.items()}
+    sinks = [eid for eid in net.events if not outgoing.get(eid)]
+
+    def length(aid: int) -> float:
+        a = acts[aid]
+        return head[a.start_event] + dur[aid] + tail[a.end_event]
+
+    # czynności krytyczne oraz kopiec niekrytycznych (-długość, ID) z leniwym usuwaniem
+    critical: Set[int] = set()
+    heap: List[Tuple[float, int]] = []
+    current: Dict[int, float] = {}
+
+    def classify(aid: int):
+        value = length(aid)
+        if round(duration - value, 6) <= 0:
+            critical.add(aid)
+            current.pop(aid, None)
+        else:
+            critical.discard(aid)
+            if current.get(aid) != value:
+                current[aid] = value
+                heapq.heappush(heap, (-value, aid))
+
+    def top_noncritical() -> Optional[float]:
+        while heap:
+            value, aid = heap[0]
+            if current.get(aid) != -value:
+                heapq.heappop(heap)
+            else:
+                return -value
+        return None
+
+    for aid in acts:
+        classify(aid)
+
+    total_cost = 0.0
+    while target_duration is None or duration > target_duration + _EPS:
+        side = _min_cut(acts, critical, dur, normal)
+        if side is None:
+            break
+        cut = [aid for aid in critical
+               if acts[aid].start_event in side and acts[aid].end_event not in side]
+        # skrócone wcześniej czynności przecinające cięcie wstecz wydłużamy z powrotem
+        restored = [aid for aid in critical
+                    if acts[aid].start_event not in side and acts[aid].end_event in side
+                    and normal[aid] - dur[aid] > _EPS]
+
+        step = min(dur[aid] - acts[aid].crash_duration for aid in cut)
+        if restored:
+            step = min(step, min(normal[aid] - dur[aid] for aid in restored))
+        longest = top_noncritical()
+        if longest is not None:
+            step = min(step, round(duration - longest, 6))
+        if target_duration is not None:
+            step = min(step, duration - target_duration)
+
+        shortened = {}
+        for aid in cut:
+            new = max(acts[aid].crash_duration, round(dur[aid] - step, 6))
+            shortened[aid] = round(dur[aid] - new, 6)
+            dur[aid] = new
+        for aid in restored:
+            new = min(normal[aid], round(dur[aid] + step, 6))
+            shortened[aid] = round(dur[aid] - new, 6)      # ujemne – wydłużenie
+            dur[aid] = new
+        changed = cut + restored
+
+        # przyrostowa aktualizacja ES (w przód) i ogonów (w tył)
+        touched = set(changed)
+        queue = [(pos[acts[aid].end_event], acts[aid].end_event) for aid in changed]
+        heapq.heapify(queue)
+        queued = {eid for _, eid in queue}
+        while queue:
+            _, eid = heapq.heappop(queue)
+            queued.discard(eid)
+            new_head = max((head[acts[a].start_event] + dur[a] for a in incoming[eid]),
+                           default=0.0)
+            if new_head != head[eid]:
+                head[eid] = new_head
+                for a in outgoing.get(eid, ()):
+                    touched.add(a)
+                    nxt = acts[a].end_event
+                    if nxt not in queued:
+                        queued.add(nxt)
+                        heapq.heappush(queue, (pos[nxt], nxt))
+        queue = [(-pos[acts[aid].start_event], acts[aid].start_event) for aid in changed]
+        heapq.heapify(queue)
+        queued = {eid for _, eid in queue}
+        while queue:
+            _, eid = heapq.heappop(queue)
+            queued.discard(eid)
+            new_tail = max((dur[a] + tail[acts[a].end_event] for a in outgoing[eid]),
+                           default=0.0)
+            if new_tail != tail[eid]:
+                tail[eid] = new_tail
+                for a in incoming.get(eid, ()):
+                    touched.add(a)
+                    prev = acts[a].start_event
+                    if prev not in queued:
+                        queued.add(prev)
+                        heapq.heappush(queue, (-pos[prev], prev))
+
+        previous, duration = duration, max(head[eid] for eid in sinks)
+        for aid in touched:
+            classify(aid)
+        # czynności, które stały się krytyczne przez skrócenie projektu
+        while True:
+            longest = top_noncritical()
+            if longest is None or round(duration - longest, 6) > 0:
+                break
+            aid = heapq.heappop(heap)[1]
+            critical.add(aid)
+            del current[aid]
+
+        step_cost = sum(acts[aid].crash_cost * d for aid, d in shortened.items())
+        total_cost += step_cost
+        slope = step_cost / (previous - duration) if previous > duration else 0.0
+        steps.append(CrashStep(project_duration=duration, total_cost=round(total_cost, 6),
+                               cost_slope=slope, shortened=shortened))
+
+    if apply:
+        changed = {aid: d for aid, d in dur.items() if d != normal[aid]}
+        for aid, d in changed.items():
+            net.activities[aid].check(d)     # np. skrócenie poniżej czasu optymistycznego – bez zmian w sieci
+        for aid, d in changed.items():
+            net.set_duration(aid, d)
+    return CrashResult(steps=steps, normal_durations=normal, durations=dur)
@@ -0,0 +1,272 @@
+"""
+Kolumnowy widok wyników i strumieniowy eksport harmonogramu.
+
+project_summary() buduje słownik dla każdej czynności i zdarzenia. Do
+eksportu i filtrowania wystarczy widok kolumnowy: ResultView czyta dane
+i wyniki wprost z kolumn tabel sieci (EventTable/ActivityTable), a kolumny
+powstają paczkami po chunk_size wierszy – tylko te, o które ktoś zapyta.
+Pamięć eksportu to tablice ID i numerów wierszy (12 B na wiersz) i jedna
+paczka, niezależnie od liczby czynności.
+
+Gdy sieć ma kalendarz (net.calendar), widok ma też kolumny dat
+(ACTIVITY_DATE_FIELDS / EVENT_DATE_FIELDS, tekst RRRR-MM-DD), liczone
+paczkami przez cpm_calendar.
+
+Eksport (CSV, JSON Lines – także .gz – oraz Parquet, jeśli jest pyarrow)
+przyjmuje listę kolumn (fields) i filtry wierszy:
+- critical_only=True – tylko czynności krytyczne,
+- where(kolumny) – funkcja paczki zwracająca maskę (ciąg wartości logicznych);
+  kolumny paczki liczone są przy pierwszym odczycie.
+
+Przykład:
+    export(net, "wyniki.csv.gz", fields=["id", "name", "ES", "LF"], critical_only=True)
+    export(net, "opoznione.jsonl", where=lambda c: [es > 100 for es in c["ES"]])
+    ResultView(net).column("total_float")        # cała kolumna jako array('d')
+"""
+from __future__ import annotations
+import csv
+import gzip
+import io
+import json
+from array import array
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+from cpm_core import CPMNetwork
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+ACTIVITY_FIELDS = ("id", "name", "duration", "start_event", "end_event",
+                   "ES", "EF", "LS", "LF", "total_float", "free_float", "is_critical")
+EVENT_FIELDS = ("id", "name", "ES", "LF")
+ACTIVITY_DATE_FIELDS = ("ES_date", "EF_date", "LS_date", "LF_date")
+EVENT_DATE_FIELDS = ("ES_date", "LF_date")
+_RESULT_FIELDS = ("ES", "EF", "LS", "LF", "total_float", "free_float")
+_COLUMNS = {"id": "ids", "name": "names"}      # pole -> kolumna tabeli sieci
+_TYPECODES = {"id": "q", "start_event": "q", "end_event": "q", "duration": "d",
+              "ES": "d", "EF": "d", "LS": "d", "LF": "d", "total_float": "d", "free_float": "d",
+              "is_critical": "b"}
+
+Where = Callable[[Mapping[str, Sequence]], Sequence[bool]]
+
+
+# -------------------------
+#   WIDOK KOLUMNOWY
+# -------------------------
+class ChunkColumns(Mapping):
+    """Kolumny jednej paczki wierszy, liczone przy pierwszym odczycie.
+
+    Wartości to listy; brak wyniku (NaN w tablicach sieci) to None."""
+
+    def __init__(self, view: "ResultView", ids: Sequence[int], rows: Sequence[int]):
+        self._view = view
+        self.ids = ids
+        self._rows = rows
+        self._columns: Dict[str, List] = {}
+
+    def __getitem__(self, name: str) -> List:
+        column = self._columns.get(name)
+        if column is None:
+            if name.endswith("_date") and name in self._view.fields:
+                self._columns.update(self._view._build_dates(self))
+                return self._columns[name]
+            column = self._columns[name] = self._view._build(name, self._rows)
+        return column
+
+    def __iter__(self):
+        return iter(self._view.fields)
+
+    def __len__(self):
+        return len(self._view.fields)
+
+
+class ResultView:
+    """Wyniki obliczonej sieci jako kolumny (table: "activities" albo "events").
+
+    Wiersze uporządkowane są wg ID (jak w project_summary()); przy
+    sort=False – w kolejności wstawiania, bez sortowania. Kolumny dat są
+    dostępne, gdy sieć ma kalendarz. Widok pamięta numery wierszy tabeli,
+    więc jest ważny do najbliższej zmiany sieci."""
+
+    def __init__(self, net: CPMNetwork, table: str = "activities", sort: bool = True):
+        if table not in ("activities", "events"):
+            raise ValueError(f"Nieznana tabela: {table}")
+        net.compute()
+        self.net = net
+        self.table = table
+        self.fields = ACTIVITY_FIELDS if table == "activities" else EVENT_FIELDS
+        if net.calendar is not None:
+            self.fields += ACTIVITY_DATE_FIELDS if table == "activities" else EVENT_DATE_FIELDS
+        self._table = items = net.activities if table == "activities" else net.events
+        rows = items.live_rows()
+        if sort:
+            rows = sorted(rows, key=items.ids.__getitem__)
+        self._rows = array("i", rows)
+        self.ids = array("q", map(items.ids.__getitem__, self._rows))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _build(self, name: str, rows: Sequence[int]) -> List:
+        if name not in self.fields:
+            raise KeyError(f"Nieznana kolumna: {name}")
+        table = self._table
+        if name in ("start_event", "end_event"):
+            event_rows = table.start if name == "start_event" else table.end
+            return list(map(table.events.ids.__getitem__, map(event_rows.__getitem__, rows)))
+        if name == "is_critical":
+            values = table.results.is_critical
+            return [bool(values[row]) for row in rows]
+        if self.table == "activities" and name in _RESULT_FIELDS:
+            values = getattr(table.results, name)
+        else:
+            values = getattr(table, _COLUMNS.get(name, name))
+        column = list(map(values.__getitem__, rows))
+        if _TYPECODES.get(name) == "d":
+            # NaN w kolumnach sieci -> None
+            column = [None if x != x else x for x in column]
+        return column
+
+    def _build_dates(self, chunk: ChunkColumns) -> Dict[str, List]:
+        calendar = self.net.calendar
+        if self.table == "events":
+            es, lf = calendar.event_dates(chunk["ES"], chunk["LF"])
+            return {"ES_date": es, "LF_date": lf}
+        acts = list(map(self._table.__getitem__, chunk.ids))
+        return calendar.activity_dates(acts, chunk["ES"], chunk["LS"])
+
+    def chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[ChunkColumns]:
+        """Kolejne paczki wierszy (ChunkColumns)."""
+        for start in range(0, len(self.ids), chunk_size):
+            stop = start + chunk_size
+            yield ChunkColumns(self, self.ids[start:stop], self._rows[start:stop])
+
+    def column(self, name: str) -> Sequence:
+        """Cała kolumna: array('q'/'d'/'b') dla liczb (NaN zamiast None),
+        lista dla nazw."""
+        typecode = _TYPECODES.get(name)
+        if typecode is None or (self.table == "events" and name == "LF"):
+            # LF zdarzenia może być None – lista
+            result: List = []
+            for chunk in self.chunks():
+                result.extend(chunk[name])
+            return result
+        result = array(typecode)
+        nan = float("nan")
+        for chunk in self.chunks():
+            values = chunk[name]
+            result.extend(nan if x is None else x for x in values)
+        return result
+
+    def rows(self, fields: Optional[Sequence[str]] = None, where: Optional[Where] = None,
+             critical_only: bool = False,
+             chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[List]]:
+        """Paczki wybranych kolumn (lista list, kolejność jak fields) po
+        zastosowaniu filtrów wierszy; paczki bez wierszy są pomijane."""
+        fields = list(self.fields if fields is None else fields)
+        for name in fields:
+            if name not in self.fields:
+                raise KeyError(f"Nieznana kolumna: {name}")
+        if critical_only and self.table != "activities":
+            raise ValueError("Filtr critical_only dotyczy tylko czynności.")
+        for chunk in self.chunks(chunk_size):
+            mask = None
+            if critical_only:
+                mask = chunk["is_critical"]
+            if where is not None:
+                selected = where(chunk)
+                mask = list(selected) if mask is None else [a and b for a, b in zip(mask, selected)]
+            columns = [chunk[name] for name in fields]
+            if mask is not None:
+                columns = [[x for x, keep in zip(column, mask) if keep] for column in columns]
+                if not columns or not columns[0]:
+                    continue
+            yield columns
+
+
+# -------------------------
+#   EKSPORT
+# -------------------------
+def _view(source, table: str) -> ResultView:
+    return source if isinstance(source, ResultView) else ResultView(source, table)
+
+
+def _open_text(path: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def export_csv(source, path: str, fields: Optional[Sequence[str]] = None,
+               where: Optional[Where] = None, critical_only: bool = False,
+               table: str = "activities", chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Zapisuje wyniki do CSV (nagłówek = nazwy kolumn); zwraca liczbę wierszy.
+    source: CPMNetwork albo ResultView."""
+    view = _view(source, table)
+    fields = list(view.fields if fields is None else fields)
+    count = 0
+    with _open_text(path) as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        for columns in view.rows(fields, where, critical_only, chunk_size):
+            writer.writerows(zip(*columns))
+            count += len(columns[0])
+    return count
+
+
+def export_jsonl(source, path: str, fields: Optional[Sequence[str]] = None,
+                 where: Optional[Where] = None, critical_only: bool = False,
+                 table: str = "activities", chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Zapisuje wyniki jako JSON Lines (obiekt na wiersz); zwraca liczbę wierszy."""
+    view = _view(source, table)
+    fields = list(view.fields if fields is None else fields)
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    count = 0
+    with _open_text(path) as f:
+        for columns in view.rows(fields, where, critical_only, chunk_size):
+            buffer = io.StringIO()
+            for values in zip(*columns):
+                buffer.write(encode(dict(zip(fields, values))))
+                buffer.write("\n")
+            f.write(buffer.getvalue())
+            count += len(columns[0])
+    return count
+
+
+def export_parquet(source, path: str, fields: Optional[Sequence[str]] = None,
+                   where: Optional[Where] = None, critical_only: bool = False,
+                   table: str = "activities", chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Zapisuje wyniki do Parquet (grupa wierszy na paczkę); wymaga pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Eksport do Parquet wymaga pakietu pyarrow.") from None
+
+    view = _view(source, table)
+    fields = list(view.fields if fields is None else fields)
+    types = {"q": pa.int64(), "d": pa.float64(), "b": pa.bool_()}
+    schema = pa.schema([(name, types[_TYPECODES[name]] if name in _TYPECODES else pa.string())
+                        for name in fields])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for columns in view.rows(fields, where, critical_only, chunk_size):
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema))
+            count += len(columns[0])
+    return count
+
+
+_EXPORTERS = {".csv": export_csv, ".jsonl": export_jsonl, ".ndjson": export_jsonl,
+              ".parquet": export_parquet}
+
+
+def export(source, path: str, **kwargs) -> int:
+    """Wybiera format po rozszerzeniu: .csv, .jsonl/.ndjson (także .gz), .parquet."""
+    name = str(path).lower()
+    if name.endswith(".gz") and not name.endswith(".parquet.gz"):
+        name = name[:-3]
+    for suffix, exporter in _EXPORTERS.items():
+        if name.endswith(suffix):
+            return exporter(source, path, **kwargs)
+    raise ValueError(f"Nieobsługiwany format pliku: {path}")
@@ -0,0 +1,325 @@
+"""
+Skalowalny wykres Gantta (Matplotlib) dla dużych projektów.
+
+Zamiast osobnych barh/text dla każdej czynności GanttView rysuje:
+- jedną kolekcję prostokątów na kolor (krytyczne / niekrytyczne), budowaną
+  tylko dla wierszy w widoku,
+- przy oddaleniu – poziom szczegółowości (LOD): sąsiednie wiersze łączone są
+  w grupy (najwyżej jedna belka na MIN_ROW_PX pikseli), a grupa rysowana jest
+  jako obwiednia [min ES, max EF], czerwona, gdy zawiera czynność krytyczną,
+- etykiety osi i EF tylko dla widocznych wierszy, gdy jest ich niewiele.
+
+Belki, etykiety i kursor czasu są artystami "animated": przeciąganie
+(lewy przycisk), kółko (przewijanie wierszy; Ctrl – skala czasu, Shift –
+skala wierszy) i ruch kursora odświeżane są przez blitting na zapamiętanym
+tle, a pełne przerysowanie (osie, siatka) następuje chwilę po zakończeniu
+interakcji.
+
+Z kalendarzem (set_data(..., calendar=cpm_calendar.ProjectCalendar)) oś
+czasu pozostaje w dniach roboczych, ale jej etykiety, kursor i etykiety EF
+pokazują daty – zamiana przez indeks kalendarza, tylko dla widocznych
+wartości.
+"""
+from __future__ import annotations
+import math
+from typing import List, Sequence
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import FixedLocator, FuncFormatter, ScalarFormatter
+
+MIN_ROW_PX = 3        # najmniejsza wysokość wiersza/grupy na ekranie
+MAX_LABELS = 60       # etykiety wierszy tylko, gdy w widoku jest ich najwyżej tyle
+BAR_HEIGHT = 0.8
+REDRAW_DELAY_MS = 150
+
+
+class GanttView:
+    """Wykres Gantta na podanych osiach; dane podaje się przez set_data()."""
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self._n = 0
+        self._ids: Sequence = []
+        self._names: Sequence = []
+        self._starts = np.empty(0)
+        self._finishes = np.empty(0)
+        self._critical = np.empty(0, dtype=bool)
+        self._ef: Sequence = []
+        self._calendar = None
+        self._detailed = False
+
+        self._bars = {
+            False: PolyCollection([], facecolors="skyblue", edgecolors="black",
+                                  linewidths=0.5, animated=True),
+            True: PolyCollection([], facecolors="red", edgecolors="black",
+                                 linewidths=0.5, animated=True),
+        }
+        for coll in self._bars.values():
+            ax.add_collection(coll)
+        self._labels: List = []          # pula etykiet EF
+        self._cursor = ax.axvline(0.0, color="gray", linewidth=0.8, linestyle=":",
+                                  animated=True, visible=False)
+        self._cursor_text = ax.text(0.99, 1.01, "", transform=ax.transAxes, ha="right",
+                                    va="bottom", animated=True)
+        self._tick_rows = np.empty(0, dtype=np.int64)
+
+        ax.set_xlabel("Czas")
+        ax.set_title("Wykres Gantta – CPM (AOA)")
+        ax.grid(True, axis="x", linestyle="--", alpha=0.6)
+        ax.yaxis.set_major_formatter(FuncFormatter(self._format_tick))
+
+        self._background = None
+        self._overlay = None
+        self._updating = False
+        self._drag = None
+        self._timer = self.canvas.new_timer(interval=REDRAW_DELAY_MS)
+        self._timer.single_shot = True
+        self._timer.add_callback(self.canvas.draw_idle)
+
+        ax.callbacks.connect("xlim_changed", self._on_limits)
+        ax.callbacks.connect("ylim_changed", self._on_limits)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.mpl_connect("resize_event", lambda e: self._update_visible())
+        self.canvas.mpl_connect("scroll_event", self._on_scroll)
+        self.canvas.mpl_connect("button_press_event", self._on_press)
+        self.canvas.mpl_connect("button_release_event", self._on_release)
+        self.canvas.mpl_connect("motion_notify_event", self._on_motion)
+
+    # -------------------------
+    # Dane
+    # -------------------------
+    def set_data(self, ids, names, starts, durations, finishes, critical, calendar=None):
+        """Kolumny danych (listy, tablice NumPy albo kolumny snapshotu);
+        calendar – daty na osi czasu zamiast liczb."""
+        self._calendar = calendar
+        if calendar is not None:
+            self.ax.set_xlabel("Data (oś w dniach roboczych)")
+            self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_date))
+            self.ax.tick_params(axis="x", labelrotation=30)
+        else:
+            self.ax.set_xlabel("Czas")
+            self.ax.xaxis.set_major_formatter(ScalarFormatter())
+            self.ax.tick_params(axis="x", labelrotation=0)
+        self._ids = ids
+        self._names = names
+        self._starts = np.asarray(starts, dtype=np.float64)
+        self._finishes = self._starts + np.asarray(durations, dtype=np.float64)
+        self._ef = finishes
+        self._critical = np.asarray(critical, dtype=bool)
+        self._n = len(self._starts)
+        self.reset_view()
+
+    def reset_view(self):
+        """Cały projekt w widoku."""
+        end = float(self._finishes.max()) if self._n else 1.0
+        self._updating = True
+        try:
+            self.ax.set_xlim(0.0, end * 1.05 + 0.5)
+            self.ax.set_ylim(max(self._n, 1) - 0.5, -0.5)   # najwcześniejsze na górze
+        finally:
+            self._updating = False
+        self._update_visible()
+        self.canvas.draw_idle()
+
+    # -------------------------
+    # Widoczny fragment
+    # -------------------------
+    def _visible_rows(self):
+        low, high = sorted(self.ax.get_ylim())
+        r0 = max(0, int(math.floor(low + 0.5)))
+        r1 = min(self._n, int(math.floor(high + 0.5)) + 1)
+        return r0, max(r0, r1)
+
+    def _update_visible(self):
+        if self._updating:
+            return
+        r0, r1 = self._visible_rows()
+        count = r1 - r0
+        height_px = max(1.0, self.ax.bbox.height)
+        group = max(1, math.ceil(count * MIN_ROW_PX / height_px))
+
+        if group == 1:
+            rows = np.arange(r0, r1)
+            lo = self._starts[r0:r1]
+            hi = self._finishes[r0:r1]
+            crit = self._critical[r0:r1]
+            y_mid = rows.astype(np.float64)
+            half = np.full(count, BAR_HEIGHT / 2)
+        else:
+            # grupy wyrównane do wielokrotności group – stabilne przy przewijaniu
+            g0 = (r0 // group) * group
+            g1 = min(self._n, -(-r1 // group) * group)
+            bounds = np.arange(g0, g1, group)
+            lo = np.minimum.reduceat(self._starts[g0:g1], bounds - g0)
+            hi = np.maximum.reduceat(self._finishes[g0:g1], bounds - g0)
+            crit = np.logical_or.reduceat(self._critical[g0:g1], bounds - g0)
+            sizes = np.diff(np.append(bounds, g1))
+            y_mid = bounds + (sizes - 1) / 2.0
+            half = sizes * BAR_HEIGHT / 2
+
+        for flag, coll in self._bars.items():
+            mask = crit == flag
+            x0, x1 = lo[mask], hi[mask]
+            y0, y1 = y_mid[mask] - half[mask], y_mid[mask] + half[mask]
+            verts = np.stack([np.stack([x0, y0], -1), np.stack([x0, y1], -1),
+                              np.stack([x1, y1], -1), np.stack([x1, y0], -1)], axis=1)
+            coll.set_verts(verts)
+
+        # etykiety: pełne przy niewielu wierszach, inaczej co kilka wierszy same ID
+        if group == 1 and count <= MAX_LABELS:
+            self._tick_rows = np.arange(r0, r1)
+            self._detailed = True
+        else:
+            step = max(1, math.ceil(count / 20))
+            self._tick_rows = np.arange(-(-r0 // step) * step, r1, step)
+            self._detailed = False
+        self.ax.yaxis.set_major_locator(FixedLocator(self._tick_rows))
+        self._update_ef_labels(r0, r1 if self._detailed else r0)
+
+    def _format_tick(self, y, _pos) -> str:
+        row = int(round(y))
+        if not 0 <= row < self._n:
+            return ""
+        if self._detailed:
+            return f"{self._ids[row]}: {self._names[row]}"
+        return str(self._ids[row])
+
+    def _format_date(self, x, _pos) -> str:
+        if self._calendar is None or x < 0:
+            return ""
+        return self._calendar.to_date(x).isoformat()
+
+    def _update_ef_labels(self, r0: int, r1: int):
+        needed = r1 - r0
+        while len(self._labels) < needed:
+            self._labels.append(self.ax.text(0, 0, "", va="center", animated=True))
+        for k, label in enumerate(self._labels):
+            if k < needed:
+                row = r0 + k
+                label.set_position((self._finishes[row] + 0.1, row))
+                ef = self._ef[row]
+                if self._calendar is not None:
+                    label.set_text(f"EF={self._calendar.to_date(ef, finish=True).isoformat()}")
+                else:
+                    label.set_text(f"EF={ef:g}")
+                label.set_visible(True)
+            else:
+                label.set_visible(False)
+
+    # -------------------------
+    # Rysowanie (blitting)
+    # -------------------------
+    def _draw_cursor(self):
+        if self._cursor.get_visible():
+            self.ax.draw_artist(self._cursor)
+            self.ax.draw_artist(self._cursor_text)
+
+    def _on_draw(self, _event):
+        # pełne rysowanie pomija artystów "animated": zapamiętujemy tło samych osi,
+        # dorysowujemy belki i etykiety, zapamiętujemy drugie tło (dla kursora)
+        bbox = self.ax.figure.bbox
+        self._background = self.canvas.copy_from_bbox(bbox)
+        for coll in self._bars.values():
+            self.ax.draw_artist(coll)
+        for label in self._labels:
+            if label.get_visible():
+                self.ax.draw_artist(label)
+        self._overlay = self.canvas.copy_from_bbox(bbox)
+        self._draw_cursor()
+
+    def _blit(self):
+        """Odświeża belki (bez etykiet – te wracają przy pełnym rysowaniu)."""
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        for coll in self._bars.values():
+            self.ax.draw_artist(coll)
+        self._overlay = None
+        self._draw_cursor()
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def _blit_cursor(self):
+        if self._overlay is None:
+            self._blit()
+            return
+        self.canvas.restore_region(self._overlay)
+        self._draw_cursor()
+        self.canvas.blit(self.ax.figure.bbox)
+
+    def _on_limits(self, _ax):
+        self._update_visible()
+
+    # -------------------------
+    # Interakcja
+    # -------------------------
+    def _toolbar_active(self) -> bool:
+        toolbar = getattr(self.canvas, "toolbar", None)
+        return bool(toolbar is not None and getattr(toolbar, "mode", ""))
+
+    def _interactive(self):
+        """Szybkie odświeżenie teraz, pełne (osie, siatka) po chwili bezczynności."""
+        self._blit()
+        self._timer.stop()
+        self._timer.start()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or not self._n:
+            return
+        direction = -1 if event.button == "up" else 1
+        if event.key == "control":
+            x0, x1 = self.ax.get_xlim()
+            scale = 0.8 if direction < 0 else 1.25
+            x = event.xdata
+            self.ax.set_xlim(x - (x - x0) * scale, x + (x1 - x) * scale)
+        else:
+            bottom, top = self.ax.get_ylim()
+            if event.key == "shift":
+                scale = 0.8 if direction < 0 else 1.25
+                y = event.ydata
+                bottom, top = y + (bottom - y) * scale, y + (top - y) * scale
+            else:
+                shift = direction * max(1.0, (bottom - top) / 10)
+                bottom, top = bottom + shift, top + shift
+            self.ax.set_ylim(bottom, top)
+        self._interactive()
+
+    def _on_press(self, event):
+        if event.button != 1 or event.inaxes is not self.ax or self._toolbar_active():
+            return
+        self._drag = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def _on_release(self, _event):
+        if self._drag is not None:
+            self._drag = None
+            self._timer.stop()
+            self.canvas.draw_idle()
+
+    def _on_motion(self, event):
+        if self._drag is not None:
+            x_px, y_px, (x0, x1), (bottom, top) = self._drag
+            box = self.ax.bbox
+            dx = (event.x - x_px) * (x1 - x0) / box.width
+            dy = (event.y - y_px) * (top - bottom) / box.height
+            self._updating = True
+            try:
+                self.ax.set_xlim(x0 - dx, x1 - dx)
+            finally:
+                self._updating = False
+            self.ax.set_ylim(bottom - dy, top - dy)
+            self._interactive()
+            return
+        if event.inaxes is self.ax and event.xdata is not None:
+            self._cursor.set_xdata([event.xdata, event.xdata])
+            self._cursor.set_visible(True)
+            text = f"t = {event.xdata:.2f}"
+            if self._calendar is not None and event.xdata >= 0:
+                text += f" ({self._calendar.to_date(event.xdata).isoformat()})"
+            self._cursor_text.set_text(text)
+        elif self._cursor.get_visible():
+            self._cursor.set_visible(False)
+        else:
+            return
+        self._blit_cursor()
@@ -1,10 +1,51 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from typing import List
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-from cpm_core import CPMNetwork, Activity, Event  # upewnij się, że nazwa pliku to cpm_core.py
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+from cpm_core import CPMNetwork, Activity, Event, PHASES  # upewnij się, że nazwa pliku to cpm_core.py
+from cpm_io import load_file
+from cpm_snapshot import save_snapshot, load_snapshot
+from cpm_table import VirtualTable, attr_getter
+from cpm_metrics import ComputeMetrics
+from cpm_calendar import ProjectCalendar, WorkCalendar, WEEKDAY_NAMES
+from cpm_gantt import GanttView
+from cpm_worker import BackgroundWorker
+
+EVENT_COLUMNS = [("id", "ID", 70), ("name", "Nazwa", 220)]
+ACTIVITY_COLUMNS = [("id", "ID", 70), ("name", "Nazwa", 200), ("duration", "Czas", 70),
+                    ("start_event", "Od", 70), ("end_event", "Do", 70)]
+EVENT_RESULT_COLUMNS = EVENT_COLUMNS + [("ES", "ES", 80), ("LF", "LF", 80)]
+METRICS_COLUMNS = [("phase", "Etap", 160), ("calls", "Wywołania", 80), ("seconds", "Czas [s]", 90),
+                   ("avg_ms", "Średnio [ms]", 90), ("nodes", "Zdarzenia", 90),
+                   ("edges", "Czynności", 90), ("max_peak_bytes", "Szczyt pamięci [B]", 130)]
+ACTIVITY_RESULT_COLUMNS = ACTIVITY_COLUMNS + [
+    ("ES", "ES", 70), ("EF", "EF", 70), ("LS", "LS", 70), ("LF", "LF", 70),
+    ("total_float", "Zapas całk.", 80), ("free_float", "Zapas swob.", 80),
+    ("is_critical", "Krytyczna", 70),
+]
+EVENT_DATE_COLUMNS = [("ES_date", "Data ES", 90), ("LF_date", "Data LF", 90)]
+ACTIVITY_DATE_COLUMNS = [("ES_date", "Data ES", 90), ("EF_date", "Data EF", 90),
+                         ("LS_date", "Data LS", 90), ("LF_date", "Data LF", 90)]
+
+PHASE_LABELS = {
+    "topological_order": "sortowanie topologiczne",
+    "forward": "przebieg w przód",
+    "backward": "przebieg wstecz",
+    "floats": "zapasy",
+    "summary": "podsumowanie",
+}
+
+
+def plot_gantt(ax, ids, names, starts, durations, finishes, critical, calendar=None) -> GanttView:
+    """Rysuje wykres Gantta z kolumn danych (listy, tablice NumPy albo kolumny
+    zmapowanego snapshotu – cpm_snapshot.SnapshotView.gantt_data()); z
+    calendar (cpm_calendar.ProjectCalendar) oś czasu opisana jest datami.
+    Zwrócony GanttView trzeba przechowywać, póki wykres jest wyświetlany."""
+    view = GanttView(ax)
+    view.set_data(ids, names, starts, durations, finishes, critical, calendar)
+    return view
 
 
 class CPMGUI:
@@ -13,6 +54,14 @@ class CPMGUI:
         self.root.title("CPM – sieć zdarzeń (AOA)")
 
         self.net = CPMNetwork()
+        self._gantt_win = None
+        self._gantt_view = None
+        self.worker = BackgroundWorker(root)
+        self._pending = set()            # akcje czekające na wynik: "results", "gantt"
+        self._last_summary = None        # (sieć, wersja, podsumowanie, kalendarz)
+        self._inflight = None            # (sieć, wersja) liczona właśnie w tle
+        self.metrics = None              # ComputeMetrics, gdy włączona diagnostyka
+        self._diag = None                # (okno, tabela, etykieta pamięci podręcznej)
 
         main = ttk.Notebook(root)
         main.pack(fill="both", expand=True, padx=10, pady=10)
@@ -32,7 +81,23 @@ class CPMGUI:
 
         ttk.Button(btn_frame, text="Oblicz CPM", command=self.compute_cpm).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Wykres Gantta", command=self.show_gantt).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Importuj projekt", command=self.import_project).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Zapisz snapshot", command=self.save_snapshot).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Otwórz snapshot", command=self.open_snapshot).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Kalendarz", command=self.edit_calendar).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Wyczyść projekt", command=self.clear_all).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Diagnostyka", command=self.show_diagnostics).pack(side=tk.LEFT, padx=5)
+
+        # pasek stanu obliczeń w tle
+        status = ttk.Frame(root)
+        status.pack(fill="x", padx=10, pady=(0, 5))
+        self.progress = ttk.Progressbar(status, mode="determinate", maximum=100, length=200)
+        self.progress.pack(side=tk.LEFT)
+        self.status_label = ttk.Label(status, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        self.btn_cancel = ttk.Button(status, text="Anuluj", command=self.cancel_computation)
+        self.btn_cancel.pack(side=tk.RIGHT)
+        self.btn_cancel.state(["disabled"])
 
     # ---------------- Events tab ----------------
     def _build_events_tab(self):
@@ -49,8 +114,10 @@ class CPMGUI:
         ttk.Button(frm, text="Dodaj zdarzenie", command=self.add_event).grid(row=2, column=0, columnspan=2, pady=5)
 
         ttk.Label(frm, text="Zdarzenia:").grid(row=3, column=0, sticky="w", pady=(10, 0))
-        self.events_list = tk.Listbox(frm, width=50, height=10)
-        self.events_list.grid(row=4, column=0, columnspan=2, sticky="w")
+        self.events_list = VirtualTable(frm, EVENT_COLUMNS, getter=attr_getter, height=10)
+        self.events_list.grid(row=4, column=0, columnspan=2, sticky="nsew")
+        frm.rowconfigure(4, weight=1)
+        frm.columnconfigure(1, weight=1)
 
     # ---------------- Activities tab ----------------
     def _build_activities_tab(self):
@@ -79,8 +146,10 @@ class CPMGUI:
         ttk.Button(frm, text="Dodaj czynność", command=self.add_activity).grid(row=5, column=0, columnspan=2, pady=5)
 
         ttk.Label(frm, text="Czynności:").grid(row=6, column=0, sticky="w", pady=(10, 0))
-        self.activities_list = tk.Listbox(frm, width=70, height=10)
-        self.activities_list.grid(row=7, column=0, columnspan=2, sticky="w")
+        self.activities_list = VirtualTable(frm, ACTIVITY_COLUMNS, getter=attr_getter, height=10)
+        self.activities_list.grid(row=7, column=0, columnspan=2, sticky="nsew")
+        frm.rowconfigure(7, weight=1)
+        frm.columnconfigure(1, weight=1)
 
     # ------------- Actions: events -------------
     def add_event(self):
@@ -98,12 +167,22 @@ class CPMGUI:
             messagebox.showerror("Błąd", str(e))
             return
 
-        self.events_list.insert(tk.END, f"{eid}: {name}")
+        self._refresh_tables(activities=False)
+        self._network_changed()
+        self.events_list.find(eid)
         self.entry_event_id.delete(0, tk.END)
         self.entry_event_name.delete(0, tk.END)
 
         self._refresh_event_comboboxes()
 
+    def _refresh_tables(self, events: bool = True, activities: bool = True):
+        # tabele dostają leniwe sekwencje wierszy sieci – obiekty powstają
+        # dopiero przy rysowaniu, sortowaniu i filtrowaniu
+        if events:
+            self.events_list.set_rows(self.net.events.rows(), keep_position=True)
+        if activities:
+            self.activities_list.set_rows(self.net.activities.rows(), keep_position=True)
+
     def _refresh_event_comboboxes(self):
         ids = sorted(self.net.events.keys())
         values = [str(eid) for eid in ids]
@@ -151,10 +230,9 @@ class CPMGUI:
             messagebox.showerror("Błąd", str(e))
             return
 
-        self.activities_list.insert(
-            tk.END,
-            f"{aid}: {name}, dur={dur}, {start_id} -> {end_id}"
-        )
+        self._refresh_tables(events=False)
+        self._network_changed()
+        self.activities_list.find(aid)
 
         self.entry_act_id.delete(0, tk.END)
         self.entry_act_name.delete(0, tk.END)
@@ -162,91 +240,393 @@ class CPMGUI:
         self.combo_start_event.set("")
         self.combo_end_event.set("")
 
+    # ------------- Actions: background computation -------------
+    def _request_summary(self, action: str):
+        """Zamawia akcję ("results" / "gantt") wykonywaną po policzeniu
+        project_summary() w tle; niezmieniona sieć nie jest liczona ponownie,
+        a trwające obliczenia tej samej wersji nie są przerywane."""
+        self._pending.add(action)
+        if not self.worker.busy and self._last_summary is not None:
+            net, version, summary, calendar = self._last_summary
+            if net is self.net and version == self.net.cache_info()["version"]:
+                self._summary_ready(net, version, summary, calendar)
+                return
+        self._start_computation()
+
+    def _start_computation(self):
+        net = self.net
+        version = net.cache_info()["version"]
+        if self.worker.busy and self._inflight == (net, version):
+            return                       # ta wersja sieci już się liczy
+        # w wątku Tk tylko zwarta kopia (krotki) – sieć odtwarza wątek roboczy,
+        # a edycje w trakcie nie zmieniają liczonej sieci
+        payload = net.payload()
+        calendar, metrics = net.calendar, self.metrics   # daty wyniku są z tego kalendarza
+
+        def task(progress):
+            snapshot = CPMNetwork.from_payload(payload)
+            snapshot.metrics = metrics
+            return snapshot.project_summary(progress)
+
+        self._inflight = (net, version)
+        self.worker.submit(task,
+                           on_done=lambda summary: self._summary_ready(net, version, summary, calendar),
+                           on_progress=self._show_progress,
+                           on_error=self._summary_failed)
+        self.progress["value"] = 0
+        self.status_label.configure(text="Obliczanie...")
+        self.btn_cancel.state(["!disabled"])
+
+    def _network_changed(self):
+        # wynik trwających obliczeń byłby nieaktualny – liczymy od nowa
+        if self.worker.busy:
+            self._start_computation()
+
+    def _show_progress(self, phase: str, fraction: float):
+        overall = (PHASES.index(phase) + fraction) / len(PHASES)
+        self.progress["value"] = 100 * overall
+        self.status_label.configure(text=f"Obliczanie: {PHASE_LABELS[phase]} ({fraction:.0%})")
+
+    def _computation_finished(self, text: str = ""):
+        self.progress["value"] = 0
+        self.status_label.configure(text=text)
+        self.btn_cancel.state(["disabled"])
+
+    def _summary_ready(self, net: CPMNetwork, version: int, summary, calendar):
+        self._inflight = None
+        self._last_summary = (net, version, summary, calendar)
+        self._computation_finished()
+        self._refresh_diagnostics()
+        actions, self._pending = self._pending, set()
+        if "results" in actions:
+            self._show_results(summary)
+        if "gantt" in actions:
+            self._show_gantt(summary, calendar)
+
+    def _summary_failed(self, error: BaseException):
+        self._inflight = None
+        self._pending.clear()
+        self._computation_finished()
+        messagebox.showerror("Błąd CPM", str(error))
+
+    def cancel_computation(self):
+        self.worker.cancel()
+        self._inflight = None
+        self._pending.clear()
+        self._computation_finished("Anulowano.")
+
+    # ------------- Diagnostics -------------
+    def show_diagnostics(self):
+        """Okno z czasami etapów obliczeń (cpm_metrics) i eksportem do JSON."""
+        if self._diag is not None and self._diag[0].winfo_exists():
+            self._diag[0].lift()
+            self._refresh_diagnostics()
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title("Diagnostyka obliczeń")
+        win.geometry("850x400")
+
+        bar = ttk.Frame(win)
+        bar.pack(fill="x", padx=10, pady=(10, 0))
+        enabled = tk.BooleanVar(value=self.metrics is not None)
+        allocations = tk.BooleanVar(value=self.metrics is not None and self.metrics.track_allocations)
+
+        def toggle():
+            if self.metrics is not None:
+                self.metrics.close()
+            self.metrics = ComputeMetrics(track_allocations=allocations.get()) if enabled.get() else None
+            self.net.metrics = self.metrics
+            self._refresh_diagnostics()
+
+        def reset():
+            if self.metrics is not None:
+                self.metrics.reset()
+            self._refresh_diagnostics()
+
+        ttk.Checkbutton(bar, text="Zbieraj metryki", variable=enabled, command=toggle).pack(side=tk.LEFT)
+        ttk.Checkbutton(bar, text="Śledź alokacje (wolniej)", variable=allocations,
+                        command=toggle).pack(side=tk.LEFT, padx=10)
+        ttk.Button(bar, text="Eksport JSON", command=self.export_metrics).pack(side=tk.RIGHT)
+        ttk.Button(bar, text="Wyczyść", command=reset).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(bar, text="Odśwież", command=self._refresh_diagnostics).pack(side=tk.RIGHT)
+
+        table = VirtualTable(win, METRICS_COLUMNS, height=10, searchable=False)
+        table.pack(fill="both", expand=True, padx=10, pady=5)
+        cache_label = ttk.Label(win, text="", wraplength=820)
+        cache_label.pack(anchor="w", padx=10, pady=(0, 10))
+        self._diag = (win, table, cache_label)
+        self._refresh_diagnostics()
+
+    def _refresh_diagnostics(self):
+        if self._diag is None or not self._diag[0].winfo_exists():
+            return
+        _, table, cache_label = self._diag
+        if self.metrics is None:
+            table.set_rows([])
+            cache_label.configure(text="Pomiary wyłączone.")
+            return
+        table.set_rows(self.metrics.summary_rows(), keep_position=True)
+        hits, misses = dict(self.metrics.cache_hits), dict(self.metrics.cache_misses)
+        names = sorted(set(hits) | set(misses))
+        cache_label.configure(text="Pamięć podręczna (trafienia/chybienia): " + (
+            ", ".join(f"{n} {hits.get(n, 0)}/{misses.get(n, 0)}" for n in names) or "brak odczytów"))
+
+    def export_metrics(self):
+        if self.metrics is None:
+            messagebox.showinfo("Brak danych", "Najpierw włącz zbieranie metryk.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Eksport metryk", defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("Wszystkie pliki", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            self.metrics.to_json(path)
+        except Exception as e:
+            messagebox.showerror("Błąd zapisu", str(e))
+
     # ------------- Actions: compute -------------
     def compute_cpm(self):
+        self._request_summary("results")
+
+    def _show_results(self, summary):
+        win = tk.Toplevel(self.root)
+        win.title("Wyniki CPM")
+        win.geometry("1100x650")
+
+        path = summary["critical_path"]
+        shown = " -> ".join(str(i) for i in path[:50])
+        if len(path) > 50:
+            shown += f" -> ... (razem {len(path)})"
+        duration = f"Czas trwania projektu: {summary['duration']}"
+        if "start_date" in summary:
+            duration += f" (od {summary['start_date']} do {summary['finish_date']})"
+        ttk.Label(win, text=duration).pack(anchor="w", padx=10, pady=(10, 0))
+        ttk.Label(win, text=f"Ścieżka krytyczna (ID czynności): {shown}",
+                  wraplength=1050).pack(anchor="w", padx=10)
+
+        tabs = ttk.Notebook(win)
+        tabs.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # czynności – z filtrami
+        frm_acts = ttk.Frame(tabs)
+        tabs.add(frm_acts, text="Czynności")
+        filters = ttk.Frame(frm_acts)
+        filters.pack(fill="x", pady=(5, 3))
+        only_critical = tk.BooleanVar(value=False)
+        max_float = ttk.Entry(filters, width=8)
+        dated = "start_date" in summary
+        table_acts = VirtualTable(frm_acts, ACTIVITY_RESULT_COLUMNS +
+                                  (ACTIVITY_DATE_COLUMNS if dated else []))
+
+        def apply_filter(*_):
+            raw = max_float.get().strip().replace(",", ".")
+            try:
+                limit = float(raw) if raw else None
+            except ValueError:
+                messagebox.showerror("Błąd", "Próg zapasu musi być liczbą.", parent=win)
+                return
+            crit = only_critical.get()
+            if not crit and limit is None:
+                table_acts.set_filter(None)
+            else:
+                table_acts.set_filter(lambda a: (not crit or a["is_critical"]) and
+                                      (limit is None or (a["total_float"] is not None
+                                                         and a["total_float"] <= limit)))
+
+        ttk.Checkbutton(filters, text="Tylko krytyczne", variable=only_critical,
+                        command=apply_filter).pack(side=tk.LEFT)
+        ttk.Label(filters, text="Zapas całkowity ≤").pack(side=tk.LEFT, padx=(15, 3))
+        max_float.pack(side=tk.LEFT)
+        max_float.bind("<Return>", apply_filter)
+        ttk.Button(filters, text="Filtruj", command=apply_filter).pack(side=tk.LEFT, padx=5)
+        table_acts.pack(fill="both", expand=True)
+        table_acts.set_rows(summary["activities"])
+
+        # zdarzenia
+        frm_events = ttk.Frame(tabs)
+        tabs.add(frm_events, text="Zdarzenia")
+        table_events = VirtualTable(frm_events, EVENT_RESULT_COLUMNS + (EVENT_DATE_COLUMNS if dated else []))
+        table_events.pack(fill="both", expand=True, pady=(5, 0))
+        table_events.set_rows(summary["events"])
+
+    # ------------- Actions: import -------------
+    def import_project(self):
+        path = filedialog.askopenfilename(
+            title="Importuj projekt",
+            filetypes=[("CSV / JSON Lines", "*.csv *.jsonl *.ndjson *.gz"), ("Wszystkie pliki", "*.*")],
+        )
+        if not path:
+            return
         try:
-            summary = self.net.project_summary()
+            net = load_file(path)
         except Exception as e:
-            messagebox.showerror("Błąd CPM", str(e))
+            messagebox.showerror("Błąd importu", str(e))
             return
+        self._set_network(net)
 
-        win = tk.Toplevel(self.root)
-        win.title("Wyniki CPM")
+    def save_snapshot(self):
+        path = filedialog.asksaveasfilename(
+            title="Zapisz snapshot", defaultextension=".cpmsnap",
+            filetypes=[("Snapshot CPM", "*.cpmsnap"), ("Wszystkie pliki", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            save_snapshot(self.net, path)
+        except Exception as e:
+            messagebox.showerror("Błąd zapisu", str(e))
+
+    def open_snapshot(self):
+        path = filedialog.askopenfilename(
+            title="Otwórz snapshot",
+            filetypes=[("Snapshot CPM", "*.cpmsnap"), ("Wszystkie pliki", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            with load_snapshot(path) as view:
+                net = view.to_network()
+        except Exception as e:
+            messagebox.showerror("Błąd odczytu", str(e))
+            return
+        self._set_network(net)
+
+    def _set_network(self, net: CPMNetwork):
+        if net.calendar is None:
+            net.calendar = self.net.calendar  # kalendarz zostaje po imporcie
+        self.net = net
+        net.metrics = self.metrics
+        self._refresh_tables()
+        self._refresh_event_comboboxes()
+        self._network_changed()
 
-        text = tk.Text(win, width=110, height=35)
-        text.pack(padx=10, pady=10)
-
-        text.insert(tk.END, f"Czas trwania projektu: {summary['duration']}\n")
-        text.insert(tk.END, f"Ścieżka krytyczna (ID czynności): "
-                            f"{' -> '.join(str(i) for i in summary['critical_path'])}\n\n")
-
-        text.insert(tk.END, "ZDARZENIA:\n")
-        for ev in summary["events"]:
-            line = (f"Event {ev['id']} ({ev['name']}): "
-                    f"ES={ev['ES']}, LF={ev['LF']}\n")
-            text.insert(tk.END, line)
-        text.insert(tk.END, "\nCZYNNOSCI:\n")
-        for a in summary["activities"]:
-            line = (f"Act {a['id']} ({a['name']}): "
-                    f"dur={a['duration']}, "
-                    f"{a['start_event']} -> {a['end_event']}, "
-                    f"ES={a['ES']}, EF={a['EF']}, "
-                    f"LS={a['LS']}, LF={a['LF']}, "
-                    f"TF={a['total_float']}, FF={a['free_float']}, "
-                    f"critical={a['is_critical']}\n")
-            text.insert(tk.END, line)
+    # ------------- Actions: calendar -------------
+    def edit_calendar(self):
+        """Okno kalendarza projektu: data rozpoczęcia, dni robocze, święta
+        (kalendarze zasobów – z pliku JSON, zob. cpm_calendar)."""
+        current = self.net.calendar
+        win = tk.Toplevel(self.root)
+        win.title("Kalendarz projektu")
+        frm = ttk.Frame(win, padding=10)
+        frm.pack(fill="both", expand=True)
+
+        ttk.Label(frm, text="Data rozpoczęcia (RRRR-MM-DD):").grid(row=0, column=0, sticky="w")
+        entry_start = ttk.Entry(frm, width=14)
+        entry_start.grid(row=0, column=1, sticky="w", pady=2)
+        ttk.Label(frm, text="Dni robocze:").grid(row=1, column=0, sticky="w")
+        days_frame = ttk.Frame(frm)
+        days_frame.grid(row=1, column=1, sticky="w", pady=2)
+        day_vars = [tk.BooleanVar(value=d < 5) for d in range(7)]
+        for d, var in enumerate(day_vars):
+            ttk.Checkbutton(days_frame, text=WEEKDAY_NAMES[d], variable=var).pack(side=tk.LEFT)
+        ttk.Label(frm, text="Święta (daty po przecinku):").grid(row=2, column=0, sticky="nw")
+        text_holidays = tk.Text(frm, width=40, height=4)
+        text_holidays.grid(row=2, column=1, sticky="we", pady=2)
+        resources = {}
+
+        def fill(calendar: ProjectCalendar):
+            resources.clear()
+            resources.update(calendar.resource_calendars)
+            entry_start.delete(0, tk.END)
+            entry_start.insert(0, calendar.start.isoformat())
+            for d, var in enumerate(day_vars):
+                var.set(d in calendar.calendar.workdays)
+            text_holidays.delete("1.0", tk.END)
+            text_holidays.insert("1.0", ", ".join(sorted(d.isoformat() for d in calendar.calendar.holidays)))
+
+        def apply():
+            raw = text_holidays.get("1.0", tk.END).replace(";", ",").replace("\n", ",")
+            holidays = [d for d in raw.split(",") if d.strip()]
+            workdays = [d for d, var in enumerate(day_vars) if var.get()]
+            extra = current.calendar.extra_workdays if current is not None else ()
+            try:
+                calendar = ProjectCalendar(entry_start.get(), WorkCalendar(workdays, holidays, extra),
+                                           resources)
+            except ValueError as e:
+                messagebox.showerror("Błąd", str(e), parent=win)
+                return
+            self._set_calendar(calendar)
+            win.destroy()
+
+        def load():
+            path = filedialog.askopenfilename(
+                title="Wczytaj kalendarz", parent=win,
+                filetypes=[("JSON", "*.json"), ("Wszystkie pliki", "*.*")],
+            )
+            if not path:
+                return
+            try:
+                fill(ProjectCalendar.load(path))
+            except Exception as e:
+                messagebox.showerror("Błąd odczytu", str(e), parent=win)
+
+        def remove():
+            self._set_calendar(None)
+            win.destroy()
+
+        if current is not None:
+            fill(current)
+        buttons = ttk.Frame(frm)
+        buttons.grid(row=3, column=0, columnspan=2, sticky="e", pady=(8, 0))
+        ttk.Button(buttons, text="Wczytaj z pliku", command=load).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Bez kalendarza", command=remove).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Zastosuj", command=apply).pack(side=tk.LEFT, padx=5)
+
+    def _set_calendar(self, calendar):
+        self.net.calendar = calendar
+        self._last_summary = None            # podsumowanie bez dat / ze starymi datami
+        self._network_changed()
+        self.status_label.configure(
+            text=f"Kalendarz: start {calendar.start_date.isoformat()}" if calendar else "Bez kalendarza.")
 
     # ------------- Actions: clear -------------
     def clear_all(self):
         self.net = CPMNetwork()
-        self.events_list.delete(0, tk.END)
-        self.activities_list.delete(0, tk.END)
+        self.net.metrics = self.metrics
+        self._refresh_tables()
         self._refresh_event_comboboxes()
+        self._network_changed()
         messagebox.showinfo("Wyczyszczono", "Projekt został wyczyszczony.")
 
     def show_gantt(self):
-        try:
-            summary = self.net.project_summary()
-        except Exception as e:
-            messagebox.showerror("Błąd CPM", str(e))
-            return
+        self._request_summary("gantt")
 
+    def _show_gantt(self, summary, calendar):
+        """calendar – kalendarz, z którym policzono summary (nie bieżący sieci)."""
         acts = summary["activities"]
 
         if not acts:
             messagebox.showinfo("Brak danych", "Najpierw dodaj czynności.")
             return
 
-        gantt_win = tk.Toplevel(self.root)
-        gantt_win.title("Wykres Gantta")
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        y_labels = []
-        y_positions = []
-
-        for i, act in enumerate(acts):
-            y_labels.append(f"{act['id']}: {act['name']}")
-            y_positions.append(i)
-
-            start = act["ES"]
-            duration = act["duration"]
+        columns = ([a["id"] for a in acts], [a["name"] for a in acts],
+                   [a["ES"] for a in acts], [a["duration"] for a in acts],
+                   [a["EF"] for a in acts], [a["is_critical"] for a in acts])
 
-            color = "red" if act["is_critical"] else "skyblue"
+        columns += (calendar if "start_date" in summary else None,)
 
-            ax.barh(i, duration, left=start, color=color, edgecolor="black")
-            ax.text(start + duration + 0.1, i, f"EF={act['EF']}", va='center')
-
-        ax.set_yticks(y_positions)
-        ax.set_yticklabels(y_labels)
-        ax.set_xlabel("Czas")
-        ax.set_title("Wykres Gantta – CPM (AOA)")
+        # okno i figura tworzone raz – kolejne wywołania tylko podmieniają dane
+        if self._gantt_win is not None and self._gantt_win.winfo_exists():
+            self._gantt_view.set_data(*columns)
+            self._gantt_win.deiconify()
+            self._gantt_win.lift()
+            return
 
-        ax.invert_yaxis()  # najwcześniejsze na górze
-        ax.grid(True, axis='x', linestyle='--', alpha=0.6)
+        gantt_win = tk.Toplevel(self.root)
+        gantt_win.title("Wykres Gantta")
 
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         canvas = FigureCanvasTkAgg(fig, master=gantt_win)
+        toolbar = NavigationToolbar2Tk(canvas, gantt_win, pack_toolbar=False)
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        self._gantt_win = gantt_win
+        self._gantt_view = plot_gantt(ax, *columns)
         canvas.draw()
 
 
@@ -0,0 +1,207 @@
+"""
+Import projektu CPM z plików CSV i JSON Lines.
+
+Jeden rekord (wiersz CSV z nagłówkiem albo obiekt JSON w linii) opisuje
+zdarzenie lub czynność:
+- type: "event"/"zdarzenie" albo "activity"/"czynnosc" – opcjonalnie; bez tej
+  kolumny rekord z wypełnionym start_event jest czynnością, inny – zdarzeniem
+- id, name
+- duration, start_event, end_event, optimistic, pessimistic,
+  crash_duration, crash_cost (czynności)
+
+Plik czytany jest strumieniowo, paczkami po chunk_size rekordów (pliki *.gz
+rozpakowywane są w locie). Nazwy czyszczone są normalize_many() dla całej
+paczki, a czynności dołączane do sieci jednym add_batch() po wczytaniu.
+Walidacja (brakujące zdarzenia, pętle, cykle – cpm_validate) wykonywana
+jest raz, na końcu; wszystkie problemy zgłaszane są razem w LoadError
+z numerami linii.
+"""
+from __future__ import annotations
+import csv
+import gzip
+import io
+import itertools
+import json
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cpm_core import CPMNetwork, Activity, Event, normalize_many
+from cpm_validate import NetworkValidationError
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# (numer linii, rekord) – rekord None oznacza linię, której nie dało się odczytać
+Record = Tuple[int, Optional[dict]]
+
+_EVENT_TYPES = {"event", "e", "zdarzenie"}
+_ACTIVITY_TYPES = {"activity", "a", "czynnosc", "czynność"}
+
+
+class LoadError(ValueError):
+    """Błędy importu. problems: lista (numer_linii, opis) w kolejności linii."""
+
+    def __init__(self, problems: List[Tuple[int, str]]):
+        self.problems = problems
+        shown = "\n".join(f"linia {line}: {msg}" for line, msg in problems[:20])
+        more = f"\n... oraz {len(problems) - 20} kolejnych" if len(problems) > 20 else ""
+        super().__init__(f"Błędy importu ({len(problems)}):\n{shown}{more}")
+
+
+# -------------------------
+#   CZYTANIE REKORDÓW
+# -------------------------
+def _open_text(path: str, encoding: str) -> io.TextIOBase:
+    if str(path).endswith(".gz"):
+        return gzip.open(path, "rt", encoding=encoding, newline="")
+    return open(path, "r", encoding=encoding, newline="")
+
+
+def iter_csv_records(path: str, delimiter: str = ",", encoding: str = "utf-8") -> Iterator[Record]:
+    """Rekordy pliku CSV z nagłówkiem (numer linii liczony od 1, nagłówek to linia 1)."""
+    with _open_text(path, encoding) as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def iter_jsonl_records(path: str, encoding: str = "utf-8") -> Iterator[Record]:
+    """Rekordy pliku JSON Lines (puste linie są pomijane)."""
+    with _open_text(path, encoding) as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_no, record if isinstance(record, dict) else None
+
+
+def _chunks(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    it = iter(records)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _optional_float(value) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _is_event(record: dict) -> bool:
+    kind = str(record.get("type") or "").strip().lower()
+    if kind in _EVENT_TYPES:
+        return True
+    if kind in _ACTIVITY_TYPES:
+        return False
+    if kind:
+        raise ValueError(f"Nieznany typ rekordu: {kind}")
+    return record.get("start_event") in (None, "")
+
+
+# -------------------------
+#   IMPORT
+# -------------------------
+def load_records(records: Iterable[Record], net: Optional[CPMNetwork] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> CPMNetwork:
+    """Wczytuje rekordy do sieci (nowej albo podanej) i zwraca ją.
+
+    Przy błędach zgłaszany jest LoadError, a podana sieć pozostaje bez zmian.
+    """
+    net = CPMNetwork() if net is None else net
+    events: Dict[int, Event] = {}
+    activities: Dict[int, Activity] = {}
+    activity_lines = array("q")
+    problems: List[Tuple[int, str]] = []
+
+    for chunk in _chunks(records, chunk_size):
+        names = normalize_many([rec.get("name") if rec else None for _, rec in chunk])
+        for (line, rec), name in zip(chunk, names):
+            if rec is None:
+                problems.append((line, "Nie można odczytać rekordu."))
+                continue
+            try:
+                if _is_event(rec):
+                    eid = int(rec["id"])
+                    if eid in events or eid in net.events:
+                        problems.append((line, f"Zdarzenie o ID {eid} już istnieje."))
+                        continue
+                    events[eid] = Event(id=eid, name=name)
+                else:
+                    act = Activity(
+                        id=int(rec["id"]),
+                        name=name,
+                        duration=float(rec["duration"]),
+                        start_event=int(rec["start_event"]),
+                        end_event=int(rec["end_event"]),
+                        optimistic=_optional_float(rec.get("optimistic")),
+                        pessimistic=_optional_float(rec.get("pessimistic")),
+                        crash_duration=_optional_float(rec.get("crash_duration")),
+                        crash_cost=_optional_float(rec.get("crash_cost")) or 0.0,
+                    )
+                    if act.id in activities or act.id in net.activities:
+                        problems.append((line, f"Czynność o ID {act.id} już istnieje."))
+                        continue
+                    activities[act.id] = act
+                    activity_lines.append(line)
+            except KeyError as e:
+                problems.append((line, f"Brak pola: {e.args[0]}"))
+            except (TypeError, ValueError) as e:
+                problems.append((line, f"Niepoprawna wartość: {e}"))
+
+    # walidacja po wczytaniu całego pliku
+    for act, line in zip(activities.values(), activity_lines):
+        if act.start_event not in events and act.start_event not in net.events:
+            problems.append((line, f"Brak zdarzenia początkowego: {act.start_event}"))
+        if act.end_event not in events and act.end_event not in net.events:
+            problems.append((line, f"Brak zdarzenia końcowego: {act.end_event}"))
+        if act.start_event == act.end_event:
+            problems.append((line, "Zdarzenie początkowe i końcowe czynności nie mogą być takie same."))
+
+    if problems:
+        problems.sort(key=lambda p: p[0])
+        raise LoadError(problems)
+
+    # cykle (łącznie z czynnościami już obecnymi w sieci) sprawdza add_batch(),
+    # który dołącza tylko nowe czynności – kolejność list outgoing/incoming
+    # istniejącej sieci zostaje bez zmian
+    try:
+        net.add_batch(events.values(), activities.values())
+    except NetworkValidationError as e:
+        lines = dict(zip(activities, activity_lines))
+        for cycle in e.report.cycles:
+            line = min((lines[a] for a in cycle.cycle_activities if a in lines), default=0)
+            problems.append((line, cycle.describe()))
+        if not problems:
+            raise
+        problems.sort(key=lambda p: p[0])
+        raise LoadError(problems) from None
+    return net
+
+
+def load_csv(path: str, net: Optional[CPMNetwork] = None, delimiter: str = ",",
+             encoding: str = "utf-8", chunk_size: int = DEFAULT_CHUNK_SIZE) -> CPMNetwork:
+    """Wczytuje projekt z pliku CSV (zob. opis modułu)."""
+    return load_records(iter_csv_records(path, delimiter, encoding), net, chunk_size)
+
+
+def load_jsonl(path: str, net: Optional[CPMNetwork] = None, encoding: str = "utf-8",
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> CPMNetwork:
+    """Wczytuje projekt z pliku JSON Lines (zob. opis modułu)."""
+    return load_records(iter_jsonl_records(path, encoding), net, chunk_size)
+
+
+def load_file(path: str, net: Optional[CPMNetwork] = None, **kwargs) -> CPMNetwork:
+    """Wybiera format po rozszerzeniu: .csv albo .jsonl/.ndjson (także .gz)."""
+    name = str(path).lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".csv"):
+        return load_csv(path, net, **kwargs)
+    if name.endswith((".jsonl", ".ndjson")):
+        return load_jsonl(path, net, **kwargs)
+    raise ValueError(f"Nieobsługiwany format pliku: {path}")
@@ -0,0 +1,240 @@
+"""
+Test obciążenia lokalnej usługi CPM (cpm_service).
+
+Wczytuje do usługi sieć z generatora cpm_bench, a potem przez zadany czas
+wiele klientów (osobne połączenia, każdy z kilkoma żądaniami w locie) wysyła
+losową mieszankę żądań:
+- summary – pełne podsumowanie (po edycji liczone od nowa, potem z pamięci podręcznej),
+- what_if – czasy kilku czynności z niewielkiej puli wariantów (powtarzalne zapytania),
+- edit    – set_duration losowej czynności (nowa wersja sieci).
+
+Wynik: liczba żądań na sekundę, opóźnienia (średnia, p50, p95, p99, max)
+dla każdej operacji oraz liczniki usługi (trafienia, połączone żądania,
+obliczenia). Odpowiedzi nie są dekodowane (ServiceClient raw=True), więc
+klient nie ogranicza wyniku pomiaru.
+
+Uruchomienie:
+    python cpm_loadtest.py --spawn                  (usługa w osobnym procesie)
+    python cpm_loadtest.py --port 8765 --clients 32 --seconds 20 --mix summary=8,what_if=3,edit=1
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from cpm_bench import TOPOLOGIES, generate
+from cpm_service import DEFAULT_HOST, DEFAULT_PORT, ServiceClient
+
+NETWORK = "loadtest"
+WHAT_IF_VARIANTS = 16       # ile różnych zapytań what-if losujemy
+SPAWN_TIMEOUT = 30.0        # --spawn: czas na start usługi (s)
+DEFAULT_MIX = "summary=8,what_if=3,edit=1"
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """"summary=8,edit=1" -> {"summary": 8, "edit": 1}."""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        op, _, weight = part.partition("=")
+        op = op.strip()
+        if op not in ("summary", "what_if", "edit"):
+            raise ValueError(f"Nieznana operacja w mieszance: {op}")
+        mix[op] = int(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mieszanka żądań jest pusta.")
+    return mix
+
+
+def network_records(topology: str, n: int, seed: int = 0) -> List[Dict]:
+    """Rekordy (format cpm_io) sieci z generatora cpm_bench."""
+    n_events, arcs = generate(topology, n, seed)
+    records = [{"type": "event", "id": eid} for eid in range(n_events)]
+    records.extend({"type": "activity", "id": aid, "duration": duration,
+                    "start_event": start, "end_event": end}
+                   for aid, start, end, duration in arcs)
+    return records
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def run_load(host: str, port: int, clients: int = 16, seconds: float = 10.0,
+                   inflight: int = 4, mix: Optional[Dict[str, int]] = None,
+                   topology: str = "sparse", size: int = 1000, seed: int = 0) -> Dict:
+    """Wykonuje test i zwraca raport (słownik)."""
+    mix = mix or parse_mix(DEFAULT_MIX)
+    setup = await ServiceClient.connect(host, port)
+    try:
+        info = await setup.call("load", network=NETWORK, replace=True,
+                                records=network_records(topology, size, seed))
+    finally:
+        await setup.close()
+
+    activity_ids = list(range(info["activities"]))
+    rng = random.Random(seed)
+    variants = [{str(aid): round(rng.uniform(1, 20), 1) for aid in rng.sample(activity_ids, 3)}
+                for _ in range(WHAT_IF_VARIANTS)] if activity_ids else [{}]
+    ops, weights = list(mix), list(mix.values())
+    latencies: Dict[str, List[float]] = {op: [] for op in ops}
+    errors: List[str] = []
+    deadline = time.perf_counter() + seconds
+
+    async def worker(client: ServiceClient, rng: random.Random):
+        while time.perf_counter() < deadline:
+            op = rng.choices(ops, weights)[0]
+            if op == "summary":
+                params = {}
+            elif op == "what_if":
+                params = {"durations": rng.choice(variants), "brief": True}
+            else:
+                op_params = {"op": "set_duration", "id": rng.choice(activity_ids),
+                             "duration": round(rng.uniform(1, 20), 1)}
+                params = {"ops": [op_params]}
+            start = time.perf_counter()
+            try:
+                await client.call(op, network=NETWORK, **params)
+            except (RuntimeError, ConnectionError) as e:
+                errors.append(str(e))
+                if isinstance(e, ConnectionError):
+                    return
+            else:
+                latencies[op].append(time.perf_counter() - start)
+
+    connections = [await ServiceClient.connect(host, port, raw=True) for _ in range(clients)]
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(c, random.Random(f"{seed}:{i}:{j}"))
+                               for i, c in enumerate(connections) for j in range(inflight)))
+    finally:
+        elapsed = time.perf_counter() - started
+        for c in connections:
+            await c.close()
+    stats_client = await ServiceClient.connect(host, port)
+    try:
+        stats = await stats_client.call("stats")
+    finally:
+        await stats_client.close()
+
+    report = {"clients": clients, "inflight": inflight, "seconds": round(elapsed, 3),
+              "network": {"topology": topology, "activities": info["activities"],
+                          "events": info["events"]},
+              "requests": sum(len(v) for v in latencies.values()) + len(errors),
+              "errors": len(errors), "operations": {}, "service": stats}
+    report["requests_per_second"] = round(report["requests"] / elapsed, 1) if elapsed else 0.0
+    for op, values in latencies.items():
+        values.sort()
+        report["operations"][op] = {
+            "count": len(values),
+            "mean_ms": round(1000 * statistics.fmean(values), 3) if values else 0.0,
+            "p50_ms": round(1000 * _percentile(values, 0.50), 3),
+            "p95_ms": round(1000 * _percentile(values, 0.95), 3),
+            "p99_ms": round(1000 * _percentile(values, 0.99), 3),
+            "max_ms": round(1000 * values[-1], 3) if values else 0.0,
+        }
+    if errors:
+        report["first_error"] = errors[0]
+    return report
+
+
+def print_report(report: Dict):
+    net = report["network"]
+    print(f"Sieć: {net['topology']}, {net['activities']} czynności; klienci: {report['clients']} "
+          f"x {report['inflight']} w locie; czas: {report['seconds']} s")
+    print(f"Żądania: {report['requests']} ({report['requests_per_second']}/s), "
+          f"błędy: {report['errors']}")
+    print(f"{'operacja':>9} {'liczba':>8} {'śr. ms':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for op, r in report["operations"].items():
+        print(f"{op:>9} {r['count']:>8} {r['mean_ms']:>9.2f} {r['p50_ms']:>9.2f} "
+              f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['max_ms']:>9.2f}")
+    s = report["service"]
+    print(f"Usługa: obliczenia {s.get('computations', 0)}, trafienia {s.get('cache_hits', 0)}, "
+          f"połączone {s.get('coalesced', 0)}")
+    if "first_error" in report:
+        print(f"Pierwszy błąd: {report['first_error']}")
+
+
+async def _wait_for_service(host: str, port: int, process: subprocess.Popen):
+    deadline = time.perf_counter() + SPAWN_TIMEOUT
+    while True:
+        try:
+            client = await ServiceClient.connect(host, port)
+        except OSError:
+            if process.poll() is not None or time.perf_counter() > deadline:
+                raise ConnectionError("usługa nie wystartowała") from None
+            await asyncio.sleep(0.1)
+        else:
+            await client.close()
+            return
+
+
+async def _main(args) -> Dict:
+    process = None
+    if args.spawn:
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                "cpm_service.py"),
+                   "--host", args.host, "--port", str(args.port)]
+        if args.workers:
+            command += ["--workers", str(args.workers)]
+        if args.threads:
+            command.append("--threads")
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if process is not None:
+            await _wait_for_service(args.host, args.port, process)
+        return await run_load(args.host, args.port, args.clients, args.seconds, args.inflight,
+                              parse_mix(args.mix), args.topology, args.size, args.seed)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Test obciążenia usługi CPM (cpm_service).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--spawn", action="store_true",
+                        help="uruchom usługę (cpm_service.py) w osobnym procesie na czas testu")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="--spawn: liczba procesów")
+    parser.add_argument("--threads", action="store_true", help="--spawn: pula wątków")
+    parser.add_argument("--clients", type=int, default=16, help="liczba połączeń")
+    parser.add_argument("--inflight", type=int, default=4, help="żądania w locie na połączenie")
+    parser.add_argument("--seconds", type=float, default=10.0, help="czas testu")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="wagi operacji, np. summary=8,edit=1")
+    parser.add_argument("--topology", default="sparse", choices=list(TOPOLOGIES))
+    parser.add_argument("--size", type=int, default=1000, help="liczba czynności sieci")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PLIK", help="zapisz raport do pliku JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        report = asyncio.run(_main(args))
+    except ConnectionError as e:
+        print(f"Brak połączenia z usługą {args.host}:{args.port}: {e}", file=sys.stderr)
+        return 2
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+    return 0 if report["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Pomiary etapów obliczeń CPM.
+
+Obiekt ComputeMetrics podpięty do sieci (net.metrics = ComputeMetrics())
+dostaje od compute(), critical_path() i project_summary() jeden rekord na
+każdy wykonany etap: czas, liczbę odwiedzonych zdarzeń (nodes) i czynności
+(edges) oraz – przy track_allocations=True – przyrost i szczyt pamięci
+z tracemalloc. Zliczane są też trafienia i chybienia pamięci podręcznej
+sieci, co pokazuje, ile pracy project_summary() faktycznie powtarza.
+
+Bez podpiętego obiektu (net.metrics = None, domyślnie) koszt to jedno
+porównanie z None na etap. Słuchacze (add_listener) dostają każdy rekord
+od razu; wyniki eksportuje to_dict() / to_json().
+
+Przykład:
+    net.metrics = ComputeMetrics()
+    net.project_summary()
+    print(net.metrics.to_json())
+"""
+from __future__ import annotations
+import collections
+import json
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+MAX_RECORDS = 1000      # ile ostatnich rekordów przechowywać
+
+
+@dataclass
+class PhaseRecord:
+    """Jedno wykonanie etapu.
+
+    - phase: nazwa etapu (topological_order, forward, backward, floats,
+      critical_path, summary; w trybie przyrostowym z przedrostkiem incremental_)
+    - seconds: czas wykonania
+    - nodes, edges: liczba odwiedzonych zdarzeń i czynności
+    - alloc_bytes, peak_bytes: przyrost i szczyt pamięci w etapie (None bez
+      track_allocations)
+    """
+    phase: str
+    seconds: float
+    nodes: int = 0
+    edges: int = 0
+    alloc_bytes: Optional[int] = None
+    peak_bytes: Optional[int] = None
+
+
+class ComputeMetrics:
+    """Zbiera rekordy etapów i sumy dla każdego etapu."""
+
+    def __init__(self, track_allocations: bool = False, max_records: int = MAX_RECORDS):
+        self.track_allocations = track_allocations
+        self.records: Deque[PhaseRecord] = collections.deque(maxlen=max_records)
+        self.totals: Dict[str, Dict[str, float]] = {}
+        self.cache_hits: Dict[str, int] = collections.Counter()
+        self.cache_misses: Dict[str, int] = collections.Counter()
+        self._listeners: List[Callable[[PhaseRecord], None]] = []
+        self._own_tracing = False
+        # szczyt pamięci na każdym poziomie zagnieżdżenia etapów sprzed
+        # ostatniego reset_peak() (reset w etapie wewnętrznym kasuje szczyt
+        # zewnętrznego, więc jest tu przechowywany i doliczany w stop())
+        self._peaks: List[int] = []
+
+    def add_listener(self, callback: Callable[[PhaseRecord], None]):
+        """callback(rekord) wywoływany po każdym etapie."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[PhaseRecord], None]):
+        self._listeners.remove(callback)
+
+    def reset(self):
+        self.records.clear()
+        self.totals.clear()
+        self.cache_hits.clear()
+        self.cache_misses.clear()
+        self._peaks.clear()
+
+    def close(self):
+        """Zatrzymuje tracemalloc, jeśli został uruchomiony przez ten obiekt."""
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+
+    # -------------------------
+    # Wywoływane przez CPMNetwork
+    # -------------------------
+    def start(self) -> Tuple[float, int, int]:
+        """Znacznik początku etapu (przekazywany do stop())."""
+        memory = 0
+        depth = len(self._peaks)
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._own_tracing = True
+            memory, top = tracemalloc.get_traced_memory()
+            if depth:
+                self._peaks[-1] = max(self._peaks[-1], top)
+            self._peaks.append(0)
+            tracemalloc.reset_peak()
+        return time.perf_counter(), memory, depth
+
+    def stop(self, mark: Tuple[float, int, int], phase: str, nodes: int = 0, edges: int = 0):
+        seconds = time.perf_counter() - mark[0]
+        alloc = peak = None
+        depth = mark[2]
+        if self.track_allocations and tracemalloc.is_tracing():
+            current, top = tracemalloc.get_traced_memory()
+            # szczyty zapisane na tym poziomie i głębiej (także etapów
+            # przerwanych wyjątkiem, bez stop()) należą do tego etapu
+            top = max([top, *self._peaks[depth:]])
+            del self._peaks[depth:]
+            if depth:
+                self._peaks[-1] = max(self._peaks[-1], top)
+            alloc, peak = current - mark[1], top - mark[1]
+
+        record = PhaseRecord(phase, seconds, nodes, edges, alloc, peak)
+        self.records.append(record)
+
+        total = self.totals.get(phase)
+        if total is None:
+            total = self.totals[phase] = {"calls": 0, "seconds": 0.0, "nodes": 0, "edges": 0,
+                                          "max_peak_bytes": None}
+        total["calls"] += 1
+        total["seconds"] += seconds
+        total["nodes"] += nodes
+        total["edges"] += edges
+        if peak is not None:
+            total["max_peak_bytes"] = max(peak, total["max_peak_bytes"] or 0)
+        for callback in self._listeners:
+            callback(record)
+
+    def cache_event(self, name: str, hit: bool):
+        if hit:
+            self.cache_hits[name] += 1
+        else:
+            self.cache_misses[name] += 1
+
+    # -------------------------
+    # Eksport
+    # -------------------------
+    def summary_rows(self) -> List[Dict]:
+        """Wiersze sum etapów (np. do tabeli), od najdłuższego."""
+        rows = []
+        # kopie – rekordy mogą dochodzić z wątku obliczeń (cpm_worker)
+        for phase, total in list(self.totals.items()):
+            calls = total["calls"]
+            rows.append({"phase": phase, "calls": calls,
+                         "seconds": round(total["seconds"], 6),
+                         "avg_ms": round(1000 * total["seconds"] / calls, 3),
+                         "nodes": total["nodes"], "edges": total["edges"],
+                         "max_peak_bytes": total["max_peak_bytes"]})
+        rows.sort(key=lambda r: -r["seconds"])
+        return rows
+
+    def to_dict(self) -> Dict:
+        return {
+            "phases": self.summary_rows(),
+            "cache": {"hits": dict(self.cache_hits), "misses": dict(self.cache_misses)},
+            "records": [asdict(r) for r in list(self.records)],
+        }
+
+    def to_json(self, path: Optional[str] = None, indent: Optional[int] = 1) -> str:
+        """JSON z sumami, licznikami pamięci podręcznej i ostatnimi rekordami;
+        z path – zapisuje także do pliku."""
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
@@ -0,0 +1,217 @@
+"""
+Symulacja Monte Carlo (PERT) dla sieci CPM.
+
+Czas trwania czynności z polami optimistic/pessimistic jest losowy (rozkład
+beta-PERT albo trójkątny, z duration jako wartością modalną); dla wybranych
+czynności można podać dowolny własny sampler. Próbki losowane są macierzą
+(m czynności x S próbek), a czasy projektu liczone poziomami dla całej
+macierzy naraz (CompiledNetwork.forward_many/backward_many).
+
+Paczki próbek rozdzielane są na pulę procesów; każda paczka ma własne ziarno
+z SeedSequence, więc wynik zależy tylko od seed i batch_size, a nie od liczby
+procesów. Na systemach ze "spawn" (Windows/macOS) wywołanie simulate() musi
+być chronione przez if __name__ == "__main__".
+"""
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cpm_core import CPMNetwork
+from cpm_compiled import CompiledNetwork
+
+# sampler(rng, liczba_próbek) -> wektor czasów trwania
+Sampler = Callable[[np.random.Generator, int], np.ndarray]
+
+DEFAULT_QUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+
+# budżet pamięci jednej paczki próbek (bajty)
+_BATCH_BYTES = 128 * 2 ** 20
+
+
+# -------------------------
+#   MODEL CZASÓW TRWANIA
+# -------------------------
+@dataclass
+class DurationModel:
+    """Rozkłady czasów trwania (indeksy czynności jak w CompiledNetwork).
+
+    - low, mode, high: czas optymistyczny, najbardziej prawdopodobny, pesymistyczny
+    - method: "pert" (beta-PERT) albo "triangular"
+    - samplers: indeks czynności -> własny sampler (ma pierwszeństwo)
+    """
+    low: np.ndarray
+    mode: np.ndarray
+    high: np.ndarray
+    method: str = "pert"
+    samplers: Dict[int, Sampler] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.method not in ("pert", "triangular"):
+            raise ValueError(f"Nieznany rozkład: {self.method}")
+
+    @classmethod
+    def from_network(cls, net: CPMNetwork, compiled: CompiledNetwork, method: str = "pert",
+                     samplers: Optional[Dict[int, Sampler]] = None) -> "DurationModel":
+        """Odczytuje optimistic/duration/pessimistic czynności sieci.
+
+        samplers: ID czynności -> sampler.
+        """
+        acts = [net.activities[aid] for aid in compiled.activity_ids.tolist()]
+        m = len(acts)
+        mode = compiled.durations.copy()
+        low = np.fromiter((a.duration if a.optimistic is None else a.optimistic for a in acts),
+                          dtype=np.float64, count=m)
+        high = np.fromiter((a.duration if a.pessimistic is None else a.pessimistic for a in acts),
+                           dtype=np.float64, count=m)
+        by_index = {}
+        if samplers:
+            idx = compiled.activity_index(list(samplers))
+            by_index = {int(i): s for i, s in zip(idx, samplers.values())}
+        return cls(low=low, mode=mode, high=high, method=method, samplers=by_index)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """Losuje macierz czasów trwania (m, size) – kolumna to jedna próbka."""
+        out = np.repeat(self.mode[:, None], size, axis=1)
+        random_cols = np.flatnonzero(self.high > self.low)
+        if len(random_cols):
+            low = self.low[random_cols, None]
+            mode = self.mode[random_cols, None]
+            high = self.high[random_cols, None]
+            if self.method == "pert":
+                span = high - low
+                alpha = 1.0 + 4.0 * (mode - low) / span
+                beta = 1.0 + 4.0 * (high - mode) / span
+                out[random_cols] = low + span * rng.beta(alpha, beta, size=(len(random_cols), size))
+            else:
+                out[random_cols] = rng.triangular(low, mode, high, size=(len(random_cols), size))
+        for j, sampler in self.samplers.items():
+            values = np.asarray(sampler(rng, size), dtype=np.float64)
+            if values.shape != (size,) or np.any(values < 0):
+                raise ValueError("Sampler musi zwracać wektor nieujemnych czasów trwania.")
+            out[j] = values
+        return out
+
+
+# -------------------------
+#   WYNIKI SYMULACJI
+# -------------------------
+@dataclass
+class SimulationResult:
+    """Wyniki symulacji.
+
+    - durations: czasy trwania projektu we wszystkich próbkach
+    - activity_ids, criticality: ID czynności i odsetek próbek, w których
+      czynność była krytyczna (indeks krytyczności)
+    - deterministic_duration: czas projektu dla samych duration (CPM)
+    """
+    durations: np.ndarray
+    activity_ids: np.ndarray
+    criticality: np.ndarray
+    deterministic_duration: float
+
+    @property
+    def samples(self) -> int:
+        return len(self.durations)
+
+    @property
+    def mean(self) -> float:
+        return float(self.durations.mean())
+
+    @property
+    def std(self) -> float:
+        return float(self.durations.std())
+
+    def quantiles(self, qs: Sequence[float] = DEFAULT_QUANTILES) -> Dict[float, float]:
+        """Kwantyle czasu zakończenia projektu."""
+        values = np.quantile(self.durations, qs)
+        return {float(q): float(v) for q, v in zip(qs, values)}
+
+    def probability_of_completion(self, deadline: float) -> float:
+        """Prawdopodobieństwo zakończenia projektu do terminu deadline."""
+        return float(np.count_nonzero(self.durations <= deadline) / len(self.durations))
+
+    def criticality_index(self) -> Dict[int, float]:
+        """ID czynności -> indeks krytyczności."""
+        return dict(zip(self.activity_ids.tolist(), self.criticality.tolist()))
+
+
+# -------------------------
+#   SYMULACJA
+# -------------------------
+def _simulate_batch(compiled: CompiledNetwork, model: DurationModel,
+                    rng: np.random.Generator, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Czasy projektu i liczby "krytycznych" próbek dla każdej czynności."""
+    dur = model.sample(rng, size)
+    ev_es = compiled.forward_many(dur)
+    ev_lf = compiled.backward_many(dur, ev_es)
+    total_float = (ev_lf[compiled.end] - dur) - ev_es[compiled.start]
+    critical = np.abs(np.round(total_float, 6)) < 1e-9
+    return ev_es.max(axis=0), critical.sum(axis=1)
+
+
+_worker_state: Optional[Tuple[CompiledNetwork, DurationModel]] = None
+
+
+def _init_worker(compiled: CompiledNetwork, model: DurationModel):
+    global _worker_state
+    _worker_state = (compiled, model)
+
+
+def _run_batch(seed: np.random.SeedSequence, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    compiled, model = _worker_state
+    return _simulate_batch(compiled, model, np.random.default_rng(seed), size)
+
+
+def simulate(net: CPMNetwork, samples: int = 10_000, seed: Optional[int] = None,
+             method: str = "pert", samplers: Optional[Dict[int, Sampler]] = None,
+             workers: Optional[int] = None, batch_size: Optional[int] = None) -> SimulationResult:
+    """Symulacja Monte Carlo czasu trwania projektu.
+
+    - samples: liczba próbek
+    - seed: ziarno (ten sam seed i batch_size -> te same wyniki)
+    - method: "pert" albo "triangular"
+    - samplers: ID czynności -> własny sampler (funkcja z poziomu modułu,
+      aby dało się ją przesłać do procesów)
+    - workers: liczba procesów (domyślnie liczba rdzeni; 1 = bez puli)
+    - batch_size: liczba próbek w paczce (domyślnie wg budżetu pamięci)
+    """
+    if samples <= 0:
+        raise ValueError("Liczba próbek musi być dodatnia.")
+    if not net.events or not net.activities:
+        raise ValueError("Sieć nie zawiera zdarzeń lub czynności.")
+
+    compiled = CompiledNetwork.from_network(net)
+    compiled.topological_order()  # cykle zgłaszamy przed startem puli
+    model = DurationModel.from_network(net, compiled, method, samplers)
+
+    if batch_size is None:
+        row_bytes = 8 * (4 * compiled.n_activities + 3 * compiled.n_events)
+        batch_size = max(1, min(samples, _BATCH_BYTES // row_bytes))
+    sizes = [batch_size] * (samples // batch_size)
+    if samples % batch_size:
+        sizes.append(samples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = max(1, min(workers, len(sizes)))
+    if workers == 1:
+        _init_worker(compiled, model)
+        results = [_run_batch(s, n) for s, n in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(compiled, model)) as pool:
+            results = list(pool.map(_run_batch, seeds, sizes))
+
+    durations = np.concatenate([r[0] for r in results])
+    critical_counts = np.sum([r[1] for r in results], axis=0)
+    schedule = compiled.compute()
+    return SimulationResult(
+        durations=durations,
+        activity_ids=compiled.activity_ids,
+        criticality=critical_counts / samples,
+        deterministic_duration=schedule.project_duration,
+    )
@@ -0,0 +1,135 @@
+"""
+Wyliczanie najdłuższych i prawie krytycznych ścieżek sieci CPM.
+
+Ścieżka to ciąg czynności od zdarzenia bez poprzedników do zdarzenia bez
+następników. Ścieżki zwracane są leniwie, od najdłuższej, na podstawie
+wyników compute(): "ogon" zdarzenia (czas projektu - LF) to długość
+najdłuższej drogi od zdarzenia do końca, więc długość ścieżki częściowej
++ ogon jej ostatniego zdarzenia to dokładne oszacowanie najlepszego
+dokończenia.
+
+Każdy wpis kopca (ścieżka częściowa) po zdjęciu dokańczany jest zachłannie
+wzdłuż najlepszych czynności, a pominięte po drodze odgałęzienia trafiają
+do kopca jako nowe wpisy. Jedno zdjęcie = jedna kompletna ścieżka, więc
+koszt zależy od liczby zwróconych ścieżek, a nie od liczby wszystkich ścieżek
+w sieci. Odgałęzienia słabsze od progu zapasu nie trafiają do kopca, a przy
+limicie k kopiec przycinany jest do k wpisów.
+"""
+from __future__ import annotations
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cpm_core import CPMNetwork
+
+_EPS = 1e-9
+
+
+@dataclass
+class PathInfo:
+    """Ścieżka od początku do końca projektu.
+
+    - activities: ID czynności w kolejności wykonywania
+    - events: ID kolejnych zdarzeń (o jedno więcej niż czynności)
+    - length: długość ścieżki
+    - slack: czas projektu - długość (0 dla ścieżek krytycznych)
+    """
+    activities: List[int]
+    events: List[int]
+    length: float
+    slack: float
+
+    @property
+    def is_critical(self) -> bool:
+        return abs(self.slack) < _EPS
+
+
+# ścieżka częściowa jako lista wiązana: (ID czynności, poprzednik) albo None
+_Chain = Optional[Tuple[int, "_Chain"]]
+
+
+def _unwind(chain: _Chain) -> List[int]:
+    out = []
+    while chain is not None:
+        aid, chain = chain
+        out.append(aid)
+    out.reverse()
+    return out
+
+
+def iter_paths(net: CPMNetwork, max_slack: Optional[float] = None,
+               limit: Optional[int] = None) -> Iterator[PathInfo]:
+    """Ścieżki od najdłuższej; max_slack – tylko ścieżki o zapasie <= max_slack,
+    limit – najwyżej tyle ścieżek."""
+    if not net.events or not net.activities:
+        return
+    _, duration = net.critical_path()   # wywołuje compute() (z pamięci podręcznej)
+    tail = {eid: duration - ev.LF for eid, ev in net.events.items()}
+    bound = None if max_slack is None else duration - max_slack - 1e-6
+
+    # czynności wychodzące posortowane wg najlepszego dokończenia (malejąco)
+    ranked: Dict[int, List[Tuple[float, int, int]]] = {}
+
+    def choices(eid: int) -> List[Tuple[float, int, int]]:
+        if eid not in ranked:
+            items = []
+            for aid in net.outgoing.get(eid, ()):
+                act = net.activities[aid]
+                items.append((act.duration + tail[act.end_event], aid, act.end_event))
+            items.sort(key=lambda c: -c[0])
+            ranked[eid] = items
+        return ranked[eid]
+
+    counter = itertools.count()
+    # wpis: (-oszacowanie, nr, zdarzenie, długość dotąd, ścieżka częściowa, zdarzenie startowe)
+    heap = []
+    for eid in net.events:
+        if not net.incoming.get(eid) and net.outgoing.get(eid):
+            if bound is None or tail[eid] >= bound:
+                heap.append((-tail[eid], next(counter), eid, 0.0, None, eid))
+    heapq.heapify(heap)
+
+    produced = 0
+    while heap and (limit is None or produced < limit):
+        _, _, eid, length, chain, first = heapq.heappop(heap)
+        while True:
+            options = choices(eid)
+            if not options:
+                break
+            # odgałęzienia: ścieżka częściowa kończąca się pominiętą czynnością
+            for best, aid, end in options[1:]:
+                estimate = length + best
+                if bound is None or estimate >= bound:
+                    heapq.heappush(heap, (-estimate, next(counter), end,
+                                          length + net.activities[aid].duration, (aid, chain), first))
+            _, aid, end = options[0]
+            length += net.activities[aid].duration
+            chain = (aid, chain)
+            eid = end
+        activities = _unwind(chain)
+        events = [first] + [net.activities[a].end_event for a in activities]
+        produced += 1
+        yield PathInfo(activities=activities, events=events, length=length,
+                       slack=round(duration - length, 6))
+        if limit is not None and len(heap) > 2 * (limit - produced):
+            heap = heapq.nsmallest(limit - produced, heap)
+            heapq.heapify(heap)
+
+
+def k_longest_paths(net: CPMNetwork, k: int) -> List[PathInfo]:
+    """k najdłuższych ścieżek (malejąco wg długości)."""
+    if k <= 0:
+        return []
+    return list(iter_paths(net, limit=k))
+
+
+def near_critical_paths(net: CPMNetwork, max_slack: float,
+                        limit: Optional[int] = None) -> List[PathInfo]:
+    """Wszystkie ścieżki o zapasie <= max_slack (najwyżej limit)."""
+    return list(iter_paths(net, max_slack=max_slack, limit=limit))
+
+
+def critical_paths(net: CPMNetwork, limit: Optional[int] = None) -> List[PathInfo]:
+    """Równoległe ścieżki krytyczne jako osobne ciągi czynności."""
+    return near_critical_paths(net, 0.0, limit)
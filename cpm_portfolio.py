@@ -0,0 +1,409 @@
+"""
+Portfel powiązanych projektów CPM.
+
+Każdy projekt to osobna sieć CPMNetwork; projekty łączą się przez zdarzenia
+styku (interfejsy) – link("M1", ("A", 10), ("B", 1)) oznacza, że zdarzenie
+10 projektu A i zdarzenie 1 projektu B to ten sam moment. Wynik jest taki,
+jak dla jednej sieci powstałej ze sklejenia projektów w zdarzeniach styku,
+ale bez budowania i przeliczania tej sieci w całości:
+
+1. redukcja – każdy projekt sprowadzany jest do podsumowania brzegu
+   (ProjectBoundary): najdłuższe drogi między jego zdarzeniami styku, od
+   początku projektu do zdarzenia styku (head) i od zdarzenia styku do
+   końcowych zdarzeń projektu, które nie są stykami (tail), oraz najdłuższa
+   droga w projekcie. Redukcje projektów są niezależne – liczone w puli
+   procesów;
+2. sklejenie – przebieg w przód i wstecz po małym grafie zdarzeń styku daje
+   globalne ES/LF styków i czas całego portfela;
+3. terminy projektu – przebieg w przód i wstecz w jednym projekcie, z ES/LF
+   styków przypiętymi do wartości globalnych (też równolegle, na żądanie).
+
+Redukcja projektu zapamiętywana jest dla wersji jego sieci (net._version),
+więc po zmianie jednego projektu przeliczany jest tylko on, a potem tanie
+sklejenie.
+
+Przykład:
+    pf = Portfolio()
+    pf.add_project("A", net_a)
+    pf.add_project("B", net_b)
+    pf.link("M1", ("A", 10), ("B", 1))
+    duration = pf.compute()
+    pf.summary()["critical_path"]      # [(projekt, ID czynności), ...]
+"""
+from __future__ import annotations
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from cpm_core import CPMNetwork
+
+PARALLEL_MIN_ACTIVITIES = 20_000    # mniej czynności do przeliczenia – bez puli procesów
+_NEG = float("-inf")
+
+# zwarta kopia projektu dla procesu roboczego:
+# (ID zdarzeń, [(ID czynności, początek, koniec, czas)], ID zdarzeń styku)
+ProjectPayload = Tuple[List[int], List[Tuple[int, int, int, float]], List[int]]
+
+
+# -------------------------
+#   REDUKCJA PROJEKTU
+# -------------------------
+@dataclass
+class ProjectBoundary:
+    """Podsumowanie brzegu projektu (lokalne ID zdarzeń styku).
+
+    - head[v]: najdłuższa droga w projekcie kończąca się w v
+    - tail[u]: najdłuższa droga od u do końcowego zdarzenia projektu, które
+      nie jest stykiem (None – brak takiej drogi)
+    - dist[u][v]: najdłuższa droga u -> v w projekcie (tylko osiągalne v != u)
+    - longest: najdłuższa droga w całym projekcie
+    """
+    head: Dict[int, float]
+    tail: Dict[int, Optional[float]]
+    dist: Dict[int, Dict[int, float]]
+    longest: float
+
+
+def _topological(payload: ProjectPayload) -> Tuple[List[int], Dict[int, int], List[List[Tuple[int, float]]]]:
+    """(kolejność topologiczna, pozycja zdarzenia, łuki wychodzące wg pozycji)."""
+    event_ids, activities, _ = payload
+    in_deg = dict.fromkeys(event_ids, 0)
+    out: Dict[int, List[Tuple[int, float]]] = {eid: [] for eid in event_ids}
+    for _, start, end, duration in activities:
+        out[start].append((end, duration))
+        in_deg[end] += 1
+    queue = deque(eid for eid, d in in_deg.items() if d == 0)
+    order = []
+    while queue:
+        u = queue.popleft()
+        order.append(u)
+        for v, _ in out[u]:
+            in_deg[v] -= 1
+            if in_deg[v] == 0:
+                queue.append(v)
+    if len(order) != len(event_ids):
+        raise ValueError("Graf zdarzeń projektu zawiera cykle.")
+    pos = {eid: i for i, eid in enumerate(order)}
+    arcs = [[(pos[v], duration) for v, duration in out[eid]] for eid in order]
+    return order, pos, arcs
+
+
+def reduce_project(payload: ProjectPayload) -> ProjectBoundary:
+    """Redukcja projektu do podsumowania brzegu (wywoływana w procesie roboczym)."""
+    order, pos, arcs = _topological(payload)
+    interfaces = payload[2]
+    n = len(order)
+
+    # head: przebieg w przód z ES = 0 dla wszystkich zdarzeń
+    es = [0.0] * n
+    for i in range(n):
+        for j, duration in arcs[i]:
+            if es[i] + duration > es[j]:
+                es[j] = es[i] + duration
+    head = {eid: es[pos[eid]] for eid in interfaces}
+    longest = max(es, default=0.0)
+
+    # dist/tail: najdłuższe drogi z każdego zdarzenia styku
+    inner = {pos[eid] for eid in interfaces}
+    sinks = [i for i in range(n) if not arcs[i] and i not in inner]
+    dist: Dict[int, Dict[int, float]] = {}
+    tail: Dict[int, Optional[float]] = {}
+    for eid in interfaces:
+        start = pos[eid]
+        d = [_NEG] * n
+        d[start] = 0.0
+        for i in range(start, n):
+            if d[i] == _NEG:
+                continue
+            for j, duration in arcs[i]:
+                if d[i] + duration > d[j]:
+                    d[j] = d[i] + duration
+        dist[eid] = {order[i]: d[i] for i in inner if i != start and d[i] != _NEG}
+        reach = max((d[i] for i in sinks if i >= start), default=_NEG)
+        tail[eid] = None if reach == _NEG else reach
+    return ProjectBoundary(head, tail, dist, longest)
+
+
+def schedule_project(payload: ProjectPayload, es_pins: Dict[int, float],
+                     lf_pins: Dict[int, float], duration: float) -> Tuple[Dict, Dict]:
+    """Terminy projektu przy przypiętych ES/LF zdarzeń styku i czasie portfela.
+
+    Zwraca (zdarzenia, czynności): ID -> (ES, LF) oraz ID -> (ES, EF, LS, LF,
+    total_float, free_float, is_critical) – jak w CPMNetwork.compute()."""
+    order, pos, arcs = _topological(payload)
+    n = len(order)
+    es = [es_pins.get(eid, 0.0) for eid in order]
+    for i in range(n):
+        for j, d in arcs[i]:
+            if es[i] + d > es[j]:
+                es[j] = es[i] + d
+    lf = [lf_pins.get(eid, duration) for eid in order]
+    for i in range(n - 1, -1, -1):
+        for j, d in arcs[i]:
+            if lf[j] - d < lf[i]:
+                lf[i] = lf[j] - d
+
+    events = {eid: (es[i], lf[i]) for i, eid in enumerate(order)}
+    activities = {}
+    for aid, start, end, d in payload[1]:
+        a_es = es[pos[start]]
+        a_lf = lf[pos[end]]
+        a_ls = a_lf - d
+        total_float = round(a_ls - a_es, 6)
+        activities[aid] = (a_es, a_es + d, a_ls, a_lf, total_float,
+                           round(es[pos[end]] - (a_es + d), 6), abs(total_float) < 1e-9)
+    return events, activities
+
+
+# -------------------------
+#   PORTFEL
+# -------------------------
+class Portfolio:
+    """Projekty (CPMNetwork) połączone zdarzeniami styku.
+
+    - projects: nazwa -> sieć projektu (sieci można dalej edytować wprost)
+    - interfaces: ID styku -> lista (projekt, ID zdarzenia)
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 parallel_min_activities: int = PARALLEL_MIN_ACTIVITIES):
+        self.projects: Dict[str, CPMNetwork] = {}
+        self.interfaces: Dict[Hashable, List[Tuple[str, int]]] = {}
+        self.workers = workers
+        self.parallel_min_activities = parallel_min_activities
+        self._links: Dict[str, Dict[int, Hashable]] = {}       # projekt -> {zdarzenie: styk}
+        self._links_version: Dict[str, int] = {}
+        self._boundaries: Dict[str, Tuple[Tuple[int, int], ProjectBoundary]] = {}
+        self._pool: Optional[Executor] = None
+        self._result: Optional[Dict] = None
+        self._result_key = None
+        self.last_compute: Dict = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # -------------------------
+    # Budowa portfela
+    # -------------------------
+    def add_project(self, name: str, net: CPMNetwork):
+        if name in self.projects:
+            raise KeyError(f"Projekt {name} już istnieje.")
+        self.projects[name] = net
+        self._links[name] = {}
+        self._links_version[name] = 0
+
+    def remove_project(self, name: str):
+        """Usuwa projekt razem ze stykami, do których należał."""
+        if name not in self.projects:
+            raise KeyError(f"Brak projektu {name}.")
+        for interface in set(self._links[name].values()):
+            self.unlink(interface)
+        del self.projects[name]
+        del self._links[name]
+        del self._links_version[name]
+        self._boundaries.pop(name, None)
+
+    def link(self, interface: Hashable, *members: Tuple[str, int]):
+        """Dołącza zdarzenia projektów (projekt, ID zdarzenia) do styku
+        o podanym ID (tworzy go, jeśli nie istnieje)."""
+        group = self.interfaces.get(interface, [])
+        seen = {project for project, _ in group}
+        for project, eid in members:
+            if project not in self.projects:
+                raise KeyError(f"Brak projektu {project}.")
+            if eid not in self.projects[project].events:
+                raise KeyError(f"Brak zdarzenia {eid} w projekcie {project}.")
+            owner = self._links[project].get(eid)
+            if owner == interface:
+                continue
+            if owner is not None:
+                raise ValueError(f"Zdarzenie {eid} projektu {project} należy już do styku {owner}.")
+            if project in seen:
+                raise ValueError(f"Projekt {project} ma już zdarzenie w styku {interface}.")
+            seen.add(project)
+
+        group = self.interfaces.setdefault(interface, [])
+        for project, eid in members:
+            if eid not in self._links[project]:
+                self._links[project][eid] = interface
+                self._links_version[project] += 1
+                group.append((project, eid))
+
+    def unlink(self, interface: Hashable):
+        """Usuwa styk (zdarzenia projektów przestają być połączone)."""
+        for project, eid in self.interfaces.pop(interface):
+            del self._links[project][eid]
+            self._links_version[project] += 1
+
+    def _interface_events(self, name: str) -> List[int]:
+        return list(self._links[name])
+
+    def _payload(self, name: str) -> ProjectPayload:
+        net = self.projects[name]
+        activities = [(a.id, a.start_event, a.end_event, a.duration) for a in net.activities.values()]
+        return list(net.events), activities, self._interface_events(name)
+
+    # -------------------------
+    # Redukcja i sklejenie
+    # -------------------------
+    def _map(self, fn, args: Sequence[tuple], activities: int) -> List:
+        """fn(*a) dla każdego a – w puli procesów, gdy zadań jest więcej niż
+        jedno, a czynności dość, by opłacił się transport do procesów."""
+        if len(args) < 2 or activities < self.parallel_min_activities:
+            return [fn(*a) for a in args]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return list(self._pool.map(fn, *zip(*args)))
+
+    def _reduce(self) -> Dict[str, ProjectBoundary]:
+        stale = []
+        for name, net in self.projects.items():
+            key = (net._version, self._links_version[name])
+            cached = self._boundaries.get(name)
+            if cached is None or cached[0] != key:
+                stale.append((name, key))
+        work = sum(len(self.projects[name].activities) for name, _ in stale)
+        try:
+            reduced = self._map(reduce_project, [(self._payload(name),) for name, _ in stale], work)
+        except ValueError as e:
+            raise ValueError(f"{e} (przeliczane projekty: {', '.join(n for n, _ in stale)})") from None
+        for (name, key), boundary in zip(stale, reduced):
+            self._boundaries[name] = (key, boundary)
+        self.last_compute["reduced"] = [name for name, _ in stale]
+        return {name: self._boundaries[name][1] for name in self.projects}
+
+    def compute(self) -> float:
+        """Przelicza zmienione projekty i skleja wyniki; zwraca czas portfela."""
+        start = time.perf_counter()
+        self.last_compute = {}
+        boundaries = self._reduce()
+        key = tuple((name, self._boundaries[name][0]) for name in self.projects)
+        if self._result is not None and self._result_key == key:
+            self.last_compute["seconds"] = time.perf_counter() - start
+            return self._result["duration"]
+
+        links = self._links
+        # graf styków: łuki z najdłuższych dróg wewnątrz projektów
+        es = {i: 0.0 for i in self.interfaces}
+        succ: Dict[Hashable, List[Tuple[Hashable, float]]] = {i: [] for i in self.interfaces}
+        in_deg = dict.fromkeys(self.interfaces, 0)
+        duration = max((b.longest for b in boundaries.values()), default=0.0)
+        for name, b in boundaries.items():
+            for eid, value in b.head.items():
+                i = links[name][eid]
+                es[i] = max(es[i], value)
+            for u, targets in b.dist.items():
+                iu = links[name][u]
+                for v, length in targets.items():
+                    iv = links[name][v]
+                    succ[iu].append((iv, length))
+                    in_deg[iv] += 1
+
+        queue = deque(i for i, d in in_deg.items() if d == 0)
+        order = []
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for v, length in succ[u]:
+                if es[u] + length > es[v]:
+                    es[v] = es[u] + length
+                in_deg[v] -= 1
+                if in_deg[v] == 0:
+                    queue.append(v)
+        if len(order) != len(self.interfaces):
+            cyclic = sorted(map(str, (i for i, d in in_deg.items() if d > 0)))
+            raise ValueError(f"Cykl między projektami przez styki: {', '.join(cyclic)}")
+
+        for name, b in boundaries.items():
+            for u, length in b.tail.items():
+                if length is not None:
+                    duration = max(duration, es[links[name][u]] + length)
+        duration = max([duration] + list(es.values()))
+
+        lf = dict.fromkeys(self.interfaces, duration)
+        for name, b in boundaries.items():
+            for u, length in b.tail.items():
+                if length is not None:
+                    i = links[name][u]
+                    lf[i] = min(lf[i], duration - length)
+        for u in reversed(order):
+            for v, length in succ[u]:
+                if lf[v] - length < lf[u]:
+                    lf[u] = lf[v] - length
+
+        self._result = {"duration": duration, "ES": es, "LF": lf, "schedules": {}}
+        self._result_key = key
+        self.last_compute["seconds"] = time.perf_counter() - start
+        return duration
+
+    # -------------------------
+    # Wyniki
+    # -------------------------
+    def interface_times(self) -> Dict[Hashable, Tuple[float, float]]:
+        """ID styku -> (ES, LF) w skali całego portfela."""
+        self.compute()
+        return {i: (self._result["ES"][i], self._result["LF"][i]) for i in self.interfaces}
+
+    def schedules(self, names: Optional[Sequence[str]] = None) -> Dict[str, Tuple[Dict, Dict]]:
+        """Terminy zdarzeń i czynności projektów (zob. schedule_project) w skali
+        portfela; liczone równolegle i zapamiętywane do następnej zmiany."""
+        self.compute()
+        result = self._result
+        cache = result["schedules"]
+        names = list(self.projects) if names is None else list(names)
+        missing = [name for name in names if name not in cache]
+        args = []
+        for name in missing:
+            pins = self._links[name]
+            args.append((self._payload(name),
+                         {eid: result["ES"][i] for eid, i in pins.items()},
+                         {eid: result["LF"][i] for eid, i in pins.items()},
+                         result["duration"]))
+        work = sum(len(self.projects[name].activities) for name in missing)
+        for name, schedule in zip(missing, self._map(schedule_project, args, work)):
+            cache[name] = schedule
+        return {name: cache[name] for name in names}
+
+    def summary(self) -> Dict:
+        """Czas portfela, ścieżka krytyczna [(projekt, ID czynności)] wg ES,
+        terminy styków oraz zdarzenia i czynności każdego projektu (pola jak
+        w CPMNetwork.project_summary())."""
+        duration = self.compute()
+        schedules = self.schedules()
+        critical = []
+        projects_out = {}
+        for name, (events, activities) in schedules.items():
+            net = self.projects[name]
+            events_out = [{"id": eid, "name": net.events[eid].name, "ES": events[eid][0],
+                           "LF": events[eid][1]} for eid in sorted(events)]
+            activities_out = []
+            for aid in sorted(activities):
+                a = net.activities[aid]
+                es, ef, ls, lf, tf, ff, crit = activities[aid]
+                activities_out.append({
+                    "id": aid, "name": a.name, "duration": a.duration,
+                    "start_event": a.start_event, "end_event": a.end_event,
+                    "ES": es, "EF": ef, "LS": ls, "LF": lf,
+                    "total_float": tf, "free_float": ff, "is_critical": crit,
+                })
+                if crit:
+                    critical.append((es, name, aid))
+            projects_out[name] = {"events": events_out, "activities": activities_out}
+        critical.sort(key=lambda c: c[0])
+        return {
+            "duration": duration,
+            "critical_path": [(name, aid) for _, name, aid in critical],
+            "interfaces": [{"id": i, "ES": es, "LF": lf}
+                           for i, (es, lf) in self.interface_times().items()],
+            "projects": projects_out,
+        }
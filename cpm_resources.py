@@ -0,0 +1,480 @@
+"""
+Harmonogram z ograniczonymi zasobami (RCPSP) na bazie wyników CPM.
+
+Czynności mają zapotrzebowanie Activity.resources, a sieć – dostępności
+CPMNetwork.resource_capacities. Harmonogram budowany jest schematem:
+- "serial": czynności w kolejności priorytetu, każda od najwcześniejszego
+  terminu zgodnego z poprzednikami i zasobami,
+- "parallel": krokowo w czasie – w każdej chwili decyzji uruchamiane są
+  gotowe czynności, na które wystarcza zasobów.
+
+Reguły priorytetu korzystają z wyników compute():
+- "min_slack": najmniejszy zapas całkowity (total_float), potem LS
+- "lst": najpóźniejszy termin rozpoczęcia (LS)
+- "lft": najpóźniejszy termin zakończenia (LF)
+- "grpw": największa waga pozycyjna – czas czynności plus czasy jej
+  bezpośrednich następników (potem LS)
+Najdłuższa ścieżka od czynności do końca projektu to czas projektu minus LS,
+więc reguła LPF szeregowałaby identycznie jak "lst" i nie ma osobnej nazwy.
+
+Gotowe czynności trzymane są w kopcu wg priorytetu, a zużycie każdego zasobu
+w profilu schodkowym (bloki posortowanych punktów zmian + bisect, z drzewem
+przedziałowym maksimów i minimów bloków – zob. ResourceProfile). W schemacie
+równoległym zablokowane czynności grupowane są wg zasobu i brakującej ilości,
+więc zwolnienie zasobu wraca tylko do grup, dla których go wystarcza.
+"""
+from __future__ import annotations
+import heapq
+import itertools
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cpm_core import CPMNetwork, Activity
+
+_EPS = 1e-9
+_INF = float("inf")
+PROFILE_BLOCK = 64        # docelowa liczba punktów zmian w bloku profilu
+
+# klucz(czynność, czas projektu, suma czasów czynności wychodzących ze zdarzenia)
+PRIORITY_RULES: Dict[str, Callable[[Activity, float, Dict[int, float]], Tuple]] = {
+    "min_slack": lambda a, pd, follow: (a.total_float, a.LS, a.id),
+    "lst": lambda a, pd, follow: (a.LS, a.total_float, a.id),
+    "lft": lambda a, pd, follow: (a.LF, a.LS, a.id),
+    "grpw": lambda a, pd, follow: (-(a.duration + follow.get(a.end_event, 0.0)), a.LS, a.id),
+}
+
+
+# -------------------------
+#   PROFIL ZUŻYCIA ZASOBU
+# -------------------------
+class ResourceProfile:
+    """Zużycie zasobu w czasie jako funkcja schodkowa: zużycie z punktu
+    zmiany obowiązuje do następnego punktu (po ostatnim – do końca).
+
+    Punkty zmian podzielone są na bloki po najwyżej 2 * PROFILE_BLOCK
+    (posortowane listy + bisect po pierwszych czasach bloków). Blok ma
+    wspólny dodatek (rezerwacja obejmująca cały blok to O(1)) oraz maksimum
+    i minimum zużycia, a nad blokami stoi drzewo przedziałowe tych wartości.
+    Szukanie startu przeskakuje w O(log n) po drzewie bloki wolne (maksimum
+    <= limit) i przeciążone w całości (minimum > limit), a blok mieszany
+    ocenia w O(1) z zapamiętanego dla progu opisu wolnych przerw (_fit);
+    odcinek po odcinku przegląda tylko blok, w którym okno może się zmieścić.
+    """
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self._heads: List[float] = [0.0]           # pierwszy czas każdego bloku
+        self._times: List[List[float]] = [[0.0]]   # punkty zmian w blokach
+        self._usage: List[List[float]] = [[0.0]]   # zużycie bez dodatku bloku
+        self._add: List[float] = [0.0]             # dodatek wspólny dla bloku
+        self._max: List[float] = [0.0]             # maksimum zużycia w bloku (z dodatkiem)
+        self._min: List[float] = [0.0]             # minimum zużycia w bloku (z dodatkiem)
+        self._fits: List[Dict[float, Tuple]] = [{}]  # próg -> _fit() bloku
+        self._rebuild_tree()
+
+    # -- drzewo przedziałowe nad blokami --
+    def _rebuild_tree(self):
+        n = len(self._heads)
+        size = 1
+        while size < n:
+            size *= 2
+        self._size = size
+        # liście bez bloku nigdy nie spełniają warunku wyszukiwania
+        self._tree_max = tree_max = [-_INF] * (2 * size)
+        self._tree_min = tree_min = [_INF] * (2 * size)
+        tree_max[size:size + n] = self._max
+        tree_min[size:size + n] = self._min
+        for i in range(size - 1, 0, -1):
+            a, c = tree_max[2 * i], tree_max[2 * i + 1]
+            tree_max[i] = a if a > c else c
+            a, c = tree_min[2 * i], tree_min[2 * i + 1]
+            tree_min[i] = a if a < c else c
+
+    def _update_tree(self, b: int):
+        tree_max, tree_min = self._tree_max, self._tree_min
+        i = b + self._size
+        tree_max[i] = self._max[b]
+        tree_min[i] = self._min[b]
+        i >>= 1
+        while i:
+            a, c = tree_max[2 * i], tree_max[2 * i + 1]
+            high = a if a > c else c
+            a, c = tree_min[2 * i], tree_min[2 * i + 1]
+            low = a if a < c else c
+            if tree_max[i] == high and tree_min[i] == low:
+                break             # wyżej też bez zmian
+            tree_max[i] = high
+            tree_min[i] = low
+            i >>= 1
+
+    def _next_block(self, b: int, limit: float, conflict: bool) -> int:
+        """Pierwszy blok >= b z odcinkiem o zużyciu > limit (conflict=True)
+        albo <= limit (conflict=False); -1, gdy takiego nie ma."""
+        if b >= len(self._heads):
+            return -1
+        if conflict:
+            tree = self._tree_max
+            hit = lambda v: v > limit
+        else:
+            tree = self._tree_min
+            hit = lambda v: v <= limit
+        size = self._size
+        i = b + size
+        while True:
+            if hit(tree[i]):
+                while i < size:
+                    i *= 2
+                    if not hit(tree[i]):
+                        i += 1
+                return i - size
+            while i & 1:          # prawe dziecko – w górę
+                i >>= 1
+            if not i:
+                return -1
+            i += 1
+
+    def _fit(self, b: int, threshold: float) -> Tuple[float, float, Optional[float]]:
+        """Dla progu zużycia (bez dodatku bloku): czas pierwszego przeciążonego
+        odcinka bloku, najdłuższa wolna przerwa między przeciążonymi odcinkami
+        i początek wolnego odcinka sięgającego końca bloku (None, gdy blok
+        kończy się przeciążeniem). Zapamiętywane do zmiany bloku; dodatek
+        wspólny dla bloku nie zmienia progu względem _usage."""
+        fits = self._fits[b]
+        fit = fits.get(threshold)
+        if fit is None:
+            first, longest, run = _INF, 0.0, None
+            for t, u in zip(self._times[b], self._usage[b]):
+                if u > threshold:
+                    if first == _INF:
+                        first = t
+                    elif run is not None and t - run > longest:
+                        longest = t - run
+                    run = None
+                elif run is None and first != _INF:
+                    run = t
+            if len(fits) >= 16:
+                fits.clear()
+            fit = fits[threshold] = (first, longest, run)
+        return fit
+
+    # -- operacje profilu --
+    def _locate(self, t: float) -> Tuple[int, int]:
+        """(blok, pozycja) odcinka zawierającego chwilę t >= 0."""
+        b = bisect_right(self._heads, t) - 1
+        return b, bisect_right(self._times[b], t) - 1
+
+    def _refresh(self, b: int):
+        row, add = self._usage[b], self._add[b]
+        self._max[b] = max(row) + add
+        self._min[b] = min(row) + add
+
+    def _split(self, t: float) -> Tuple[int, int]:
+        """Dodaje punkt zmiany t (zużycie jak w odcinku, który dzieli);
+        zwraca (blok, pozycja) punktu."""
+        b, i = self._locate(t)
+        times = self._times[b]
+        if times[i] == t:
+            return b, i
+        i += 1
+        times.insert(i, t)
+        usage = self._usage[b]
+        usage.insert(i, usage[i - 1])      # maksimum i minimum bloku bez zmian
+        self._fits[b] = {}
+        if len(times) > 2 * PROFILE_BLOCK:
+            self._times[b:b + 1] = [times[:PROFILE_BLOCK], times[PROFILE_BLOCK:]]
+            self._usage[b:b + 1] = [usage[:PROFILE_BLOCK], usage[PROFILE_BLOCK:]]
+            self._heads.insert(b + 1, times[PROFILE_BLOCK])
+            self._add.insert(b + 1, self._add[b])
+            self._max.insert(b + 1, 0.0)
+            self._min.insert(b + 1, 0.0)
+            self._fits.insert(b + 1, {})
+            self._refresh(b)
+            self._refresh(b + 1)
+            self._rebuild_tree()
+            if i >= PROFILE_BLOCK:
+                b, i = b + 1, i - PROFILE_BLOCK
+        return b, i
+
+    def earliest_start(self, t: float, duration: float, demand: float) -> float:
+        """Najwcześniejszy start >= t, przy którym zasobu wystarczy na cały czas."""
+        if demand <= 0 or duration <= 0:
+            return t
+        limit = self.capacity - demand + _EPS
+        heads, n_blocks = self._heads, len(self._heads)
+        b, i = self._locate(t)
+        end = t + duration
+        while True:
+            if self._max[b] <= limit:
+                # blok wolny w całości – skok do najbliższego bloku z konfliktem
+                b = self._next_block(b + 1, limit, True)
+                if b < 0 or heads[b] >= end:
+                    return t
+                i = 0
+                continue
+            if i == 0:
+                # od t do początku bloku zasobu wystarcza
+                if self._min[b] > limit:
+                    # blok przeciążony w całości – start nie wcześniej niż w bloku z wolnym odcinkiem
+                    b = self._next_block(b + 1, limit, False)
+                    if b < 0:
+                        raise ValueError("Zapotrzebowanie przekracza dostępność zasobu.")
+                    t = heads[b]
+                    end = t + duration
+                    continue
+                first, longest, run = self._fit(b, limit - self._add[b])
+                if first >= end:
+                    return t
+                if longest + _EPS * (1.0 + end) < duration:
+                    # w bloku zmieści się tylko start w wolnym odcinku na jego końcu
+                    # (zapas na zaokrąglenia – przypadek graniczny rozstrzyga przegląd odcinków)
+                    b += 1
+                    if run is not None:
+                        t = run
+                    elif b < n_blocks:
+                        t = heads[b]
+                    else:
+                        raise ValueError("Zapotrzebowanie przekracza dostępność zasobu.")
+                    end = t + duration
+                    if b == n_blocks or heads[b] >= end:
+                        return t
+                    continue
+            times, usage = self._times[b], self._usage[b]
+            threshold = limit - self._add[b]
+            n = len(times)
+            while i < n:
+                if times[i] >= end:
+                    return t
+                if usage[i] > threshold:
+                    # konflikt – start przesuwamy za przeciążony odcinek
+                    if i + 1 < n:
+                        t = times[i + 1]
+                    elif b + 1 < n_blocks:
+                        t = heads[b + 1]
+                    else:
+                        raise ValueError("Zapotrzebowanie przekracza dostępność zasobu.")
+                    end = t + duration
+                i += 1
+            b += 1
+            i = 0
+            if b == n_blocks or heads[b] >= end:
+                return t
+
+    def reserve(self, start: float, finish: float, demand: float):
+        if demand <= 0 or finish <= start:
+            return
+        n_blocks = len(self._heads)
+        b0, i0 = self._split(start)
+        b1, i1 = self._split(finish)
+        if len(self._heads) != n_blocks:
+            b0, i0 = self._locate(start)   # podział bloku przesunął start
+        for b in range(b0, b1 + 1):
+            row = self._usage[b]
+            low = i0 if b == b0 else 0
+            high = i1 if b == b1 else len(row)
+            if low == 0 and high == len(row):
+                self._add[b] += demand
+                self._max[b] += demand
+                self._min[b] += demand
+            elif low < high:
+                add, top, bottom = self._add[b], self._max[b], self._min[b]
+                part = row[low:high]
+                # zużycie tylko rośnie – minimum liczone od nowa, gdy było w zmienianym zakresie
+                lowest = min(part) + add <= bottom
+                part = row[low:high] = [u + demand for u in part]
+                self._fits[b] = {}
+                high = max(part) + add
+                if high > top:
+                    self._max[b] = high
+                if lowest:
+                    self._min[b] = min(row) + add
+                if high <= top and not lowest:
+                    continue      # maksimum i minimum bloku bez zmian
+            else:
+                continue
+            self._update_tree(b)
+
+    @property
+    def times(self) -> List[float]:
+        return [t for block in self._times for t in block]
+
+    @property
+    def usage(self) -> List[float]:
+        return [u + add for block, add in zip(self._usage, self._add) for u in block]
+
+    def steps(self) -> List[Tuple[float, float]]:
+        """Lista (czas, zużycie od tej chwili)."""
+        return list(zip(self.times, self.usage))
+
+
+# -------------------------
+#   WYNIK
+# -------------------------
+@dataclass
+class ResourceSchedule:
+    """Harmonogram zasobowy: terminy czynności i profile zużycia zasobów."""
+    start: Dict[int, float]
+    finish: Dict[int, float]
+    makespan: float
+    cpm_duration: float
+    rule: str
+    scheme: str
+    profiles: Dict[str, ResourceProfile] = field(default_factory=dict)
+
+    def delay(self, activity_id: int, net: CPMNetwork) -> float:
+        """Przesunięcie czynności względem ES z CPM."""
+        return self.start[activity_id] - net.activities[activity_id].ES
+
+    def usage(self, resource: str) -> List[Tuple[float, float]]:
+        return self.profiles[resource].steps()
+
+
+# -------------------------
+#   HARMONOGRAMOWANIE
+# -------------------------
+def schedule_resources(net: CPMNetwork, capacities: Optional[Dict[str, float]] = None,
+                       rule: str = "min_slack", scheme: str = "serial") -> ResourceSchedule:
+    """Buduje harmonogram z ograniczonymi zasobami.
+
+    capacities domyślnie pochodzi z net.resource_capacities; zasób bez podanej
+    dostępności traktowany jest jako nieograniczony.
+    """
+    if rule not in PRIORITY_RULES:
+        raise ValueError(f"Nieznana reguła priorytetu: {rule}")
+    if scheme not in ("serial", "parallel"):
+        raise ValueError(f"Nieznany schemat: {scheme}")
+    capacities = net.resource_capacities if capacities is None else capacities
+
+    cp, duration = net.critical_path()   # wywołuje compute() (z pamięci podręcznej)
+    profiles = {name: ResourceProfile(cap) for name, cap in capacities.items()}
+    for act in net.activities.values():
+        for name, amount in act.resources.items():
+            if name in profiles and amount > profiles[name].capacity + _EPS:
+                raise ValueError(f"Czynność {act.id} wymaga więcej zasobu {name}, niż jest dostępne.")
+
+    # zapotrzebowanie tylko na zasoby ograniczone
+    demands = {aid: [(r, q) for r, q in a.resources.items() if r in profiles and q > 0]
+               for aid, a in net.activities.items()}
+
+    # priorytet jako pozycja w posortowanej liście – kopce porównują liczby
+    key = PRIORITY_RULES[rule]
+    follow = {eid: sum(net.activities[aid].duration for aid in ids)
+              for eid, ids in net.outgoing.items()}
+    by_rank = sorted(net.activities, key=lambda aid: key(net.activities[aid], duration, follow))
+    rank = {aid: i for i, aid in enumerate(by_rank)}
+    # poprzedniki czynności = czynności wchodzące do jej zdarzenia początkowego
+    waiting = {aid: len(net.incoming.get(a.start_event, ())) for aid, a in net.activities.items()}
+    ready_at = {aid: 0.0 for aid in net.activities}
+    ready = [rank[aid] for aid, n in waiting.items() if n == 0]
+    heapq.heapify(ready)
+
+    start: Dict[int, float] = {}
+    finish: Dict[int, float] = {}
+
+    def release(act: Activity, t_finish: float):
+        for succ in net.outgoing.get(act.end_event, ()):
+            ready_at[succ] = max(ready_at[succ], t_finish)
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                heapq.heappush(ready, rank[succ])
+
+    if scheme == "serial":
+        while ready:
+            aid = by_rank[heapq.heappop(ready)]
+            act = net.activities[aid]
+            t = ready_at[aid]
+            moved = True
+            while moved:
+                moved = False
+                for r, q in demands[aid]:
+                    t_new = profiles[r].earliest_start(t, act.duration, q)
+                    if t_new > t:
+                        t, moved = t_new, True
+            for r, q in demands[aid]:
+                profiles[r].reserve(t, t + act.duration, q)
+            start[aid], finish[aid] = t, t + act.duration
+            release(act, finish[aid])
+    else:
+        # w schemacie równoległym zajętość od chwili t już tylko maleje,
+        # więc wystarczy bieżąca ilość wolnego zasobu
+        free = {r: p.capacity for r, p in profiles.items()}
+        running: List[Tuple[float, int]] = []   # (zakończenie, ID)
+        # czynności gotowe, którym brakuje q zasobu r: kopiec priorytetów
+        # blocked[r][q]. Grupa jest otwarta (jej czołówka w kopcu heads), póki
+        # wolnego r jest co najmniej q – zablokowane czynności nie są więc
+        # sprawdzane od nowa przy każdym zwolnieniu zasobu.
+        blocked: Dict[str, Dict[float, List[int]]] = {r: {} for r in profiles}
+        opened: Dict[Tuple[str, float], int] = {}   # otwarta grupa -> numer ważnego wpisu w heads
+        heads: List[Tuple[int, int, str, float]] = []   # (priorytet, numer, r, q)
+        serial_no = itertools.count()
+        n_blocked = 0
+        t = 0.0
+
+        def open_groups(r: str):
+            for q, group in blocked[r].items():
+                if group and (r, q) not in opened and q <= free[r] + _EPS:
+                    number = opened[r, q] = next(serial_no)
+                    heapq.heappush(heads, (group[0], number, r, q))
+
+        def close_groups(r: str):
+            for q in blocked[r]:
+                if q > free[r] + _EPS:
+                    opened.pop((r, q), None)
+
+        while ready or running or n_blocked:
+            # chwila decyzji: zwalniamy czynności zakończone do t
+            freed = set()
+            while running and running[0][0] <= t:
+                f, aid = heapq.heappop(running)
+                for r, q in demands[aid]:
+                    free[r] += q
+                    freed.add(r)
+                release(net.activities[aid], f)
+            for r in freed:
+                open_groups(r)
+            # kandydaci w kolejności priorytetu: nowe gotowe i czołówki otwartych grup
+            while ready or heads:
+                if heads and (not ready or heads[0][0] < ready[0]):
+                    prio, number, r, q = heapq.heappop(heads)
+                    if opened.get((r, q)) != number:
+                        continue      # wpis grupy zamkniętej w międzyczasie
+                    group = blocked[r][q]
+                    heapq.heappop(group)
+                    n_blocked -= 1
+                    if group:
+                        heapq.heappush(heads, (group[0], number, r, q))
+                    else:
+                        del opened[r, q]
+                else:
+                    prio = heapq.heappop(ready)
+                aid = by_rank[prio]
+                act = net.activities[aid]
+                blocker = None
+                for r, q in demands[aid]:
+                    if free[r] + _EPS < q:
+                        blocker = r, q
+                        break
+                if blocker is None:
+                    for r, q in demands[aid]:
+                        free[r] -= q
+                        close_groups(r)
+                        profiles[r].reserve(t, t + act.duration, q)
+                    start[aid], finish[aid] = t, t + act.duration
+                    heapq.heappush(running, (finish[aid], aid))
+                else:
+                    r, q = blocker
+                    heapq.heappush(blocked[r].setdefault(q, []), prio)
+                    n_blocked += 1
+            if running and running[0][0] <= t:
+                continue   # czynności zerowe – ponownie ta sama chwila
+            if not running:
+                if n_blocked or ready:
+                    raise ValueError("Nie można uszeregować czynności (zależności lub zasoby).")
+                break
+            t = running[0][0]
+
+    if len(start) != len(net.activities):
+        raise ValueError("Graf zdarzeń zawiera cykle lub jest niespójny.")
+    makespan = max(finish.values(), default=0.0)
+    return ResourceSchedule(start=start, finish=finish, makespan=makespan, cpm_duration=duration,
+                            rule=rule, scheme=scheme, profiles=profiles)
@@ -0,0 +1,122 @@
+"""
+Analiza "co jeśli" dla wielu wariantów czasów trwania naraz.
+
+ScenarioEngine kompiluje strukturę sieci raz (CompiledNetwork, wraz z
+kolejnością topologiczną i planem przebiegów), a następnie liczy całą
+macierz wariantów jednym wywołaniem: wiersz = scenariusz, kolumna = czynność
+(kolejność jak w net.activities). Sieć bazowa nie jest modyfikowana.
+
+Przykład – "czynności 12, 40 i 77 opóźnią się o 3 dni":
+    engine = ScenarioEngine(net)
+    res = engine.evaluate(engine.durations({12: 3, 40: 3, 77: 3}))
+    res.project_duration[0], res.critical_path(0)
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Sequence, Union
+
+import numpy as np
+
+from cpm_core import CPMNetwork
+from cpm_compiled import CompiledNetwork, round6
+
+
+# -------------------------
+#   WYNIKI SCENARIUSZY
+# -------------------------
+@dataclass
+class ScenarioResults:
+    """Wyniki dla S scenariuszy; macierze mają kształt (S, m).
+
+    - project_duration: czas projektu każdego scenariusza (S,)
+    - ES, LS, total_float, free_float, is_critical: wyniki czynności
+    """
+    activity_ids: np.ndarray
+    project_duration: np.ndarray
+    ES: np.ndarray
+    LS: np.ndarray
+    total_float: np.ndarray
+    free_float: np.ndarray
+    is_critical: np.ndarray
+    _crit_order: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.project_duration)
+
+    def critical_path(self, scenario: int) -> List[int]:
+        """ID czynności krytycznych scenariusza w kolejności jak
+        CPMNetwork.critical_path() (wg pozycji topologicznej zdarzenia początkowego)."""
+        order = self._crit_order
+        return self.activity_ids[order[self.is_critical[scenario, order]]].tolist()
+
+    def floats(self, scenario: int) -> Dict[int, float]:
+        """ID czynności -> zapas całkowity w danym scenariuszu."""
+        return dict(zip(self.activity_ids.tolist(), self.total_float[scenario].tolist()))
+
+
+# -------------------------
+#   SILNIK SCENARIUSZY
+# -------------------------
+class ScenarioEngine:
+    """Zamrożona struktura sieci do wielokrotnej oceny wariantów czasów."""
+
+    def __init__(self, net: CPMNetwork):
+        self.compiled = CompiledNetwork.from_network(net)
+        order, _ = self.compiled.topological_order()
+        pos = np.empty(self.compiled.n_events, dtype=np.int64)
+        pos[order] = np.arange(self.compiled.n_events)
+        self._crit_order = np.argsort(pos[self.compiled.start], kind="stable")
+
+    @property
+    def base_durations(self) -> np.ndarray:
+        """Czasy trwania sieci bazowej (kolejność net.activities)."""
+        return self.compiled.durations
+
+    def durations(self, *scenarios: Mapping[int, float], relative: bool = True) -> np.ndarray:
+        """Buduje macierz czasów (S, m) ze słowników ID czynności -> zmiana.
+
+        relative=True: wartości to przyrosty (np. +3 dni), False: nowe czasy.
+        """
+        matrix = np.repeat(self.base_durations[None, :], len(scenarios), axis=0)
+        for row, changes in enumerate(scenarios):
+            if not changes:
+                continue
+            idx = self.compiled.activity_index(list(changes))
+            values = np.fromiter(changes.values(), dtype=np.float64, count=len(changes))
+            matrix[row, idx] = matrix[row, idx] + values if relative else values
+        return matrix
+
+    def evaluate(self, durations: Union[np.ndarray, Sequence[Sequence[float]]]) -> ScenarioResults:
+        """Liczy wszystkie scenariusze naraz; durations ma kształt (S, m)."""
+        c = self.compiled
+        dur = np.asarray(durations, dtype=np.float64)
+        if dur.ndim != 2 or dur.shape[1] != c.n_activities:
+            raise ValueError(f"Oczekiwano macierzy (liczba scenariuszy, {c.n_activities}).")
+        if np.any(dur < 0) or np.isnan(dur).any():
+            raise ValueError("Czas trwania czynności nie może być ujemny.")
+        if c.n_events == 0 or c.n_activities == 0:
+            raise ValueError("Sieć nie zawiera zdarzeń lub czynności.")
+
+        dur_t = np.ascontiguousarray(dur.T)          # (m, S) – kolumna = scenariusz
+        ev_es = c.forward_many(dur_t)
+        ev_lf = c.backward_many(dur_t, ev_es)
+        es = ev_es[c.start]
+        ls = ev_lf[c.end] - dur_t
+        total_float = round6(ls - es)
+        free_float = round6(ev_es[c.end] - (es + dur_t))
+        return ScenarioResults(
+            activity_ids=c.activity_ids,
+            project_duration=ev_es.max(axis=0),
+            ES=es.T, LS=ls.T,
+            total_float=total_float.T,
+            free_float=free_float.T,
+            is_critical=(np.abs(total_float) < 1e-9).T,
+            _crit_order=self._crit_order,
+        )
+
+
+def what_if(net: CPMNetwork, scenarios: Sequence[Mapping[int, float]],
+            relative: bool = True) -> ScenarioResults:
+    """Skrót: ScenarioEngine(net).evaluate(...) dla listy słowników zmian."""
+    engine = ScenarioEngine(net)
+    return engine.evaluate(engine.durations(*scenarios, relative=relative))
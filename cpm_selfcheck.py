@@ -0,0 +1,268 @@
+"""
+Samosprawdzenie obliczeń CPM na losowych sieciach.
+
+check_incremental() wykonuje losowe sekwencje edycji (dodawanie/usuwanie
+zdarzeń i czynności, zmiany czasów trwania) na sieci w trybie przyrostowym
+i po każdej edycji porównuje wyniki z pełnym compute() na świeżej kopii.
+
+check_compaction() usuwa pojedynczo i paczkami większość czynności
+i zdarzeń (tabele sieci są wtedy kompaktowane) i porównuje wyniki, kolejność
+topologiczną i listy sąsiedztwa ze świeżą siecią o tej samej strukturze.
+
+check_compiled() usuwa z losowej sieci kilka czynności i porównuje kolejność
+topologiczną oraz ścieżkę krytyczną CompiledNetwork i CPMNetwork.copy()
+z CPMNetwork (wymaga NumPy).
+
+check_snapshot() zapisuje sieć z zasobami, danymi skracania, dostępnościami
+i kalendarzem do snapshotu i porównuje ją po odczycie z oryginałem.
+
+Uruchomienie: python cpm_selfcheck.py [liczba_ziaren]
+"""
+from __future__ import annotations
+import random
+import sys
+from typing import List, Tuple
+
+from cpm_core import CPMNetwork, Activity
+
+
+def _rebuild(net: CPMNetwork) -> CPMNetwork:
+    """Świeża kopia struktury sieci (ta sama kolejność zdarzeń i czynności)."""
+    ref = CPMNetwork()
+    for ev in net.events.values():
+        ref.add_event(ev.id, ev.name)
+    for a in net.activities.values():
+        ref.add_activity(Activity(id=a.id, name=a.name, duration=a.duration,
+                                  start_event=a.start_event, end_event=a.end_event))
+    return ref
+
+
+def _results(net: CPMNetwork) -> Tuple:
+    events = [(ev.id, ev.ES, ev.LF) for ev in net.events.values()]
+    acts = [(a.id, a.ES, a.EF, a.LS, a.LF, a.total_float, a.free_float, a.is_critical)
+            for a in net.activities.values()]
+    return events, acts, getattr(net, "_last_project_duration", None)
+
+
+def _random_duration(rng: random.Random) -> float:
+    return rng.choice([0.0, 1.0, 2.0, 0.1, 0.2, 0.5, round(rng.uniform(0, 10), 2)])
+
+
+def check_incremental(seed: int = 0, steps: int = 300, n_events: int = 15) -> int:
+    """Losowe edycje + porównanie z pełnym compute(). Zwraca liczbę sprawdzeń.
+
+    Czynności łączą zdarzenia zgodnie z ukrytym rankingiem, więc sieć pozostaje
+    acykliczna, ale nowe łuki mogą łamać kolejność zapamiętaną przez tryb
+    przyrostowy (sprawdzany jest też powrót do pełnego przeliczenia).
+    """
+    rng = random.Random(seed)
+    net = CPMNetwork()
+    net.set_incremental(True)
+    rank = {}
+    next_event, next_act = 1, 1
+
+    def add_event():
+        nonlocal next_event
+        eid = next_event
+        next_event += 1
+        rank[eid] = rng.random()
+        net.add_event(eid, f"E{eid}")
+
+    def add_activity():
+        nonlocal next_act
+        if len(net.events) < 2:
+            return
+        a, b = sorted(rng.sample(list(net.events), 2), key=rank.get)
+        net.add_activity(Activity(id=next_act, name=f"A{next_act}",
+                                  duration=_random_duration(rng), start_event=a, end_event=b))
+        next_act += 1
+
+    for _ in range(n_events):
+        add_event()
+    for _ in range(2 * n_events):
+        add_activity()
+
+    checks = 0
+    for step in range(steps):
+        op = rng.random()
+        if op < 0.35 and net.activities:
+            net.set_duration(rng.choice(list(net.activities)), _random_duration(rng))
+        elif op < 0.6:
+            add_activity()
+        elif op < 0.8 and net.activities:
+            net.remove_activity(rng.choice(list(net.activities)))
+        elif op < 0.9:
+            add_event()
+        else:
+            isolated = [e for e in net.events
+                        if not net.outgoing.get(e) and not net.incoming.get(e)]
+            if isolated:
+                net.remove_event(rng.choice(isolated))
+
+        # kilka edycji między obliczeniami, jak w edytorze planu
+        if rng.random() < 0.5:
+            continue
+        net.compute()
+        ref = _rebuild(net)
+        ref.compute()
+        if net.activities and _results(net) != _results(ref):
+            raise AssertionError(f"Rozbieżność wyników (ziarno {seed}, krok {step}).")
+        checks += 1
+    return checks
+
+
+def check_compaction(seed: int = 0, n_events: int = 100) -> int:
+    """Usuwanie większości sieci (z kompaktowaniem tabel) w trybie przyrostowym
+    vs świeża sieć o tej samej strukturze. Zwraca liczbę sprawdzeń."""
+    rng = random.Random(seed)
+    net = CPMNetwork()
+    net.set_incremental(True)
+    for eid in range(n_events):
+        net.add_event(eid, f"Z{eid}")
+    next_act = 0
+
+    def add_activity():
+        nonlocal next_act
+        # łuki od mniejszego ID do większego – sieć pozostaje acykliczna
+        a, b = sorted(rng.sample(list(net.events), 2))
+        net.add_activity(Activity(id=next_act, name=f"A{next_act}",
+                                  duration=float(rng.randint(0, 5)), start_event=a, end_event=b))
+        next_act += 1
+
+    for _ in range(3 * n_events):
+        add_activity()
+    net.compute()
+
+    checks = 0
+    while net.activities:
+        batch = rng.sample(list(net.activities), min(len(net.activities), rng.randint(1, 25)))
+        if rng.random() < 0.5:
+            net.remove_batch(batch)
+        else:
+            for aid in batch:
+                net.remove_activity(aid)
+        isolated = [e for e in net.events if e not in net.outgoing and e not in net.incoming]
+        if isolated and rng.random() < 0.5:
+            net.remove_batch(event_ids=isolated[:len(isolated) - 2])
+        if rng.random() < 0.3 and len(net.events) >= 2:
+            add_activity()
+
+        net.compute()
+        ref = _rebuild(net)
+        ref.compute()
+        if (net.activities and _results(net) != _results(ref)
+                or net._topological_order_events() != ref._topological_order_events()
+                or net.outgoing != ref.outgoing or net.incoming != ref.incoming):
+            raise AssertionError(f"Rozbieżność po usunięciach (ziarno {seed}, krok {checks}).")
+        checks += 1
+    return checks
+
+
+def check_compiled(seed: int = 0, n_events: int = 12, removals: int = 3) -> int:
+    """Kolejność topologiczna i ścieżka krytyczna po usunięciach: CPMNetwork
+    vs CompiledNetwork i CPMNetwork.copy(). Zwraca liczbę sprawdzeń."""
+    from cpm_compiled import CompiledNetwork
+
+    rng = random.Random(seed)
+    net = CPMNetwork()
+    for eid in range(n_events):
+        net.add_event(eid)
+    aid = 0
+    for _ in range(3 * n_events):
+        a, b = sorted(rng.sample(range(n_events), 2))
+        # całkowite czasy – częste remisy ścieżek krytycznych
+        net.add_activity(Activity(id=aid, name="", duration=float(rng.randint(0, 3)),
+                                  start_event=a, end_event=b))
+        aid += 1
+
+    checks = 0
+    for step in range(removals + 1):
+        if step:
+            net.remove_activity(rng.choice(list(net.activities)))
+        order = net._topological_order_events()
+        cp = net.critical_path()
+        compiled = CompiledNetwork.from_network(net)
+        compiled_order, _ = compiled.topological_order()
+        if compiled.event_ids[compiled_order].tolist() != order:
+            raise AssertionError(f"Kolejność CompiledNetwork różna (ziarno {seed}, krok {step}).")
+        if compiled.critical_path(compiled.compute()) != cp:
+            raise AssertionError(f"Ścieżka krytyczna CompiledNetwork różna (ziarno {seed}, krok {step}).")
+        dup = net.copy()
+        if dup._topological_order_events() != order or dup.critical_path() != cp:
+            raise AssertionError(f"Kopia sieci różna (ziarno {seed}, krok {step}).")
+        checks += 1
+    return checks
+
+
+def check_snapshot(seed: int = 0) -> int:
+    """Zapis i odczyt snapshotu: dane wejściowe, wyniki, kolejność list
+    sąsiedztwa, zasoby, dostępności i kalendarz. Zwraca liczbę sprawdzeń."""
+    import os
+    import tempfile
+    from cpm_calendar import ProjectCalendar, WorkCalendar
+    from cpm_snapshot import load_snapshot, save_snapshot
+
+    rng = random.Random(seed)
+    net = CPMNetwork()
+    for eid in range(10):
+        net.add_event(eid, f"Z{eid}")
+    for aid in range(30):
+        a, b = sorted(rng.sample(range(10), 2))
+        duration = float(rng.randint(1, 6))
+        act = Activity(id=aid, name=f"Ł{aid}", duration=duration, start_event=a, end_event=b,
+                       crash_duration=rng.choice([None, duration / 2]),
+                       crash_cost=float(rng.randint(0, 9)))
+        if rng.random() < 0.5:
+            act.resources = {rng.choice(["ekipa", "dźwig"]): float(rng.randint(1, 3))}
+        net.add_activity(act)
+    for _ in range(3):
+        net.remove_activity(rng.choice(list(net.activities)))
+    net.set_capacity("ekipa", 4.0)
+    net.calendar = ProjectCalendar("2026-03-02", WorkCalendar(holidays=["2026-03-04"]),
+                                   {"dźwig": WorkCalendar(workdays=[0, 2, 4], name="dźwig")})
+    net.compute()
+
+    def inputs(n: CPMNetwork) -> Tuple:
+        return ([(e.id, e.name) for e in n.events.values()],
+                [(a.id, a.name, a.duration, a.start_event, a.end_event, a.optimistic,
+                  a.pessimistic, dict(a.resources), a.crash_duration, a.crash_cost)
+                 for a in n.activities.values()],
+                n.outgoing, n.incoming, n.resource_capacities)
+
+    fd, path = tempfile.mkstemp(suffix=".cpmsnap")
+    os.close(fd)
+    try:
+        save_snapshot(net, path)
+        with load_snapshot(path) as view:
+            loaded = view.to_network()
+    finally:
+        os.remove(path)
+    if inputs(loaded) != inputs(net) or _results(loaded) != _results(net):
+        raise AssertionError(f"Snapshot zmienia sieć (ziarno {seed}).")
+    if loaded.calendar.to_dict() != net.calendar.to_dict():
+        raise AssertionError(f"Snapshot zmienia kalendarz (ziarno {seed}).")
+    if loaded.project_summary() != net.project_summary():
+        raise AssertionError(f"Snapshot zmienia podsumowanie (ziarno {seed}).")
+    return 1
+
+
+def main(argv: List[str]) -> int:
+    seeds = int(argv[1]) if len(argv) > 1 else 50
+    total = sum(check_incremental(seed) for seed in range(seeds))
+    print(f"OK: {total} porównań na {seeds} losowych sekwencjach edycji.")
+    total = sum(check_compaction(seed) for seed in range(seeds))
+    print(f"OK: {total} porównań po usunięciach z kompaktowaniem tabel.")
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Pominięto porównanie z CompiledNetwork (brak NumPy).")
+        return 0
+    total = sum(check_compiled(seed) for seed in range(4 * seeds))
+    print(f"OK: {total} porównań kolejności z CompiledNetwork i copy() po usunięciach.")
+    total = sum(check_snapshot(seed) for seed in range(seeds))
+    print(f"OK: {total} zapisów i odczytów snapshotu bez zmian sieci.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,478 @@
+"""
+Lokalna usługa obliczeń CPM (asyncio, localhost).
+
+Usługa trzyma nazwane sieci CPMNetwork w pamięci, więc narzędzia, które
+potrzebują wyników, nie muszą za każdym razem wczytywać i przeliczać tych
+samych projektów. Protokół: TCP, JSON Lines – jedno żądanie w linii:
+
+    {"id": 1, "op": "summary", "network": "projekt"}
+
+i jedna odpowiedź w linii (kolejność odpowiedzi może różnić się od kolejności
+żądań – wiąże je "id"):
+
+    {"id": 1, "ok": true, "result": {...}}
+    {"id": 1, "ok": false, "error": "KeyError: ..."}
+
+Operacje ("op"):
+- ping
+- load     – network, records (rekordy w formacie cpm_io) albo path (plik na
+             serwerze); replace=true zastępuje istniejącą sieć
+- drop     – network
+- list     – nazwy, rozmiary i wersje sieci
+- edit     – network, ops: lista operacji {"op": add_event | remove_event |
+             add_activity | remove_activity | set_duration, ...pola rekordu};
+             wykonywane po kolei, przy błędzie wcześniejsze zostają
+- summary  – network, brief (tylko czas projektu i ścieżka krytyczna)
+- what_if  – network, durations {id czynności: czas}, brief; sieć bez zmian
+- stats    – liczniki żądań, trafień pamięci podręcznej i obliczeń
+
+Żądania z jednego połączenia obsługiwane są współbieżnie. Edycje wykonuje
+pętla zdarzeń (są tanie), a obliczenia podsumowań – pula procesów (albo
+wątków) na zwartej kopii sieci zrobionej dla danej wersji. Wyniki (gotowy
+JSON) trzymane są w pamięci podręcznej LRU z kluczem (sieć, wersja, zapytanie
+what-if, brief); identyczne żądania w trakcie obliczeń czekają na to samo
+obliczenie zamiast uruchamiać własne.
+
+Uruchomienie:
+    python cpm_service.py --port 8765 --load projekt=dane/projekt.csv
+    python cpm_loadtest.py --port 8765          (test obciążenia)
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import os
+import re
+import signal
+import sys
+import time
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from cpm_core import CPMNetwork, Activity, NetworkPayload
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_SIZE = 256            # liczba zapamiętanych wyników (LRU)
+LINE_LIMIT = 256 * 2 ** 20  # maksymalna długość linii żądania (bajty)
+
+# początek każdej odpowiedzi – klient w trybie raw nie dekoduje całej linii
+_RESPONSE_HEAD = re.compile(rb'\{"id": (-?\d+|null), "ok": (true|false)')
+
+# -------------------------
+#   OBLICZENIA (pula procesów)
+# -------------------------
+class ComputeError(Exception):
+    """Błąd obliczeń w procesie roboczym; komunikat zawiera już typ błędu
+    (wyjątki modułów CPM nie zawsze dają się przesłać między procesami)."""
+
+
+def summary_json(payload: NetworkPayload, durations: Optional[Dict[int, float]] = None,
+                 brief: bool = False) -> Tuple[bool, str]:
+    """Odbudowuje sieć z payload, nakłada czasy what-if i zwraca (True,
+    podsumowanie jako JSON) – kodowanie też odbywa się w procesie roboczym –
+    albo (False, opis błędu)."""
+    try:
+        return True, _summary_json(payload, durations, brief)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+def _summary_json(payload: NetworkPayload, durations: Optional[Dict[int, float]], brief: bool) -> str:
+    net = CPMNetwork.from_payload(payload)
+    for aid, duration in (durations or {}).items():
+        net.set_duration(aid, duration)
+
+    if brief:
+        cp, duration = net.critical_path()
+        result = {"duration": duration, "critical_path": cp}
+    else:
+        result = net.project_summary()
+    return json.dumps(result, ensure_ascii=False)
+
+
+# -------------------------
+#   USŁUGA
+# -------------------------
+class _Entry:
+    """Sieć w pamięci usługi; uid odróżnia sieci o tej samej nazwie
+    wczytane ponownie (wersje zaczynają się wtedy od nowa)."""
+    __slots__ = ("net", "uid", "payload", "payload_version")
+
+    def __init__(self, net: CPMNetwork, uid: int):
+        self.net = net
+        self.uid = uid
+        self.payload: Optional[NetworkPayload] = None
+        self.payload_version = -1
+
+    @property
+    def version(self) -> int:
+        return self.net._version
+
+    def snapshot(self) -> NetworkPayload:
+        """Zwarta kopia bieżącej wersji (jedna na wersję)."""
+        if self.payload_version != self.version:
+            self.payload = self.net.payload()
+            self.payload_version = self.version
+        return self.payload
+
+
+class CPMService:
+    """Sieci w pamięci + pamięć podręczna wyników + pula obliczeń."""
+
+    def __init__(self, workers: Optional[int] = None, threads: bool = False,
+                 cache_size: int = CACHE_SIZE):
+        self.workers = workers
+        self.threads = threads
+        self.networks: Dict[str, _Entry] = {}
+        self.cache_size = cache_size
+        self._cache: "collections.OrderedDict[tuple, str]" = collections.OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._uids = itertools.count(1)
+        self._pool = self._new_pool()
+        self.counters: Dict[str, int] = collections.Counter()
+        self.started = time.time()
+        self._handlers = {
+            "ping": self.op_ping, "load": self.op_load, "drop": self.op_drop,
+            "list": self.op_list, "edit": self.op_edit, "summary": self.op_summary,
+            "what_if": self.op_what_if, "stats": self.op_stats,
+        }
+
+    def _new_pool(self) -> Executor:
+        return ThreadPoolExecutor(self.workers) if self.threads else ProcessPoolExecutor(self.workers)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, fn, *args) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        try:
+            return loop.run_in_executor(self._pool, fn, *args)
+        except BrokenExecutor:
+            # proces roboczy padł (np. brak pamięci) – nowa pula
+            self.counters["pool_restarts"] += 1
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+            return loop.run_in_executor(self._pool, fn, *args)
+
+    # -------------------------
+    # Obsługa żądań
+    # -------------------------
+    async def handle(self, request: Dict) -> Any:
+        """Wykonuje jedno żądanie; wynik: obiekt do JSON albo gotowy tekst JSON (RawJSON)."""
+        op = request.get("op")
+        handler = self._handlers.get(op)
+        if handler is None:
+            raise ValueError(f"Nieznana operacja: {op}")
+        self.counters["requests"] += 1
+        self.counters[f"op_{op}"] += 1
+        return await handler(request)
+
+    def _entry(self, request: Dict) -> _Entry:
+        name = request.get("network")
+        if name not in self.networks:
+            raise KeyError(f"Brak sieci: {name}")
+        return self.networks[name]
+
+    async def op_ping(self, request: Dict):
+        return "pong"
+
+    async def op_load(self, request: Dict):
+        from cpm_io import load_file, load_records
+
+        name = request.get("network")
+        if not isinstance(name, str) or not name:
+            raise ValueError("Wymagana nazwa sieci (network).")
+        if name in self.networks and not request.get("replace"):
+            raise KeyError(f"Sieć {name} już istnieje.")
+        loop = asyncio.get_running_loop()
+        if "path" in request:
+            net = await loop.run_in_executor(None, load_file, request["path"])
+        else:
+            records = list(enumerate(request.get("records") or (), start=1))
+            net = await loop.run_in_executor(None, load_records, records)
+        self.networks[name] = _Entry(net, next(self._uids))
+        return {"network": name, "events": len(net.events),
+                "activities": len(net.activities), "version": net._version}
+
+    async def op_drop(self, request: Dict):
+        entry = self._entry(request)
+        del self.networks[request["network"]]
+        return {"network": request["network"], "version": entry.version}
+
+    async def op_list(self, request: Dict):
+        return [{"network": name, "events": len(e.net.events),
+                 "activities": len(e.net.activities), "version": e.version}
+                for name, e in self.networks.items()]
+
+    async def op_edit(self, request: Dict):
+        entry = self._entry(request)
+        applied = 0
+        try:
+            for op in request.get("ops") or ():
+                _apply_edit(entry.net, op)
+                applied += 1
+        except (KeyError, ValueError, TypeError) as e:
+            raise type(e)(f"operacja {applied}: {e.args[0] if e.args else e}") from None
+        return {"network": request["network"], "applied": applied, "version": entry.version}
+
+    async def op_summary(self, request: Dict):
+        return await self._computed(self._entry(request), None, bool(request.get("brief")))
+
+    async def op_what_if(self, request: Dict):
+        entry = self._entry(request)
+        durations = {int(aid): float(d) for aid, d in (request.get("durations") or {}).items()}
+        for aid in durations:
+            if aid not in entry.net.activities:
+                raise KeyError(f"Brak czynności o ID {aid}.")
+        return await self._computed(entry, durations, bool(request.get("brief")))
+
+    async def op_stats(self, request: Dict):
+        return {"networks": len(self.networks), "cached": len(self._cache),
+                "inflight": len(self._inflight),
+                "uptime": round(time.time() - self.started, 3), **self.counters}
+
+    # -------------------------
+    # Pamięć podręczna i łączenie identycznych żądań
+    # -------------------------
+    async def _computed(self, entry: _Entry, durations: Optional[Dict[int, float]],
+                        brief: bool) -> "RawJSON":
+        what_if = tuple(sorted(durations.items())) if durations else ()
+        key = (entry.uid, entry.version, what_if, brief)
+
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return RawJSON(text)
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["computations"] += 1
+            future = self._submit(summary_json, entry.snapshot(), durations, brief)
+            self._inflight[key] = future
+            future.add_done_callback(lambda f, key=key: self._finished(key, f))
+        # shield – rozłączenie jednego klienta nie anuluje obliczenia pozostałym
+        ok, text = await asyncio.shield(future)
+        if not ok:
+            raise ComputeError(text)
+        return RawJSON(text)
+
+    def _finished(self, key: tuple, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None or not future.result()[0]:
+            return
+        self._cache[key] = future.result()[1]
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # -------------------------
+    # Serwer
+    # -------------------------
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._client, host, port, limit=LINE_LIMIT)
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError):    # za długa linia / zerwane połączenie
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            pass        # zamykanie usługi z otwartymi połączeniami
+        finally:
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Żądanie musi być obiektem JSON.")
+            request_id = request.get("id")
+            result = await self.handle(request)
+            head = json.dumps({"id": request_id, "ok": True})[:-1]
+            body = result.text if isinstance(result, RawJSON) else json.dumps(result, ensure_ascii=False)
+            data = f'{head}, "result": {body}}}\n'
+        except Exception as e:
+            self.counters["errors"] += 1
+            error = str(e) if isinstance(e, ComputeError) else f"{type(e).__name__}: {e}"
+            data = json.dumps({"id": request_id, "ok": False, "error": error},
+                              ensure_ascii=False) + "\n"
+        if not writer.is_closing():
+            writer.write(data.encode("utf-8"))
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+
+class RawJSON:
+    """Wynik już zakodowany jako JSON (wstawiany do odpowiedzi bez ponownego kodowania)."""
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _apply_edit(net: CPMNetwork, op: Dict):
+    kind = op.get("op")
+    if kind == "add_event":
+        net.add_event(int(op["id"]), str(op.get("name") or ""))
+    elif kind == "remove_event":
+        net.remove_event(int(op["id"]))
+    elif kind == "add_activity":
+        net.add_activity(Activity(
+            id=int(op["id"]), name=str(op.get("name") or ""), duration=float(op["duration"]),
+            start_event=int(op["start_event"]), end_event=int(op["end_event"]),
+            optimistic=None if op.get("optimistic") is None else float(op["optimistic"]),
+            pessimistic=None if op.get("pessimistic") is None else float(op["pessimistic"]),
+        ))
+    elif kind == "remove_activity":
+        net.remove_activity(int(op["id"]))
+    elif kind == "set_duration":
+        net.set_duration(int(op["id"]), float(op["duration"]))
+    else:
+        raise ValueError(f"Nieznana operacja edycji: {kind}")
+
+
+# -------------------------
+#   KLIENT
+# -------------------------
+class ServiceClient:
+    """Klient asyncio; wiele żądań może czekać naraz na jednym połączeniu.
+
+    Z raw=True call() zwraca nieodkodowaną linię odpowiedzi (bytes) – np. do
+    testów obciążenia, w których dekodowanie dużych podsumowań kosztowałoby
+    więcej niż ich obliczenie. Błędy usługi są dekodowane zawsze.
+
+    Przykład:
+        client = await ServiceClient.connect()
+        summary = await client.call("summary", network="projekt")
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 raw: bool = False):
+        self._reader = reader
+        self._writer = writer
+        self.raw = raw
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                      raw: bool = False) -> "ServiceClient":
+        reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer, raw)
+
+    async def call(self, op: str, **params) -> Any:
+        """Wysyła żądanie i zwraca wynik; błąd usługi zgłaszany jest jako RuntimeError."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps({"id": request_id, "op": op, **params}).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        response = await future
+        if isinstance(response, bytes):
+            return response
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error"))
+        return response.get("result")
+
+    async def _receive(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                head = _RESPONSE_HEAD.match(line) if self.raw else None
+                if head is not None and head.group(2) == b"true":
+                    request_id, response = json.loads(head.group(1)), line
+                else:
+                    response = json.loads(line)
+                    request_id = response.get("id")
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Połączenie z usługą zamknięte."))
+            self._pending.clear()
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._receiver.cancel()
+
+
+# -------------------------
+#   URUCHOMIENIE
+# -------------------------
+async def _main(args) -> int:
+    service = CPMService(workers=args.workers, threads=args.threads, cache_size=args.cache_size)
+    try:
+        for item in args.load:
+            name, sep, path = item.partition("=")
+            if not sep:
+                name, path = os.path.splitext(os.path.basename(item))[0], item
+            info = await service.handle({"op": "load", "network": name, "path": path})
+            print(f"Wczytano {name}: {info['events']} zdarzeń, {info['activities']} czynności",
+                  file=sys.stderr)
+        server = await service.serve(args.host, args.port)
+        print(f"Usługa CPM na {args.host}:{args.port}", file=sys.stderr)
+        loop = asyncio.get_running_loop()
+        serving = asyncio.current_task()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, serving.cancel)
+            except (NotImplementedError, RuntimeError):     # Windows
+                pass
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lokalna usługa obliczeń CPM (JSON Lines po TCP).")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="liczba procesów obliczeniowych (domyślnie liczba rdzeni)")
+    parser.add_argument("--threads", action="store_true", help="pula wątków zamiast procesów")
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE,
+                        help="liczba zapamiętanych wyników")
+    parser.add_argument("--load", action="append", default=[], metavar="NAZWA=PLIK",
+                        help="sieć wczytywana przy starcie (można powtarzać)")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
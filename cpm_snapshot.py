@@ -0,0 +1,336 @@
+"""
+Binarny zapis sieci CPM wraz z wynikami (snapshot) i odczyt przez mmap.
+
+Układ pliku (little-endian):
+- nagłówek: magic, wersja formatu, flagi, liczba zdarzeń i czynności,
+  czas projektu, liczba kolumn
+- katalog kolumn: nazwa, dtype NumPy, przesunięcie w pliku, liczba elementów
+- kolumny o stałej szerokości (wyrównane do 64 bajtów): ID, czasy trwania,
+  zdarzenia początkowe i końcowe czynności, dane skracania (crash_duration,
+  crash_cost), ES/EF/LS/LF, zapasy, ścieżka krytyczna; kolejność czynności
+  wyznacza kolejność list outgoing/incoming odtworzonej sieci
+- tablice napisów: nazwy w UTF-8 sklejone w jeden blok + przesunięcia
+- zasoby: nazwy zasobów jako tablica napisów, zapotrzebowanie
+  czynności w układzie CSR (resource_ptr / resource_index / resource_amount)
+  i dostępności sieci (capacity_index / capacity_amount)
+- kalendarz: ProjectCalendar.to_dict() jako JSON w UTF-8
+  (pusta kolumna = brak kalendarza)
+
+Odczytywane są tylko pliki w bieżącej wersji formatu (FORMAT_VERSION).
+
+SnapshotView mapuje plik w pamięć i udostępnia kolumny jako tablice NumPy
+tylko do odczytu – analiza wyników i wykres Gantta nie tworzą obiektów
+Event/Activity. Brak wyniku (None) zapisywany jest jako NaN.
+"""
+from __future__ import annotations
+import json
+import mmap
+import struct
+from array import array
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from cpm_core import CPMNetwork
+from cpm_compiled import CompiledNetwork, CompiledSchedule
+
+MAGIC = b"CPMSNAP\x00"
+FORMAT_VERSION = 3
+FLAG_RESULTS = 1
+
+_HEADER = struct.Struct("<8sIIQQdI")   # magic, wersja, flagi, n_events, n_activities, czas, n_kolumn
+_ENTRY = struct.Struct("<24s8sQQ")     # nazwa, dtype, przesunięcie, liczba elementów
+_ALIGN = 64
+
+
+def _live(table, column, dtype: str) -> np.ndarray:
+    """Kolumna tabeli sieci bez usuniętych wierszy (nowa tablica)."""
+    values = np.array(column).astype(dtype, copy=False)
+    if table.holes:
+        values = values[np.fromiter(table.alive(), dtype=bool, count=len(table.names))]
+    return values
+
+
+def _string_table(names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [n.encode("utf-8") for n in names]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    np.cumsum(np.fromiter(map(len, encoded), dtype="<i8", count=len(encoded)), out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype="u1")
+
+
+# -------------------------
+#   ZAPIS
+# -------------------------
+def save_snapshot(net: CPMNetwork, path: str, with_results: bool = True):
+    """Zapisuje sieć (i domyślnie aktualne wyniki compute()) do pliku – kolumny
+    brane są wprost z tabel sieci."""
+    events, acts = net.events, net.activities
+    n, m = len(events), len(acts)
+
+    flags = 0
+    duration = 0.0
+    critical_path: List[int] = []
+    if with_results and n and m:
+        critical_path, duration = net.critical_path()
+        flags |= FLAG_RESULTS
+
+    ev_name_off, ev_names = _string_table(list(events.live(events.names)))
+    act_name_off, act_names = _string_table(list(acts.live(acts.names)))
+
+    # zasoby: wspólna tablica nazw, zapotrzebowanie czynności jako CSR
+    demands = list(map(acts.resources.get, acts.live_rows(), repeat({})))
+    resource_ids: Dict[str, int] = {}
+    for demand in acts.resources.values():
+        for resource in demand:
+            resource_ids.setdefault(resource, len(resource_ids))
+    for resource in net.resource_capacities:
+        resource_ids.setdefault(resource, len(resource_ids))
+    res_name_off, res_names = _string_table(list(resource_ids))
+    res_ptr = np.zeros(m + 1, dtype="<i8")
+    np.cumsum(np.fromiter(map(len, demands), dtype="<i8", count=m), out=res_ptr[1:])
+    res_index = np.fromiter((resource_ids[r] for demand in demands for r in demand),
+                            dtype="<i8", count=int(res_ptr[-1]))
+    res_amount = np.fromiter((x for demand in demands for x in demand.values()),
+                             dtype="<f8", count=int(res_ptr[-1]))
+    # ID zdarzeń wg numeru wiersza tabeli (także usuniętych) – do zamiany
+    # wierszy zdarzeń czynności na ID
+    event_ids = np.array(events.ids, dtype="<i8")
+    capacities = net.resource_capacities
+    calendar = b"" if net.calendar is None else json.dumps(
+        net.calendar.to_dict(), ensure_ascii=False).encode("utf-8")
+    columns: List[Tuple[str, np.ndarray]] = [
+        ("event_id", _live(events, events.ids, "<i8")),
+        ("event_name_off", ev_name_off),
+        ("event_name_data", ev_names),
+        ("activity_id", _live(acts, acts.ids, "<i8")),
+        ("activity_name_off", act_name_off),
+        ("activity_name_data", act_names),
+        ("duration", _live(acts, acts.duration, "<f8")),
+        ("optimistic", _live(acts, acts.optimistic, "<f8")),
+        ("pessimistic", _live(acts, acts.pessimistic, "<f8")),
+        ("start_event", event_ids[_live(acts, acts.start, "<i8")]),
+        ("end_event", event_ids[_live(acts, acts.end, "<i8")]),
+        ("crash_duration", _live(acts, acts.crash_duration, "<f8")),
+        ("crash_cost", _live(acts, acts.crash_cost, "<f8")),
+        ("resource_name_off", res_name_off),
+        ("resource_name_data", res_names),
+        ("resource_ptr", res_ptr),
+        ("resource_index", res_index),
+        ("resource_amount", res_amount),
+        ("capacity_index", np.fromiter((resource_ids[r] for r in capacities), dtype="<i8",
+                                       count=len(capacities))),
+        ("capacity_amount", np.fromiter(capacities.values(), dtype="<f8", count=len(capacities))),
+        ("calendar_json", np.frombuffer(calendar, dtype="u1")),
+    ]
+    if flags & FLAG_RESULTS:
+        columns += [
+            ("event_ES", _live(events, events.ES, "<f8")),
+            ("event_LF", _live(events, events.LF, "<f8")),
+        ]
+        store = acts.results
+        columns += [(name, _live(acts, getattr(store, name), "<f8"))
+                    for name in ("ES", "EF", "LS", "LF", "total_float", "free_float")]
+        columns += [
+            ("is_critical", _live(acts, store.is_critical, "u1")),
+            ("critical_path", np.asarray(critical_path, dtype="<i8")),
+        ]
+
+    offset = _HEADER.size + _ENTRY.size * len(columns)
+    directory = []
+    for name, arr in columns:
+        offset = -(-offset // _ALIGN) * _ALIGN
+        directory.append(_ENTRY.pack(name.encode("ascii"), arr.dtype.str.encode("ascii"),
+                                     offset, len(arr)))
+        offset += arr.nbytes
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, n, m, duration, len(columns)))
+        for entry in directory:
+            f.write(entry)
+        for (_, arr), entry in zip(columns, directory):
+            f.write(b"\x00" * (_ENTRY.unpack(entry)[2] - f.tell()))
+            f.write(memoryview(np.ascontiguousarray(arr)).cast("B"))
+
+
+# -------------------------
+#   ODCZYT (MMAP)
+# -------------------------
+class _StringColumn:
+    """Leniwa kolumna napisów: dekoduje nazwę dopiero przy odczycie."""
+
+    def __init__(self, offsets: np.ndarray, blob: np.ndarray, order: Optional[np.ndarray] = None):
+        self._offsets = offsets
+        self._blob = blob
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1 if self._order is None else len(self._order)
+
+    def __getitem__(self, i: int) -> str:
+        if self._order is not None:
+            i = int(self._order[i])
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class SnapshotView:
+    """Plik snapshotu zmapowany w pamięć (tylko do odczytu).
+
+    Kolumny dostępne są jako atrybuty (np. view.ES, view.activity_id) i słownik
+    view.columns. Tablice wskazują bezpośrednio na zmapowany plik.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise ValueError("Plik nie jest snapshotem CPM.")
+        magic, version, flags, n, m, duration, n_columns = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError("Plik nie jest snapshotem CPM.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja snapshotu: {version}")
+
+        self.version = version
+        self.flags = flags
+        self.n_events = n
+        self.n_activities = m
+        self.project_duration = duration
+        self.columns: Dict[str, np.ndarray] = {}
+        for i in range(n_columns):
+            name, dtype, offset, count = _ENTRY.unpack_from(self._mm, _HEADER.size + i * _ENTRY.size)
+            name = name.rstrip(b"\x00").decode("ascii")
+            dtype = np.dtype(dtype.rstrip(b"\x00").decode("ascii"))
+            self.columns[name] = np.frombuffer(self._mm, dtype=dtype, count=count, offset=offset)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __enter__(self) -> "SnapshotView":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Zamyka mapowanie (tablice pobrane wcześniej tracą ważność)."""
+        self.columns = {}
+        try:
+            self._mm.close()
+        except BufferError:
+            # ktoś wciąż trzyma tablice – mapowanie zwolni garbage collector
+            pass
+
+    @property
+    def has_results(self) -> bool:
+        return bool(self.flags & FLAG_RESULTS)
+
+    # -------------------------
+    # Nazwy
+    # -------------------------
+    def event_names(self) -> _StringColumn:
+        return _StringColumn(self.event_name_off, self.columns["event_name_data"])
+
+    def activity_names(self, order: Optional[np.ndarray] = None) -> _StringColumn:
+        return _StringColumn(self.activity_name_off, self.columns["activity_name_data"], order)
+
+    # -------------------------
+    # Zasoby, skracanie, kalendarz
+    # -------------------------
+    def resource_names(self) -> List[str]:
+        names = _StringColumn(self.resource_name_off, self.columns["resource_name_data"])
+        return [names[i] for i in range(len(names))]
+
+    def activity_resources(self) -> List[Dict[str, float]]:
+        """Zapotrzebowanie na zasoby każdej czynności (kolejność jak activity_id)."""
+        names = self.resource_names()
+        ptr = self.resource_ptr.tolist()
+        index, amount = self.resource_index.tolist(), self.resource_amount.tolist()
+        return [{names[index[k]]: amount[k] for k in range(ptr[j], ptr[j + 1])}
+                for j in range(self.n_activities)]
+
+    def resource_capacities(self) -> Dict[str, float]:
+        names = self.resource_names()
+        return {names[i]: x for i, x in zip(self.capacity_index.tolist(),
+                                            self.capacity_amount.tolist())}
+
+    def calendar(self):
+        """Zapisany cpm_calendar.ProjectCalendar albo None."""
+        data = self.calendar_json
+        if not len(data):
+            return None
+        from cpm_calendar import ProjectCalendar
+        return ProjectCalendar.from_dict(json.loads(data.tobytes().decode("utf-8")))
+
+    # -------------------------
+    # Analiza bez obiektów
+    # -------------------------
+    def _require_results(self):
+        if not self.has_results:
+            raise ValueError("Snapshot nie zawiera wyników obliczeń.")
+
+    def critical_path(self) -> Tuple[List[int], float]:
+        """Jak CPMNetwork.critical_path() w chwili zapisu."""
+        self._require_results()
+        return self.columns["critical_path"].tolist(), self.project_duration
+
+    def compiled(self) -> CompiledNetwork:
+        """CompiledNetwork zbudowana wprost z kolumn (np. do ponownych obliczeń)."""
+        return CompiledNetwork.from_arrays(self.event_id, self.activity_id, self.duration,
+                                           self.start_event, self.end_event)
+
+    def schedule(self) -> CompiledSchedule:
+        """Zapisane wyniki jako CompiledSchedule (indeksy jak w compiled())."""
+        self._require_results()
+        return CompiledSchedule(
+            event_ES=self.event_ES, event_LF=self.event_LF,
+            ES=self.ES, EF=self.EF, LS=self.LS, LF=self.LF,
+            total_float=self.total_float, free_float=self.free_float,
+            is_critical=self.is_critical.view(bool),
+            project_duration=self.project_duration,
+        )
+
+    def gantt_data(self):
+        """Kolumny dla cpm_gui.plot_gantt, posortowane wg ID czynności:
+        (ids, etykiety, ES, czasy trwania, EF, krytyczne)."""
+        self._require_results()
+        order = np.argsort(self.activity_id, kind="stable")
+        return (self.activity_id[order], self.activity_names(order),
+                self.ES[order], self.duration[order], self.EF[order],
+                self.is_critical.view(bool)[order])
+
+    # -------------------------
+    # Pełna sieć CPMNetwork
+    # -------------------------
+    def to_network(self) -> CPMNetwork:
+        """Odtwarza CPMNetwork (z wynikami, jeśli zostały zapisane) wprost
+        z kolumn, bez tworzenia obiektów Event/Activity."""
+        event_names, activity_names = self.event_names(), self.activity_names()
+        resources = {j: demand for j, demand in enumerate(self.activity_resources()) if demand}
+        net = CPMNetwork._from_columns(
+            (self.event_id.tolist(), [event_names[i] for i in range(self.n_events)]),
+            (self.activity_id.tolist(), [activity_names[j] for j in range(self.n_activities)],
+             self.duration.tolist(), self.start_event.tolist(), self.end_event.tolist(),
+             self.optimistic.tolist(), self.pessimistic.tolist(),
+             self.crash_duration.tolist(), self.crash_cost.tolist(), resources))
+        net.resource_capacities = self.resource_capacities()
+        net.calendar = self.calendar()
+
+        if self.has_results:
+            # NaN w kolumnach wyników oznacza None – tak jak w tabelach sieci
+            events, store = net.events, net.activities.results
+            events.ES[:] = array("d", self.event_ES.tolist())
+            events.LF[:] = array("d", self.event_LF.tolist())
+            for name in ("ES", "EF", "LS", "LF", "total_float", "free_float"):
+                getattr(store, name)[:] = array("d", self.columns[name].tolist())
+            store.is_critical[:] = self.is_critical.tobytes()
+            net._last_project_duration = self.project_duration
+        return net
+
+def load_snapshot(path: str) -> SnapshotView:
+    """Otwiera snapshot do odczytu (mmap)."""
+    return SnapshotView(path)
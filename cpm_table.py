@@ -0,0 +1,282 @@
+"""
+Wirtualna tabela Tk (ttk.Treeview) dla dużych list zdarzeń i czynności.
+
+Treeview zawiera tylko tyle wierszy, ile mieści się na ekranie; przy
+przewijaniu zmieniane są jedynie ich wartości, a dane pobierane są leniwie
+z listy wierszy (np. summary["activities"]) przez getter. Sortowanie
+(kliknięcie nagłówka), filtrowanie i wyszukiwanie po ID działają na
+tablicy indeksów, więc nie tworzą żadnych widżetów.
+"""
+from __future__ import annotations
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# (klucz, nagłówek, szerokość w pikselach)
+Column = Tuple[str, str, int]
+Getter = Callable[[Any, str], Any]
+
+
+def item_getter(row, key: str):
+    """Getter dla słowników (wiersze project_summary())."""
+    return row[key]
+
+
+def attr_getter(row, key: str):
+    """Getter dla obiektów (Event/Activity)."""
+    return getattr(row, key)
+
+
+def format_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "tak" if value else ""
+    return str(value)
+
+
+def _sort_key(value):
+    # None zawsze na końcu, wartości różnych typów nie są porównywane
+    return (value is None, value if value is not None else 0)
+
+
+class VirtualTable(ttk.Frame):
+    """Tabela z wirtualnym przewijaniem.
+
+    - columns: lista (klucz, nagłówek, szerokość); pierwszy klucz to ID wiersza
+    - getter: funkcja (wiersz, klucz) -> wartość
+    - searchable: pasek "Znajdź ID" nad tabelą
+    """
+
+    def __init__(self, master, columns: Sequence[Column], getter: Getter = item_getter,
+                 height: int = 15, searchable: bool = True, **kwargs):
+        super().__init__(master, **kwargs)
+        self.columns = list(columns)
+        self.getter = getter
+        self.id_key = self.columns[0][0]
+
+        self._rows: Sequence = []
+        self._view: List[int] = []          # indeksy wierszy po filtrze i sortowaniu
+        self._filter: Optional[Callable[[Any], bool]] = None
+        self._sort: Optional[Tuple[str, bool]] = None
+        self._id_pos: Optional[Dict[Any, int]] = None   # ID -> pozycja w _view (leniwie)
+        self._offset = 0
+        self._page = height
+        self._selected: Optional[int] = None   # pozycja w _view
+
+        if searchable:
+            bar = ttk.Frame(self)
+            bar.pack(fill="x", pady=(0, 3))
+            ttk.Label(bar, text="Znajdź ID:").pack(side=tk.LEFT)
+            self._find_entry = ttk.Entry(bar, width=12)
+            self._find_entry.pack(side=tk.LEFT, padx=3)
+            self._find_entry.bind("<Return>", lambda e: self._find_from_entry())
+            ttk.Button(bar, text="Znajdź", command=self._find_from_entry).pack(side=tk.LEFT)
+            self._count_label = ttk.Label(bar, text="")
+            self._count_label.pack(side=tk.RIGHT)
+        else:
+            self._count_label = None
+
+        body = ttk.Frame(self)
+        body.pack(fill="both", expand=True)
+        keys = [c[0] for c in self.columns]
+        self.tree = ttk.Treeview(body, columns=keys, show="headings", height=height,
+                                 selectmode="browse")
+        for key, heading, width in self.columns:
+            self.tree.heading(key, text=heading, command=lambda k=key: self.sort_by(k))
+            self.tree.column(key, width=width, stretch=True, anchor="w")
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill="both", expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill="y")
+
+        self._items = [self.tree.insert("", tk.END, values=()) for _ in range(self._page)]
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._page))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._page))
+        self.tree.bind("<Home>", lambda e: self._select(0))
+        self.tree.bind("<End>", lambda e: self._select(len(self._view) - 1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+
+    # -------------------------
+    # Dane
+    # -------------------------
+    def set_rows(self, rows: Sequence, keep_position: bool = False):
+        """Podmienia dane (bez kopiowania listy wierszy). Z keep_position
+        zostają przewinięcie i zaznaczenie wiersza o tym samym ID."""
+        selected_id = self._selected_id() if keep_position else None
+        self._rows = rows
+        if not keep_position:
+            self._offset = 0
+            self._selected = None
+        self._rebuild_view(selected_id)
+
+    def set_filter(self, predicate: Optional[Callable[[Any], bool]]):
+        """Pokazuje tylko wiersze spełniające predicate (None = wszystkie)."""
+        self._filter = predicate
+        self._offset = 0
+        self._selected = None
+        self._rebuild_view()
+
+    def sort_by(self, key: str, reverse: Optional[bool] = None):
+        """Sortuje wg kolumny; bez reverse kolejne kliknięcia odwracają kierunek."""
+        if reverse is None:
+            reverse = self._sort is not None and self._sort[0] == key and not self._sort[1]
+        self._sort = (key, reverse)
+        for k, heading, _ in self.columns:
+            mark = (" ▼" if reverse else " ▲") if k == key else ""
+            self.tree.heading(k, text=heading + mark)
+        self._rebuild_view(self._selected_id())
+
+    def _rebuild_view(self, selected_id=None):
+        """Przelicza widok; zaznaczenie wraca na wiersz selected_id (po nowej
+        pozycji), a znika tylko, gdy tego wiersza w widoku już nie ma."""
+        rows, get = self._rows, self.getter
+        if self._filter is None:
+            view = list(range(len(rows)))
+        else:
+            pred = self._filter
+            view = [i for i in range(len(rows)) if pred(rows[i])]
+        if self._sort is not None:
+            key, reverse = self._sort
+            view.sort(key=lambda i: _sort_key(get(rows[i], key)), reverse=reverse)
+        self._view = view
+        self._id_pos = None
+        self._selected = None if selected_id is None else self._positions().get(selected_id)
+        self._offset = min(self._offset, max(0, len(view) - self._page))
+        if self._count_label is not None:
+            shown = f"{len(view)} z {len(rows)}" if len(view) != len(rows) else f"{len(rows)}"
+            self._count_label.configure(text=f"Wierszy: {shown}")
+        self._render()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def row_at(self, position: int):
+        return self._rows[self._view[position]]
+
+    def selected_row(self):
+        return None if self._selected is None else self.row_at(self._selected)
+
+    def _selected_id(self):
+        return None if self._selected is None else self.getter(self.selected_row(), self.id_key)
+
+    # -------------------------
+    # Wyszukiwanie
+    # -------------------------
+    def find(self, row_id) -> bool:
+        """Zaznacza i pokazuje wiersz o podanym ID; False, gdy go nie ma w widoku."""
+        pos = self._positions().get(row_id)
+        if pos is None:
+            return False
+        self._select(pos)
+        return True
+
+    def _positions(self) -> Dict[Any, int]:
+        """ID -> pozycja w _view (budowane leniwie, raz na widok)."""
+        if self._id_pos is None:
+            rows, get, key = self._rows, self.getter, self.id_key
+            self._id_pos = {get(rows[i], key): pos for pos, i in enumerate(self._view)}
+        return self._id_pos
+
+    def _find_from_entry(self):
+        raw = self._find_entry.get().strip()
+        try:
+            row_id = int(raw)
+        except ValueError:
+            row_id = raw
+        if not self.find(row_id):
+            self.bell()
+
+    # -------------------------
+    # Przewijanie i rysowanie
+    # -------------------------
+    def _render(self):
+        view, rows, get = self._view, self._rows, self.getter
+        keys = [c[0] for c in self.columns]
+        for slot, iid in enumerate(self._items):
+            pos = self._offset + slot
+            if pos < len(view):
+                row = rows[view[pos]]
+                self.tree.item(iid, values=[format_value(get(row, k)) for k in keys])
+            else:
+                self.tree.item(iid, values=())
+        if self._selected is not None and 0 <= self._selected - self._offset < len(self._items):
+            self.tree.selection_set(self._items[self._selected - self._offset])
+        else:
+            self.tree.selection_set(())
+        total = len(view)
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + self._page) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int):
+        self.scroll_to(self._offset + rows)
+
+    def scroll_to(self, offset: int):
+        offset = max(0, min(offset, len(self._view) - self._page))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self._view)))
+        elif action == "scroll":
+            step = self._page if unit == "pages" else 1
+            self.scroll(int(value) * step)
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        page = max(1, (event.height - rowheight - 4) // rowheight)
+        if page == self._page:
+            return
+        while len(self._items) < page:
+            self._items.append(self.tree.insert("", tk.END, values=()))
+        while len(self._items) > page:
+            self.tree.delete(self._items.pop())
+        self._page = page
+        self.tree.configure(height=page)
+        self._offset = max(0, min(self._offset, len(self._view) - page))
+        self._render()
+
+    # -------------------------
+    # Zaznaczenie
+    # -------------------------
+    def _select(self, pos: int):
+        if not self._view:
+            return
+        pos = max(0, min(pos, len(self._view) - 1))
+        self._selected = pos
+        if pos < self._offset:
+            self._offset = pos
+        elif pos >= self._offset + self._page:
+            self._offset = pos - self._page + 1
+        self._render()
+        self.tree.focus(self._items[pos - self._offset])
+        self.event_generate("<<TableSelect>>")
+
+    def _move_selection(self, delta: int):
+        start = self._offset if self._selected is None else self._selected
+        self._select(start + delta)
+        return "break"
+
+    def _on_tree_select(self, _event):
+        sel = self.tree.selection()
+        if not sel:
+            return
+        slot = self._items.index(sel[0])
+        pos = self._offset + slot
+        if pos < len(self._view) and pos != self._selected:
+            self._selected = pos
+            self.event_generate("<<TableSelect>>")
@@ -0,0 +1,320 @@
+"""
+Walidacja struktury sieci CPM – wszystkie problemy naraz.
+
+validate_graph() przyjmuje same identyfikatory (ID zdarzeń oraz trójki
+(ID czynności, zdarzenie początkowe, zdarzenie końcowe)), więc sprawdza
+zarówno gotową sieć (CPMNetwork.validate()), jak i dane przed wstawieniem
+(CPMNetwork.add_batch(), import plików).
+
+Cykle wyszukiwane są jednym liniowym przebiegiem algorytmu Tarjana
+(silnie spójne składowe, wersja iteracyjna). Każda składowa z cyklem
+raportowana jest z pełną listą zdarzeń i czynności oraz przykładowym
+cyklem w kolejności przechodzenia.
+
+Zdarzenie początkowe projektu to zdarzenie bez poprzedników o najmniejszym
+ID, końcowe – zdarzenie bez następników o największym ID (zwyczajowa
+numeracja sieci AOA). Pozostałe zdarzenia bez poprzedników/następników
+zgłaszane są jako "wiszące".
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+# (ID czynności, ID zdarzenia początkowego, ID zdarzenia końcowego)
+Arc = Tuple[int, int, int]
+
+
+@dataclass
+class CycleInfo:
+    """Silnie spójna składowa z cyklem.
+
+    - events, activities: wszystkie zdarzenia i czynności składowej (rosnąco)
+    - cycle_events: przykładowy cykl (pierwsze zdarzenie powtórzone na końcu)
+    - cycle_activities: czynności tego cyklu, w kolejności
+    """
+    events: List[int]
+    activities: List[int]
+    cycle_events: List[int]
+    cycle_activities: List[int]
+
+    def describe(self) -> str:
+        loop = _id_list(self.cycle_events, 30, " -> ")
+        acts = _id_list(self.cycle_activities, 30)
+        text = f"Cykl: zdarzenia {loop} (czynności {acts})"
+        if len(self.events) > len(self.cycle_events) - 1:
+            text += f"; cała składowa: {len(self.events)} zdarzeń, {len(self.activities)} czynności"
+        return text
+
+
+@dataclass
+class ValidationReport:
+    """Wynik walidacji.
+
+    Błędy (sieci nie da się policzyć):
+    - duplicate_events, duplicate_activities: powtórzone ID
+    - missing_events: (ID czynności, "start"/"end", brakujące ID zdarzenia)
+    - self_loops: czynności o tym samym zdarzeniu początkowym i końcowym
+    - cycles: składowe z cyklami
+
+    Ostrzeżenia:
+    - dangling_starts, dangling_ends: dodatkowe zdarzenia bez poprzedników/następników
+    - unreachable_events: zdarzenia nieosiągalne ze zdarzenia początkowego
+    - dead_end_events: zdarzenia, z których nie da się dojść do zdarzenia końcowego
+    - isolated_events: zdarzenia bez żadnych czynności
+    """
+    start_event: Optional[int] = None
+    end_event: Optional[int] = None
+    duplicate_events: List[int] = field(default_factory=list)
+    duplicate_activities: List[int] = field(default_factory=list)
+    missing_events: List[Tuple[int, str, int]] = field(default_factory=list)
+    self_loops: List[int] = field(default_factory=list)
+    cycles: List[CycleInfo] = field(default_factory=list)
+    dangling_starts: List[int] = field(default_factory=list)
+    dangling_ends: List[int] = field(default_factory=list)
+    unreachable_events: List[int] = field(default_factory=list)
+    dead_end_events: List[int] = field(default_factory=list)
+    isolated_events: List[int] = field(default_factory=list)
+
+    @property
+    def has_errors(self) -> bool:
+        return bool(self.duplicate_events or self.duplicate_activities or self.missing_events
+                    or self.self_loops or self.cycles)
+
+    @property
+    def ok(self) -> bool:
+        """Brak błędów i ostrzeżeń."""
+        return not (self.has_errors or self.dangling_starts or self.dangling_ends
+                    or self.unreachable_events or self.dead_end_events or self.isolated_events)
+
+    def errors(self) -> List[str]:
+        out = [f"Zdarzenie o ID {eid} już istnieje." for eid in self.duplicate_events]
+        out += [f"Czynność o ID {aid} już istnieje." for aid in self.duplicate_activities]
+        for aid, side, eid in self.missing_events:
+            what = "początkowego" if side == "start" else "końcowego"
+            out.append(f"Czynność {aid}: brak zdarzenia {what}: {eid}")
+        out += [f"Czynność {aid}: zdarzenie początkowe i końcowe nie mogą być takie same."
+                for aid in self.self_loops]
+        out += [c.describe() for c in self.cycles]
+        return out
+
+    def warnings(self) -> List[str]:
+        out = []
+        if self.dangling_starts:
+            out.append(f"Dodatkowe zdarzenia bez poprzedników (początek projektu: {self.start_event}): "
+                       + _id_list(self.dangling_starts))
+        if self.dangling_ends:
+            out.append(f"Dodatkowe zdarzenia bez następników (koniec projektu: {self.end_event}): "
+                       + _id_list(self.dangling_ends))
+        if self.unreachable_events:
+            out.append("Zdarzenia nieosiągalne z początku projektu: " + _id_list(self.unreachable_events))
+        if self.dead_end_events:
+            out.append("Zdarzenia bez drogi do końca projektu: " + _id_list(self.dead_end_events))
+        if self.isolated_events:
+            out.append("Zdarzenia bez czynności: " + _id_list(self.isolated_events))
+        return out
+
+
+def _id_list(ids: List[int], shown: int = 20, sep: str = ", ") -> str:
+    text = sep.join(map(str, ids[:shown]))
+    return text + (f" ... (razem {len(ids)})" if len(ids) > shown else "")
+
+
+class NetworkValidationError(ValueError):
+    """Błędy struktury sieci; report: pełny ValidationReport."""
+
+    def __init__(self, report: ValidationReport, headline: str = "Niepoprawna struktura sieci."):
+        self.report = report
+        errors = report.errors()
+        shown = "\n".join(errors[:20])
+        more = f"\n... oraz {len(errors) - 20} kolejnych" if len(errors) > 20 else ""
+        super().__init__(f"{headline}\n{shown}{more}")
+
+
+# -------------------------
+#   SILNIE SPÓJNE SKŁADOWE
+# -------------------------
+def _strong_components(succ: List[List[int]]) -> List[List[int]]:
+    """Składowe (indeksy węzłów) o co najmniej dwóch węzłach – Tarjan iteracyjnie."""
+    n = len(succ)
+    index = [-1] * n
+    low = [0] * n
+    pos = [0] * n             # następny rozpatrywany następnik węzła
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    components = []
+    counter = 0
+    for root in range(n):
+        if index[root] != -1 or not succ[root]:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [root]
+        while work:
+            v = work[-1]
+            edges = succ[v]
+            i = pos[v]
+            if i < len(edges):
+                pos[v] = i + 1
+                w = edges[i]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append(w)
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            work.pop()
+            if work:
+                u = work[-1]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                w = stack.pop()
+                on_stack[w] = 0
+                if w != v:
+                    comp = [w]
+                    while w != v:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        comp.append(w)
+                    components.append(comp)
+    return components
+
+
+def _cycle_in(comp: List[int], succ: List[List[int]]) -> List[int]:
+    """Przykładowy cykl w składowej: węzły, pierwszy powtórzony na końcu."""
+    members = set(comp)
+    start = min(comp)
+    parent = {start: start}
+    queue = deque([start])
+    while queue:
+        v = queue.popleft()
+        for w in succ[v]:
+            if w == start:
+                nodes = [start]
+                while v != start:
+                    nodes.append(v)
+                    v = parent[v]
+                nodes.append(start)
+                nodes.reverse()
+                return nodes
+            if w in members and w not in parent:
+                parent[w] = v
+                queue.append(w)
+    raise AssertionError("Składowa bez cyklu.")   # niemożliwe dla |składowej| > 1
+
+
+def _reach(seed: int, succ: List[List[int]]) -> bytearray:
+    seen = bytearray(len(succ))
+    seen[seed] = 1
+    queue = [seed]
+    while queue:
+        for w in succ[queue.pop()]:
+            if not seen[w]:
+                seen[w] = 1
+                queue.append(w)
+    return seen
+
+
+# -------------------------
+#   WALIDACJA
+# -------------------------
+def validate_graph(event_ids: Iterable[int], arcs: Iterable[Arc]) -> ValidationReport:
+    """Sprawdza strukturę sieci w czasie liniowym i zwraca pełny raport."""
+    report = ValidationReport()
+    ids: List[int] = []
+    index = {}
+    for eid in event_ids:
+        if eid in index:
+            report.duplicate_events.append(eid)
+            continue
+        index[eid] = len(ids)
+        ids.append(eid)
+    n = len(ids)
+
+    # kolumny łuków i indeksy zdarzeń (None = brak zdarzenia) liczone w C
+    columns = list(zip(*arcs))
+    aids, starts, ends = (list(c) for c in columns) if columns else ([], [], [])
+    src = list(map(index.get, starts))
+    dst = list(map(index.get, ends))
+    skip = set()
+    if len(set(aids)) != len(aids):
+        seen_acts = set()
+        for k, aid in enumerate(aids):
+            if aid in seen_acts:
+                report.duplicate_activities.append(aid)
+                skip.add(k)
+            seen_acts.add(aid)
+    if None in src or None in dst or any(map(int.__eq__, src, dst)):
+        for k, (aid, s, e) in enumerate(zip(aids, src, dst)):
+            if k in skip:
+                continue
+            if s is None:
+                report.missing_events.append((aid, "start", starts[k]))
+            if e is None:
+                report.missing_events.append((aid, "end", ends[k]))
+            if s is not None and s == e:
+                report.self_loops.append(aid)
+            if s is None or e is None or s == e:
+                skip.add(k)
+
+    succ: List[List[int]] = [[] for _ in range(n)]
+    pred: List[List[int]] = [[] for _ in range(n)]
+    for k, (s, e) in enumerate(zip(src, dst)):
+        if skip and k in skip:
+            continue
+        succ[s].append(e)
+        pred[e].append(s)
+
+    # cykle
+    components = _strong_components(succ)
+    if components:
+        comp_of = [-1] * n
+        for c, comp in enumerate(components):
+            for v in comp:
+                comp_of[v] = c
+        # łuki wewnątrz składowych: (ID czynności, indeks startu, indeks końca)
+        inner: List[List[Arc]] = [[] for _ in components]
+        for k, (aid, s, e) in enumerate(zip(aids, src, dst)):
+            if k in skip:
+                continue
+            c = comp_of[s]
+            if c != -1 and c == comp_of[e]:
+                inner[c].append((aid, s, e))
+        for comp, comp_arcs in zip(components, inner):
+            nodes = _cycle_in(comp, succ)
+            by_pair = {}
+            for aid, s, e in comp_arcs:
+                by_pair.setdefault((s, e), aid)
+            report.cycles.append(CycleInfo(
+                events=sorted(ids[v] for v in comp),
+                activities=sorted(aid for aid, _, _ in comp_arcs),
+                cycle_events=[ids[v] for v in nodes],
+                cycle_activities=[by_pair[pair] for pair in zip(nodes, nodes[1:])],
+            ))
+        report.cycles.sort(key=lambda c: c.events[0])
+
+    # początek i koniec projektu, zdarzenia wiszące i nieosiągalne
+    sources = [v for v in range(n) if not pred[v] and succ[v]]
+    sinks = [v for v in range(n) if not succ[v] and pred[v]]
+    report.isolated_events = sorted(ids[v] for v in range(n) if not pred[v] and not succ[v])
+    if sources:
+        start = min(sources, key=ids.__getitem__)
+        report.start_event = ids[start]
+        report.dangling_starts = sorted(ids[v] for v in sources if v != start)
+        reached = _reach(start, succ)
+        report.unreachable_events = sorted(ids[v] for v in range(n)
+                                           if not reached[v] and (pred[v] or succ[v]))
+    if sinks:
+        end = max(sinks, key=ids.__getitem__)
+        report.end_event = ids[end]
+        report.dangling_ends = sorted(ids[v] for v in sinks if v != end)
+        reached = _reach(end, pred)
+        report.dead_end_events = sorted(ids[v] for v in range(n)
+                                        if not reached[v] and (pred[v] or succ[v]))
+    return report
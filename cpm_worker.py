@@ -0,0 +1,147 @@
+"""
+Obliczenia w tle dla GUI (Tkinter).
+
+BackgroundWorker wykonuje zadania w jednym wątku roboczym, a wyniki, błędy
+i postęp przekazuje do pętli Tk przez kolejkę odpytywaną z root.after() –
+wątek roboczy nigdy nie dotyka widżetów. Zadanie to funkcja task(progress);
+progress(etap, ułamek) zgłasza postęp i jednocześnie sprawdza anulowanie
+(zgłasza Cancelled), więc przerwanie następuje przy najbliższym raporcie.
+
+Nowe zgłoszenie (submit) anuluje poprzednie: jego wynik, nawet jeśli zdąży
+powstać, nie trafia już do GUI. Zadania oczekujące na wątek, które zostały
+wyprzedzone, są pomijane bez uruchamiania.
+
+Wątek zamiast puli procesów: sieć nie musi być serializowana, a wątek Tk
+i tak dostaje czas procesora przy każdym przełączeniu GIL.
+
+Kopię sieci do obliczeń lepiej odtwarzać już w zadaniu: w wątku Tk wystarczy
+tania, niezmienna migawka (CPMNetwork.payload).
+
+Przykład:
+    worker = BackgroundWorker(root)
+    payload = net.payload()
+    worker.submit(lambda progress: CPMNetwork.from_payload(payload).project_summary(progress),
+                  on_done=show, on_progress=update_bar)
+"""
+from __future__ import annotations
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+POLL_MS = 40      # co ile ms pętla Tk odbiera komunikaty wątku
+
+
+class Cancelled(Exception):
+    """Zadanie anulowane lub wyprzedzone przez nowsze."""
+
+
+class Job:
+    """Zgłoszone zadanie; cancel() przerywa je przy najbliższym raporcie postępu."""
+
+    def __init__(self, task: Callable[[Callable[[str, float], None]], Any],
+                 on_done: Callable[[Any], None],
+                 on_progress: Optional[Callable[[str, float], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self.task = task
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_error = on_error
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+
+class BackgroundWorker:
+    """Jeden wątek roboczy + odbiór komunikatów w pętli Tk."""
+
+    def __init__(self, root, poll_ms: int = POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._jobs: "queue.Queue[Job]" = queue.Queue()
+        self._messages: "queue.Queue[tuple]" = queue.Queue()
+        self._current: Optional[Job] = None
+        self._thread: Optional[threading.Thread] = None
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        """Czy jakieś zadanie czeka na wynik."""
+        return self._current is not None
+
+    def submit(self, task, on_done, on_progress=None, on_error=None) -> Job:
+        """Zgłasza zadanie; poprzednie (jeśli jeszcze trwa) zostaje anulowane."""
+        if self._current is not None:
+            self._current.cancel()
+        job = Job(task, on_done, on_progress, on_error)
+        self._current = job
+        self._jobs.put(job)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cpm-worker", daemon=True)
+            self._thread.start()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self):
+        """Anuluje bieżące zadanie (bez wywołania on_done/on_error)."""
+        if self._current is not None:
+            self._current.cancel()
+            self._current = None
+
+    # -------------------------
+    # Wątek roboczy
+    # -------------------------
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job.cancelled:
+                continue
+
+            def progress(phase: str, fraction: float, job=job):
+                if job.cancelled:
+                    raise Cancelled()
+                self._messages.put(("progress", job, phase, fraction))
+
+            try:
+                result = job.task(progress)
+            except Cancelled:
+                continue
+            except Exception as e:
+                self._messages.put(("error", job, e))
+            else:
+                self._messages.put(("done", job, result))
+
+    # -------------------------
+    # Pętla Tk
+    # -------------------------
+    def _poll(self):
+        latest = None          # z serii raportów postępu wystarczy ostatni
+        while True:
+            try:
+                kind, job, *payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if job is not self._current or job.cancelled:
+                continue       # wynik nieaktualnego zadania
+            if kind == "progress":
+                latest = (job, payload)
+                continue
+            self._current = None
+            latest = None
+            if kind == "done":
+                job.on_done(payload[0])
+            elif job.on_error is not None:
+                job.on_error(payload[0])
+        if latest is not None and latest[0].on_progress is not None:
+            latest[0].on_progress(*latest[1])
+
+        if self._current is not None:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False